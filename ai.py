@@ -1,9 +1,23 @@
 import json
 import os
+from level import TILE_SIZE
+
+# Difficulty ramp tunables (see sweep.py for searching over them)
+DEFAULT_TUNING = {
+    'score_threshold': 500,
+    'speed_step': 0.12,
+    'speed_cap': 88,
+    'range_step': 2.5,
+    'range_cap': 340,
+}
 
 class AdaptiveAI:
-    def __init__(self, filename):
+    def __init__(self, filename, **tuning):
         self.filename = filename
+        unknown = set(tuning) - set(DEFAULT_TUNING)
+        if unknown:
+            raise TypeError(f"unknown AdaptiveAI tuning: {', '.join(sorted(unknown))}")
+        self.tuning = dict(DEFAULT_TUNING, **tuning)
         self.params = {
             'speed': 48,
             'detection_range': 180
@@ -20,9 +34,10 @@ class AdaptiveAI:
 
     def update_enemies(self, enemies):
         avg_score = (sum(self.score_samples) / len(self.score_samples)) if self.score_samples else 0
-        if avg_score > 500:
-            self.params['speed'] = min(self.params['speed'] + 0.12, 88)
-            self.params['detection_range'] = min(self.params['detection_range'] + 2.5, 340)
+        t = self.tuning
+        if avg_score > t['score_threshold']:
+            self.params['speed'] = min(self.params['speed'] + t['speed_step'], t['speed_cap'])
+            self.params['detection_range'] = min(self.params['detection_range'] + t['range_step'], t['range_cap'])
             for enemy in enemies:
                 enemy.speed = self.params['speed']
                 enemy.detection_range = self.params['detection_range']
@@ -42,13 +57,15 @@ class AdaptiveAI:
         with open(self.filename, 'r') as f:
             self.params = json.load(f)
 
+# the AutoPlayer keeps hopping while its feet are within this many px of the floor
+FLOOR_HOP = 42
+
 class AutoPlayer:
     @staticmethod
-    def control(player, level, enemies, coins, bullets, sound_jump, sound_shoot):
-        close_ground = any(
-            (plat[0] if isinstance(plat, tuple) else plat).colliderect(player.rect.move(30, 25))
-            for plat in level.platforms
-        )
+    def control(player, level, enemies, pickups, bullets, sound_jump, sound_shoot):
+        terrain = level.terrain
+        # ground ahead: anything solid a little ahead of and below the player
+        close_ground = terrain.solid_in(player.rect.move(30, 25))
         danger = any(
             enemy.rect.colliderect(player.rect.inflate(50, 15)) for enemy in enemies
         )
@@ -56,18 +73,15 @@ class AutoPlayer:
         move_left = False
         jump = False
         shoot = danger
-        if not close_ground or player.rect.bottom > 470:
+        column = player.rect.centerx // TILE_SIZE
+        floor = terrain.floor_at(column)
+        # keep hopping while down at floor level, and jump for pits and walls just ahead
+        if not close_ground or (floor is not None and player.rect.bottom > floor - FLOOR_HOP):
+            jump = True
+        elif terrain.clear_ahead(column) == 0:
             jump = True
-        nearest_coin = None
-        min_dist = 9999
-        for coin in coins:
-            if coin['taken']:
-                continue
-            cx, cy = coin['rect'].center
-            dist = abs(cx - player.rect.centerx)
-            if dist < min_dist:
-                min_dist = dist
-                nearest_coin = coin
+        # pickups is the simulation's PickupIndex of uncollected coins
+        nearest_coin = pickups.nearest(player.rect.centerx)
         if nearest_coin and nearest_coin['rect'].centerx < player.rect.centerx:
             move_left = True
             move_right = False
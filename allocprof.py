@@ -0,0 +1,201 @@
+"""Per-frame allocation tracking built on tracemalloc and gc callbacks.
+
+Diagnostic only: tracing every allocation slows the game several times over.
+
+    tracker = AllocTracker()
+    tracker.start()
+    for each frame:
+        ...
+        tracker.frame()
+    print(tracker.report())
+    tracker.stop()
+
+Two things are measured, and they answer different questions:
+
+- Peak bytes per frame: how far traced memory rose above its level at the
+  start of the frame (tracemalloc peak, reset every frame). Temporaries that
+  refcounting frees within the frame (draw-argument tuples, list copies,
+  text surfaces) count here, so this is the per-frame allocation volume,
+  as a lower bound: memory freed and reused within the frame is only
+  counted once. check_budget(peak=...) and env.py --alloc-budget use it.
+- Retained bytes and objects per frame, by source line: every `every`
+  frames a snapshot is diffed with the previous one and positive growth is
+  attributed to lines. Only allocations still alive at the snapshot show
+  up, so this is a leak and cache-growth check, not a temporaries count.
+  Surviving container objects are also what advance the gen-0 counter, so
+  the table lists lines feeding GC pauses. check_budget(retained=...).
+
+Python has no hook that counts every allocation, so temporaries can't be
+attributed to lines; comment lines out and watch the peak.
+"""
+import gc
+import os
+import tracemalloc
+from telemetry import GCMonitor
+
+
+class AllocationBudgetExceeded(AssertionError):
+    pass
+
+
+class AllocTracker:
+    """Accumulates per-frame peaks, per-line retained growth and GC pauses."""
+
+    def __init__(self, top=10, peak_budget=None, retained_budget=None, nframes=1, every=1):
+        self.top = top
+        self.every = max(1, every)
+        self.peak_budget = peak_budget
+        self.retained_budget = retained_budget
+        self.nframes = nframes
+        # the tracker's own snapshots; filtered on the grouped stats because
+        # Snapshot.filter_traces() costs more than the frame being measured
+        self._ignore = {tracemalloc.__file__, __file__, '<unknown>'}
+        self.gc = None
+        self._prev = None
+        self._frame_start = 0
+        self._started_tracing = False
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.peak_total = 0
+        self.peak_max = 0
+        self.retained_total = 0
+        self.retained_count = 0
+        self.retained_max = 0
+        self.by_line = {}
+        self.gc_collections = [0, 0, 0]
+        self.gc_pause_total = 0.0
+        self.gc_pause_max = 0.0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nframes)
+            self._started_tracing = True
+        self.gc = GCMonitor()
+        self._prev = tracemalloc.take_snapshot()
+        self._reset_peak()
+
+    def stop(self):
+        if self.gc:
+            self.gc.close()
+            self.gc = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._prev = None
+
+    def frame(self):
+        """Close the current frame; every `every` frames, diff a snapshot against the last one."""
+        _, peak = tracemalloc.get_traced_memory()
+        rise = max(0, peak - self._frame_start)
+        self.frames += 1
+        self.peak_total += rise
+        self.peak_max = max(self.peak_max, rise)
+        gc_stats = self.gc.take()
+        for gen, n in enumerate(gc_stats['collections']):
+            self.gc_collections[gen] += n
+        self.gc_pause_total += gc_stats['pause_ms_total']
+        self.gc_pause_max = max(self.gc_pause_max, gc_stats['pause_ms_max'])
+        if self.frames % self.every == 0:
+            # snapshots allocate thousands of tuples; keep them from triggering
+            # the collections being measured (the previous snapshot is freed in
+            # exchange, so the gen-0 count comes out about even)
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                self._diff()
+            finally:
+                if enabled:
+                    gc.enable()
+        # reset last so the next peak only covers the next frame
+        self._reset_peak()
+
+    def _reset_peak(self):
+        tracemalloc.reset_peak()
+        self._frame_start = tracemalloc.get_traced_memory()[0]
+
+    def _diff(self):
+        snap = tracemalloc.take_snapshot()
+        window_bytes = window_count = 0
+        for stat in snap.compare_to(self._prev, 'lineno'):
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            if frame.filename in self._ignore:
+                continue
+            key = (frame.filename, frame.lineno)
+            size, count = self.by_line.get(key, (0, 0))
+            self.by_line[key] = (size + stat.size_diff, count + max(stat.count_diff, 0))
+            window_bytes += stat.size_diff
+            window_count += max(stat.count_diff, 0)
+        self._prev = snap
+        self.retained_total += window_bytes
+        self.retained_count += window_count
+        self.retained_max = max(self.retained_max, window_bytes / self.every)
+
+    def _measured(self):
+        # frames covered by completed snapshot diffs
+        return self.frames - self.frames % self.every
+
+    def peak_per_frame(self):
+        """Mean rise of traced memory within a frame, temporaries included."""
+        return self.peak_total / self.frames if self.frames else 0.0
+
+    def retained_per_frame(self):
+        """Mean growth per frame that survived to the next snapshot."""
+        n = self._measured()
+        return self.retained_total / n if n else 0.0
+
+    def top_lines(self, limit=None):
+        """[(filename, lineno, retained_bytes_per_frame, retained_objects_per_frame)] largest first."""
+        n = max(self._measured(), 1)
+        rows = sorted(self.by_line.items(), key=lambda item: -item[1][0])[:limit or self.top]
+        return [(fn, ln, size / n, count / n) for (fn, ln), (size, count) in rows]
+
+    def summary(self):
+        return {
+            'frames': self.frames,
+            'peak_bytes_per_frame': round(self.peak_per_frame(), 1),
+            'peak_bytes_max': self.peak_max,
+            'retained_bytes_per_frame': round(self.retained_per_frame(), 1),
+            'retained_objects_per_frame': round(self.retained_count / max(self._measured(), 1), 2),
+            'retained_bytes_max': round(self.retained_max),
+            'gc_collections': list(self.gc_collections),
+            'gc_pause_ms_total': round(self.gc_pause_total, 3),
+            'gc_pause_ms_max': round(self.gc_pause_max, 3),
+        }
+
+    def report(self, limit=None):
+        s = self.summary()
+        lines = [f"[alloc] {s['frames']} frames: peak {s['peak_bytes_per_frame'] / 1024:.2f} KB/frame "
+                 f"(max {s['peak_bytes_max'] / 1024:.1f} KB); retained {s['retained_bytes_per_frame'] / 1024:.2f} KB/frame "
+                 f"({s['retained_objects_per_frame']} objects, max {s['retained_bytes_max'] / 1024:.1f} KB); "
+                 f"gc {s['gc_collections']} pause total {s['gc_pause_ms_total']} ms, max {s['gc_pause_ms_max']} ms"]
+        for fn, ln, size, count in self.top_lines(limit):
+            lines.append(f"[alloc] retained {size:10.1f} B/frame {count:8.2f} obj/frame  {_short(fn)}:{ln}")
+        return '\n'.join(lines)
+
+    def check_budget(self, peak=None, retained=None):
+        """Raise AllocationBudgetExceeded if mean peak or retained bytes per frame is over budget.
+
+        Budgets default to the constructor's; None skips that check.
+        """
+        peak = self.peak_budget if peak is None else peak
+        retained = self.retained_budget if retained is None else retained
+        over = []
+        if peak is not None and self.peak_per_frame() > peak:
+            over.append(f"peak {self.peak_per_frame():.1f} B/frame > {peak} B/frame")
+        if retained is not None and self.retained_per_frame() > retained:
+            over.append(f"retained {self.retained_per_frame():.1f} B/frame > {retained} B/frame")
+        if over:
+            raise AllocationBudgetExceeded(
+                f"allocation budget exceeded: {'; '.join(over)}\n" + self.report(5))
+
+
+def _short(filename):
+    try:
+        rel = os.path.relpath(filename)
+    except ValueError:
+        return filename
+    return filename if rel.startswith('..') else rel
@@ -1,4 +1,6 @@
 import pygame
+from physics import solid_rects, move, get_pos, set_pos
+from render import LAYER_BULLETS, rect_sprite
 
 class Bullet:
     def __init__(self, pos, facing_right):
@@ -7,10 +9,20 @@ class Bullet:
         self.lifetime = 1.1
         self.last_camera_x = 0
 
-    def update(self, dt):
-        self.rect.x += int(self.vel_x * dt)
+    def update(self, dt, platforms=None):
+        x, y = get_pos(self)
+        if platforms is None:
+            x += self.vel_x * dt
+        else:
+            # stop at the first tile in the way instead of passing through it
+            x, y, hit_x, _ = move(x, y, self.rect.width, self.rect.height,
+                                  self.vel_x * dt, 0.0, solid_rects(platforms))
+            if hit_x:
+                self.lifetime = 0
+        set_pos(self, x, y)
         self.lifetime -= dt
 
-    def draw(self, surface, cam_x):
+    def draw(self, canvas, cam_x):
         bx = self.rect.x - cam_x
-        pygame.draw.rect(surface, (60, 60, 230), (bx, self.rect.y, self.rect.width, self.rect.height))
+        sprite = canvas.sprite(('bullet', self.rect.size), rect_sprite, (60, 60, 230), self.rect.size)
+        canvas.submit(LAYER_BULLETS, sprite, (bx, self.rect.y))
@@ -0,0 +1,148 @@
+"""Endless procedural levels: seeded chunks generated ahead of the player and dropped behind.
+
+    sim = Simulation(endless_ref(7))          # 'endless:7'
+    python main.py --endless[=SEED]
+
+EndlessLevel is a Level whose live tiles are a run of CHUNK_COLUMNS-wide
+chunks. Simulation.update() calls stream(x) with the player's position: it
+generates chunks until AHEAD_COLUMNS past x exist and drops whole chunks
+ending more than BEHIND_COLUMNS behind it, with their platforms, spawns and
+collision cells. The first live column is then turned into a wall (reported
+through Level.listeners like a hot reload, so TileLayer redraws it), and the
+Simulation drops the enemies, coins and bullets that were left behind. Tiles,
+entities and caches therefore stay the same size however far a run goes.
+
+Chunk n of seed s always comes from Random(f"{s}:{n}"), in Level's tile
+vocabulary, so a seed replays the same world.
+"""
+import random
+from collections import deque
+
+from level import Level, TerrainProfile, TILE_SIZE
+
+ENDLESS_PREFIX = 'endless:'
+ROWS = 9
+GROUND = ROWS - 1
+CHUNK_COLUMNS = 16
+# plain floor at the start of every chunk, where a player who died in it respawns
+SAFE_COLUMNS = 2
+AHEAD_COLUMNS = 3 * CHUNK_COLUMNS
+BEHIND_COLUMNS = 24   # more than a screen width, so the wall stays off screen while running
+
+
+def endless_ref(seed):
+    return f"{ENDLESS_PREFIX}{seed}"
+
+
+def is_endless(ref):
+    return isinstance(ref, str) and ref.startswith(ENDLESS_PREFIX)
+
+
+def generate_chunk(seed, index):
+    """Columns of chunk `index` as strings of ROWS tile characters, top to bottom."""
+    cols = [['.'] * GROUND + ['#'] for _ in range(CHUNK_COLUMNS)]
+    if index == 0:
+        cols[2][GROUND - 1] = '@'
+        return [''.join(col) for col in cols]
+    rng = random.Random(f"{seed}:{index}")
+    x = SAFE_COLUMNS
+    while x < CHUNK_COLUMNS - 1:
+        roll = rng.random()
+        if roll < 0.15:
+            # a step (no pits: at RUN_SPEED a jump barely clears one tile)
+            cols[x][GROUND - 1] = '#'
+            x += 3
+        elif roll < 0.42 and x + 3 < CHUNK_COLUMNS:
+            # floating platform with a coin or bonus block above it
+            y = rng.choice((3, 6))
+            for k in range(3):
+                cols[x + k][y] = '#'
+            if rng.random() < 0.7:
+                cols[x + 1][y - 1] = 'C'
+            else:
+                cols[x + 1][y - 2] = '$'   # a row of headroom, so it is not a wall on the platform
+            x += 4
+        elif roll < 0.56:
+            cols[x][GROUND - 1] = 'E'
+            x += 3
+        elif roll < 0.68:
+            cols[x][GROUND - 1] = 'C'
+            x += 1
+        else:
+            x += 1
+    return [''.join(col) for col in cols]
+
+
+class EndlessLevel(Level):
+    """Level streamed chunk by chunk from generate_chunk(); see stream()."""
+
+    def __init__(self, ref):
+        self.seed = ref[len(ENDLESS_PREFIX):] or '0'
+        super().__init__(ref)
+
+    def load_level(self):
+        # no whole grid: self.columns holds the live columns, from first_column on
+        self.rows = []
+        self.columns = deque()
+        self.chunks = deque()   # first column of each live chunk
+        self.height = ROWS
+        self.width = 0
+        self._next_chunk = 0
+        self.stream(0)
+
+    def stream(self, x):
+        """Generate ahead of world x and drop chunks far behind it; True if any tiles changed."""
+        column = int(x) // TILE_SIZE
+        changed = False
+        while self.width < column + AHEAD_COLUMNS:
+            self._append_chunk()
+            changed = True
+        cut = column - BEHIND_COLUMNS
+        if len(self.chunks) > 1 and self.chunks[1] <= cut:
+            while len(self.chunks) > 1 and self.chunks[1] <= cut:
+                self.chunks.popleft()
+            self._drop_before(self.chunks[0])
+            changed = True
+        # respawn at the start of the chunk the player is in
+        start = self.chunks[0] + max(0, column - self.chunks[0]) // CHUNK_COLUMNS * CHUNK_COLUMNS
+        if self.chunks[0] < start < self.width:
+            self.player_spawn = ((start + 1) * TILE_SIZE, (GROUND - 1) * TILE_SIZE)
+        if changed:
+            self._terrain = TerrainProfile(self)
+        return changed
+
+    def _append_chunk(self):
+        first = self.width
+        columns = generate_chunk(self.seed, self._next_chunk)
+        self._next_chunk += 1
+        for dx, column in enumerate(columns):
+            for y, ch in enumerate(column):
+                self._add_cell(first + dx, y, ch)
+        self.columns.extend(columns)
+        self.chunks.append(first)
+        self.width = first + len(columns)
+
+    def _drop_before(self, column):
+        left = column * TILE_SIZE
+        for _ in range(column - self.first_column):
+            self.columns.popleft()
+        self.first_column = column
+        self.platforms[:] = [p for p in self.platforms if self._rect_of(p).left >= left]
+        if getattr(self, '_index_platforms', None) is self.platforms:
+            for cell in [cell for cell in self._index if cell[0] < column]:
+                del self._index[cell]
+            self._index_count = len(self.platforms)
+        self.coin_spawns[:] = [pos for pos in self.coin_spawns if pos[0] >= left]
+        self.enemy_spawns[:] = [s for s in self.enemy_spawns if s[1][0] >= left]
+
+        # wall off the new first column
+        changes = {}
+        for y, old in enumerate(self.columns[0]):
+            if old != '#':
+                self._remove_cell(column, y, old)
+                self._add_cell(column, y, '#')
+                changes[(column, y)] = (old, '#')
+        self.columns[0] = '#' * ROWS
+        if changes:
+            for listener in list(self.listeners):
+                listener(changes)
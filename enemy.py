@@ -1,5 +1,12 @@
 import pygame
 import math
+from physics import solid_rects, move, get_pos, set_pos
+from render import LAYER_ENEMIES, rect_sprite
+
+def _enemy_sprite(size, color, facing_right):
+    surf = rect_sprite(color, size)
+    pygame.draw.circle(surf, (255, 255, 255), (22 if facing_right else 10, 9), 5)
+    return surf
 
 class Enemy:
     def __init__(self, pos, params):
@@ -13,15 +20,16 @@ class Enemy:
     def update(self, platforms, player, dt, cam_x):
         pass
 
-    def draw(self, surface, cam_x):
+    def draw(self, canvas, cam_x):
         px = self.rect.x - cam_x
         base_color = (80, 180, 50) if self.health == 2 else (180, 70, 40)
         if self.hit_timer > 0:
             color = (255, 230, 230)
         else:
             color = base_color
-        pygame.draw.rect(surface, color, (px, self.rect.y, self.rect.width, self.rect.height))
-        pygame.draw.circle(surface, (255, 255, 255), (px + (22 if self.facing_right else 10), self.rect.y + 9), 5)
+        key = ('enemy', self.rect.size, color, self.facing_right)
+        sprite = canvas.sprite(key, _enemy_sprite, self.rect.size, color, self.facing_right)
+        canvas.submit(LAYER_ENEMIES, sprite, (px, self.rect.y))
 
 class Patroller(Enemy):
     def __init__(self, pos, params):
@@ -30,14 +38,20 @@ class Patroller(Enemy):
         self.state = 'patrol'
 
     def update(self, platforms, player, dt, cam_x):
-        self.rect.x += int(self.dir * self.speed * dt)
-        edge_hit = True
-        test_rect = self.rect.move(self.dir * 2, 12)
-        for plat in platforms:
-            rect = plat[0] if isinstance(plat, tuple) else plat
-            if isinstance(rect, pygame.Rect) and test_rect.colliderect(rect):
-                edge_hit = False
-                break
+        rects = solid_rects(platforms)
+        x, y = get_pos(self)
+        x, y, hit_x, _ = move(x, y, self.rect.width, self.rect.height,
+                              self.dir * self.speed * dt, 0.0, rects)
+        set_pos(self, x, y)
+        # turn around at walls and where the ground ahead ends
+        edge_hit = bool(hit_x)
+        if not edge_hit:
+            edge_hit = True
+            test_rect = self.rect.move(self.dir * 2, 12)
+            for rect in rects:
+                if test_rect.colliderect(rect):
+                    edge_hit = False
+                    break
         if edge_hit:
             self.dir *= -1
             self.facing_right = not self.facing_right
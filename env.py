@@ -0,0 +1,182 @@
+"""Gym-style training environment around the headless Simulation.
+
+    env = MarioEnv()
+    obs = env.reset(seed=0)
+    obs, reward, done, info = env.step(env.action_space_n - 1)
+
+No display is opened and nothing waits on a frame limiter, so step() runs as
+fast as the simulation does. Throughput target: at least TARGET_STEPS_PER_SEC
+steps per second on one core, checked by ``python env.py --bench``.
+"""
+import argparse
+import os
+import sys
+import time
+
+from sim import Simulation, DEAD, COMPLETED
+from allocprof import AllocTracker, AllocationBudgetExceeded
+
+TARGET_STEPS_PER_SEC = 5000
+
+# Discrete action id -> (move_left, move_right, jump, shoot)
+ACTIONS = (
+    (False, False, False, False),  # 0 idle
+    (True, False, False, False),   # 1 left
+    (False, True, False, False),   # 2 right
+    (False, False, True, False),   # 3 jump
+    (True, False, True, False),    # 4 left + jump
+    (False, True, True, False),    # 5 right + jump
+    (False, False, False, True),   # 6 shoot
+    (False, True, False, True),    # 7 right + shoot
+    (False, True, True, True),     # 8 right + jump + shoot
+)
+
+# Reward = sum of weight * event count for the step
+REWARD_WEIGHTS = {
+    'score': 0.01,     # per point of score gained (coins and kills included)
+    'coin': 0.5,
+    'kill': 1.0,
+    'death': -5.0,
+    'complete': 20.0,
+    'progress': 0.0,   # per pixel moved right; 0 keeps rewards purely event-based
+}
+
+
+class MarioEnv:
+    """reset(seed) / step(action) interface over Simulation for learning agents.
+
+    With observation='vector' (default) observations are a flat tuple: player
+    x, y, vel_x, vel_y, on_ground, lives, offsets to the nearest enemy and nearest
+    uncollected coin, and the distance left to the end trigger. With
+    observation='grid' they are the uint8 tile window from observation.TileEncoder.
+    """
+
+    def __init__(self, level_file=None, hz=60.0, max_steps=60 * 180, reward_weights=None,
+                 adaptive_ai=None, observation='vector', view=(11, 21)):
+        self.level_file = level_file or os.path.join('data', 'level1.csv')
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.reward_weights = dict(REWARD_WEIGHTS, **(reward_weights or {}))
+        self.action_space_n = len(ACTIONS)
+        self.sim = Simulation(self.level_file, adaptive_ai=adaptive_ai)
+        self.steps = 0
+        if observation not in ('vector', 'grid'):
+            raise ValueError(f"unknown observation mode: {observation}")
+        self.encoder = None
+        if observation == 'grid':
+            from observation import TileEncoder
+            self.encoder = TileEncoder(self.sim, view)
+
+    def reset(self, seed=None):
+        self.sim.reset(seed=seed)
+        self.steps = 0
+        if self.encoder:
+            self.encoder.rebuild()
+        return self.observe()
+
+    def step(self, action):
+        sim = self.sim
+        score, coins, kills, deaths = sim.score, sim.coins_taken, sim.kills, sim.deaths
+        x = sim.player.rect.x
+        status = sim.step(self.dt, ACTIONS[action])
+        self.steps += 1
+
+        w = self.reward_weights
+        reward = (w['score'] * (sim.score - score)
+                  + w['coin'] * (sim.coins_taken - coins)
+                  + w['kill'] * (sim.kills - kills)
+                  + w['death'] * (sim.deaths - deaths)
+                  + w['progress'] * (sim.player.rect.x - x))
+        if status == COMPLETED:
+            reward += w['complete']
+        truncated = self.steps >= self.max_steps
+        done = status in (DEAD, COMPLETED) or truncated
+        info = {
+            'status': status,
+            'truncated': truncated and status is None,
+            'score': sim.score,
+            'lives': sim.lives,
+            'time': sim.time,
+        }
+        return self.observe(), reward, done, info
+
+    def observe(self):
+        if self.encoder:
+            return self.encoder.encode()
+        sim = self.sim
+        p = sim.player
+        px, py = p.rect.centerx, p.rect.centery
+        enemy_dx = enemy_dy = 0
+        best = None
+        for e in sim.enemies:
+            d = abs(e.rect.centerx - px)
+            if best is None or d < best:
+                best = d
+                enemy_dx, enemy_dy = e.rect.centerx - px, e.rect.centery - py
+        coin_dx = coin_dy = 0
+        coin = sim.pickups.nearest(px)
+        if coin:
+            coin_dx, coin_dy = coin['rect'].centerx - px, coin['rect'].centery - py
+        return (p.rect.x, p.rect.y, p.vel_x, p.vel_y, float(p.on_ground), sim.lives,
+                enemy_dx, enemy_dy, coin_dx, coin_dy, sim.end_trigger_x - p.rect.right)
+
+
+def benchmark(steps=20000, seed=0, level_file=None, observation='vector', tracker=None):
+    """Step with a fixed action cycle and return measured steps per second.
+
+    With an AllocTracker, each step is closed as one frame (and the rate is
+    meaningless because tracemalloc dominates).
+    """
+    env = MarioEnv(level_file, observation=observation)
+    env.reset(seed=seed)
+    cycle = (2, 2, 5, 8, 7, 2, 0, 5)
+    if tracker:
+        tracker.start()
+    t0 = time.perf_counter()
+    for i in range(steps):
+        _, _, done, _ = env.step(cycle[i % len(cycle)])
+        if done:
+            env.reset(seed=seed + i)
+        if tracker:
+            tracker.frame()
+    rate = steps / (time.perf_counter() - t0)
+    if tracker:
+        tracker.stop()
+    return rate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MarioEnv utilities")
+    parser.add_argument('--bench', action='store_true', help="measure step() throughput")
+    parser.add_argument('--steps', type=int, default=20000)
+    parser.add_argument('--level', default=None)
+    parser.add_argument('--observation', choices=('vector', 'grid'), default='vector')
+    parser.add_argument('--alloc-budget', type=float, default=None, metavar='BYTES',
+                        help="track allocations instead of speed; fail if the mean per-step peak "
+                             "(bytes allocated within a step, temporaries included) exceeds BYTES")
+    parser.add_argument('--retained-budget', type=float, default=None, metavar='BYTES',
+                        help="track allocations instead of speed; fail if memory still held after "
+                             "a step grows by more than BYTES per step on average (leak check)")
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.print_help()
+        return 0
+    if args.alloc_budget is not None or args.retained_budget is not None:
+        tracker = AllocTracker(peak_budget=args.alloc_budget, retained_budget=args.retained_budget, every=10)
+        benchmark(args.steps, level_file=args.level, observation=args.observation, tracker=tracker)
+        print(tracker.report())
+        try:
+            tracker.check_budget()
+        except AllocationBudgetExceeded as e:
+            print(f"[bench] {e.args[0].splitlines()[0]}")
+            return 1
+        print("[bench] allocations within budget")
+        return 0
+    rate = benchmark(args.steps, level_file=args.level, observation=args.observation)
+    ok = rate >= TARGET_STEPS_PER_SEC
+    print(f"[bench] env.step: {rate:,.0f} steps/s (target {TARGET_STEPS_PER_SEC:,}) {'OK' if ok else 'BELOW TARGET'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
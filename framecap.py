@@ -0,0 +1,242 @@
+"""Frame capture for headless runs: raw copies on the game thread, PNG encoding on workers.
+
+    cap = FrameCapture('data/captures/run-1', keep_last=180)
+    draw_frame(...); cap.grab(screen, tick)     # after each rendered frame
+    cap.dump('death')                           # write the kept frames
+    cap.close()
+
+grab() copies the surface's pixels into a pooled buffer (a memcpy of the
+surface view) and returns. A small worker pool encodes every grabbed frame
+to PNG right away with numpy and zlib, which release the GIL for the heavy
+parts; pygame.image.save would hold it and stall the game.
+
+With keep_last=0 each PNG is written as frame-TICK.png. With keep_last=N
+the newest N PNGs are kept in memory, capped at max_bytes, and dump(reason)
+writes them, plus any frames still being encoded, to REASON-NNN/ (main.py
+dumps on a lost life, on game over and on a crash). Raw buffers only exist
+for the few frames in flight, so memory stays at a few tens of MB whatever N.
+
+Costs at 1280x720: grab() takes about 0.6 ms on the game thread (4% of a
+60 fps frame, but a quarter of an unpaced headless frame), and encoding
+takes about 10 ms of CPU per frame (about 33 KB of PNG). If the workers fall
+behind and the pool runs out of buffers, grab() drops the frame and counts
+it rather than waiting; report() gives the drop rate. Unpaced headless runs
+outrun the encoders, so capture every Nth frame there (every=N,
+--capture-every=N).
+"""
+import os
+import queue
+import struct
+import sys
+import threading
+import zlib
+from collections import deque
+
+import numpy as np
+import pygame
+
+_STOP = object()
+MAX_BYTES = 64 << 20   # default cap on the kept PNGs
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _png_chunk(tag, data):
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(data, zlib.crc32(tag)))
+
+
+def encode_png(pixels, size, pitch, order=(0, 1, 2), level=3):
+    """PNG bytes of a raw 32-bit frame: rows `pitch` bytes apart, R/G/B at byte offsets `order`."""
+    w, h = size
+    px = np.frombuffer(pixels, np.uint8, h * pitch).reshape(h, pitch)[:, :w * 4].reshape(h, w, 4)
+    rows = np.zeros((h, 1 + w * 3), np.uint8)   # a leading 0 per row: filter type None
+    rgb = rows[:, 1:].reshape(h, w, 3)
+    for i, offset in enumerate(order):
+        rgb[:, :, i] = px[:, :, offset]
+    header = struct.pack('>IIBBBBB', w, h, 8, 2, 0, 0, 0)   # 8-bit RGB
+    return (_PNG_SIGNATURE + _png_chunk(b'IHDR', header)
+            + _png_chunk(b'IDAT', zlib.compress(rows, level)) + _png_chunk(b'IEND', b''))
+
+
+def _byte_order(surface):
+    """Byte offsets of R, G, B within a pixel of a 32-bit surface."""
+    r, g, b, _ = surface.get_masks()
+    offsets = [(mask.bit_length() - 1) // 8 for mask in (r, g, b)]
+    return tuple(offsets if sys.byteorder == 'little' else [3 - i for i in offsets])
+
+
+class FrameCapture:
+    """Copies frames into pooled buffers and encodes them as PNGs in the background."""
+
+    def __init__(self, path, keep_last=0, every=1, workers=2, level=1, max_bytes=MAX_BYTES):
+        self.path = path
+        self.keep_last = keep_last
+        self.every = max(1, every)
+        self.level = level
+        self.max_bytes = max_bytes
+        self.grabbed = 0
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self.dumps = 0
+        self._frames = 0
+        # raw frames are width * height * 4 bytes (3.7 MB at 1280x720); only
+        # those waiting for an encoder hold one
+        self._limit = 2 * max(1, workers) + 2
+        self._allocated = 0
+        self._free = queue.SimpleQueue()
+        self._ring = deque()          # (tick, png) of the newest encoded frames
+        self._ring_bytes = 0
+        self._seq = 0                 # grab number, tells in-flight frames apart when ticks repeat
+        self._encoding = set()        # grab numbers not encoded yet
+        self._dumping = []            # (directory, grab numbers still encoding) per unfinished dump
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._busy = 0                # queued items not finished yet
+        self._queue = queue.SimpleQueue()
+        os.makedirs(path, exist_ok=True)
+        self._threads = [threading.Thread(target=self._run, name=f'framecap-{i}', daemon=True)
+                         for i in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+    def _buffer(self, nbytes):
+        while True:
+            try:
+                buf = self._free.get_nowait()
+            except queue.Empty:
+                break
+            if len(buf) == nbytes:
+                return buf
+            self._allocated -= 1   # the frame size changed; let it go
+        if self._allocated >= self._limit:
+            return None
+        self._allocated += 1
+        return bytearray(nbytes)
+
+    def grab(self, surface, tick):
+        """Copy a rendered frame; False if it was skipped (see `every`) or dropped."""
+        self._frames += 1
+        if (self._frames - 1) % self.every:
+            return False
+        size = surface.get_size()
+        if surface.get_bytesize() == 4:
+            pitch, order = surface.get_pitch(), _byte_order(surface)
+            view = surface.get_view('0')
+        else:
+            pitch, order = size[0] * 4, (0, 1, 2)
+            view = pygame.image.tobytes(surface, 'RGBX')
+        with self._lock:
+            buf = self._buffer(pitch * size[1])
+            if buf is None:
+                self.dropped += 1
+                return False
+            memoryview(buf)[:] = view   # a straight memcpy; bytearray slicing would copy twice
+            self.grabbed += 1
+            self._seq += 1
+            seq = self._seq
+            if self.keep_last:
+                self._encoding.add(seq)
+            self._busy += 1
+        self._queue.put((buf, size, pitch, order, tick, seq))
+        return True
+
+    def dump(self, reason):
+        """Write the kept frames (keep_last mode) to REASON-NNN/; returns that directory or None.
+
+        Frames grabbed before the dump but still encoding go there too once done.
+        """
+        with self._lock:
+            # frames in flight that no earlier dump is waiting for
+            in_flight = self._encoding.difference(*(pending for _, pending in self._dumping))
+            if not self._ring and not in_flight:
+                return None
+            frames, self._ring, self._ring_bytes = self._ring, deque(), 0
+            # the newest keep_last frames, counting those still in flight
+            while frames and len(frames) + len(in_flight) > self.keep_last:
+                frames.popleft()
+            self.dumps += 1
+            directory = os.path.join(self.path, f"{reason}-{self.dumps:03d}")
+            os.makedirs(directory, exist_ok=True)
+            if in_flight:
+                self._dumping.append((directory, in_flight))
+            self._busy += len(frames)
+        for tick, data in frames:
+            self._queue.put((os.path.join(directory, f"frame-{tick:08d}.png"), data))
+        return directory
+
+    def wait(self, timeout=None):
+        """Block until every frame grabbed or dumped so far is encoded and written."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._busy, timeout)
+
+    def _done(self):
+        with self._lock:
+            self._busy -= 1
+            if not self._busy:
+                self._idle.notify_all()
+
+    def _write(self, path, data):
+        try:
+            with open(path, 'wb') as f:
+                f.write(data)
+            with self._lock:
+                self.written += 1
+        except OSError as e:
+            with self._lock:
+                self.errors += 1
+            print(f"[capture] frame write failed: {e}")
+
+    def _keep(self, tick, seq, data):
+        with self._lock:
+            self._encoding.discard(seq)
+            for i, (directory, pending) in enumerate(self._dumping):
+                if seq in pending:
+                    pending.discard(seq)
+                    if not pending:
+                        del self._dumping[i]
+                    return os.path.join(directory, f"frame-{tick:08d}.png")
+            self._ring.append((tick, data))
+            self._ring_bytes += len(data)
+            while len(self._ring) > self.keep_last or self._ring_bytes > self.max_bytes:
+                self._ring_bytes -= len(self._ring.popleft()[1])
+        return None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if len(item) == 2:
+                # (path, png) from dump()
+                self._write(*item)
+                self._done()
+                continue
+            buf, size, pitch, order, tick, seq = item
+            try:
+                data = encode_png(buf, size, pitch, order, self.level)
+            except Exception as e:
+                data = None
+                with self._lock:
+                    self.errors += 1
+                    self._encoding.discard(seq)
+                print(f"[capture] frame encode failed: {e}")
+            self._free.put(buf)
+            if data is not None:
+                path = self._keep(tick, seq, data) if self.keep_last else os.path.join(self.path, f"frame-{tick:08d}.png")
+                if path:
+                    self._write(path, data)
+            self._done()
+
+    def close(self):
+        """Write queued frames and stop the workers; kept frames are dropped unless dumped."""
+        if any(thread.is_alive() for thread in self._threads):
+            for _ in self._threads:
+                self._queue.put(_STOP)
+            for thread in self._threads:
+                thread.join()
+
+    def report(self):
+        offered = self.grabbed + self.dropped
+        rate = f" ({self.dropped * 100 / offered:.0f}%)" if self.dropped else ""
+        return (f"[capture] {self.grabbed} frames grabbed, {self.written} written, "
+                f"{self.dropped} dropped{rate}, {self.dumps} dumps")
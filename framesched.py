@@ -0,0 +1,141 @@
+"""Fixed-rate simulation with render skipping and load shedding.
+
+    sched = FrameScheduler(hz=60, max_skip=4)
+    while running:
+        clock.tick(FPS if sched.paced else 0)
+        render = sched.begin_frame()
+        update(sched.dt)
+        if render:
+            draw(shed=sched.shed)
+        sched.end_frame()
+
+Every loop iteration advances the simulation by one fixed step. The scheduler
+compares that with the real time that passed: while the simulation lags by a
+step or more, frames are not rendered (up to `max_skip` in a row), so the
+update-only iterations catch up and gameplay keeps its speed. Lag beyond what
+skipping can recover is dropped and counted, and only then does the game slow
+down.
+
+Optional drawing is shed in SHED_ORDER as the smoothed work time of rendered
+frames approaches the frame budget, and restored once it falls well below.
+"""
+import time
+
+# optional work, dropped first to last
+SHED_ORDER = ('birds', 'clouds', 'castle')
+# shed one more item above this fraction of the budget, restore one below the other
+SHED_HIGH = 0.85
+SHED_LOW = 0.55
+# rendered frames between shed level changes
+SHED_HOLD_FRAMES = 30
+
+
+class FrameScheduler:
+    """Decides per iteration whether to render, and which optional work to skip."""
+
+    def __init__(self, hz=60, max_skip=4, clock=time.perf_counter, smoothing=0.1):
+        self.dt = 1.0 / hz
+        self.max_skip = max(0, max_skip)
+        self.clock = clock
+        self.smoothing = smoothing
+        self.lag = 0.0
+        self.work = 0.0          # smoothed seconds of work per rendered frame
+        self.shed_level = 0
+        self.shed = frozenset()
+        self.render = True
+        self._last = None
+        self._begin = None
+        self._run = 0            # frames skipped in a row
+        self._hold = 0
+        self.reset_stats()
+        self._totals = self._window()
+
+    def reset_stats(self):
+        self.frames = 0
+        self.rendered = 0
+        self.skipped = 0
+        self.dropped = 0.0
+        self.shed_frames = dict.fromkeys(SHED_ORDER, 0)
+
+    def _window(self):
+        return {'frames': self.frames, 'rendered': self.rendered, 'skipped': self.skipped,
+                'dropped': self.dropped, 'shed_frames': dict(self.shed_frames)}
+
+    @property
+    def paced(self):
+        """False while catching up, when the frame limiter must not sleep."""
+        return self.lag < self.dt / 2
+
+    def begin_frame(self):
+        """Start an iteration (after the frame limiter); returns whether to render it."""
+        now = self.clock()
+        elapsed = self.dt if self._last is None else now - self._last
+        self._last = self._begin = now
+        self.lag = max(0.0, self.lag + elapsed - self.dt)
+        cap = (self.max_skip + 1) * self.dt
+        if self.lag > cap:
+            # more behind than skipping can recover: let the game slow down
+            self.dropped += self.lag - cap
+            self.lag = cap
+        self.frames += 1
+        self.render = self.lag < self.dt or self._run >= self.max_skip
+        if self.render:
+            self._run = 0
+            self.rendered += 1
+            for name in self.shed:
+                self.shed_frames[name] += 1
+        else:
+            self._run += 1
+            self.skipped += 1
+        return self.render
+
+    def end_frame(self):
+        """Close the iteration; rendered frames feed the shedding decision."""
+        if not self.render or self._begin is None:
+            return
+        work = self.clock() - self._begin
+        self.work += (work - self.work) * self.smoothing
+        if self._hold > 0:
+            self._hold -= 1
+            return
+        level = self.shed_level
+        if self.work > SHED_HIGH * self.dt and level < len(SHED_ORDER):
+            level += 1
+        elif self.work < SHED_LOW * self.dt and level > 0:
+            level -= 1
+        if level != self.shed_level:
+            self.shed_level = level
+            self.shed = frozenset(SHED_ORDER[:level])
+            self._hold = SHED_HOLD_FRAMES
+
+    def _fold(self):
+        # move the current counters into the running totals used by report()
+        window, totals = self._window(), self._totals
+        for key in ('frames', 'rendered', 'skipped', 'dropped'):
+            totals[key] += window[key]
+        for name, n in window['shed_frames'].items():
+            totals['shed_frames'][name] += n
+        self.reset_stats()
+        return window
+
+    def take(self):
+        """Counters since the last take() (for telemetry's per-second records)."""
+        window = self._fold()
+        return {
+            'frames': window['frames'],
+            'rendered': window['rendered'],
+            'skipped': window['skipped'],
+            'dropped_ms': round(window['dropped'] * 1000.0, 3),
+            'work_ms': round(self.work * 1000.0, 3),
+            'shed': [name for name in SHED_ORDER if name in self.shed],
+            'shed_frames': {k: v for k, v in window['shed_frames'].items() if v},
+        }
+
+    def report(self):
+        """One-line summary since the last report(), then start a new one."""
+        self._fold()
+        t = self._totals
+        self._totals = self._window()
+        shed = ', '.join(f"{k} {v}" for k, v in t['shed_frames'].items() if v) or 'none'
+        return (f"[sched] {t['frames']} frames: {t['rendered']} rendered, {t['skipped']} skipped, "
+                f"{t['dropped'] * 1000.0:.0f} ms dropped; frames with work shed: {shed}")
@@ -0,0 +1,44 @@
+import os
+import time
+from levelpack import read_rows, split_ref
+
+
+class LevelWatcher:
+    """Polls a level file and patches the running Level when it changes on disk.
+
+    Only cells that differ from the loaded grid are touched (see
+    Level.apply_rows), so the player, score and live enemies are kept.
+    Polling is rate-limited, so poll() is cheap enough to call every frame.
+    """
+
+    def __init__(self, filename, interval=0.5, clock=time.monotonic):
+        self.filename = filename
+        self.path = split_ref(filename)[0]
+        self.interval = interval
+        self.clock = clock
+        self._next_check = 0.0
+        self._stamp = self._read_stamp()
+
+    def _read_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def poll(self, force=False):
+        """Return the new grid rows if the file changed since the last poll, else None."""
+        now = self.clock()
+        if not force and now < self._next_check:
+            return None
+        self._next_check = now + self.interval
+        stamp = self._read_stamp()
+        if stamp is None or stamp == self._stamp:
+            return None
+        self._stamp = stamp
+        try:
+            rows = read_rows(self.filename)
+        except (OSError, ValueError):
+            return None
+        # an editor may have truncated the file mid-save; wait for the next write
+        return rows if rows else None
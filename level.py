@@ -1,5 +1,7 @@
 import pygame
 import os
+from levelpack import read_rows
+from render import LAYER_MARKERS, circle_sprite, rect_sprite
 
 TILE_SIZE = 64
 
@@ -12,6 +14,9 @@ class Level:
         self.player_spawn = (64, 64)
         self.width = 0
         self.height = 0
+        self.rows = []
+        # callables notified with {(x, y): (old, new)} after apply_rows()
+        self.listeners = []
 
         self.colors = {
             '#': (139, 69, 19),   # Brown - ground/platform
@@ -22,51 +27,297 @@ class Level:
             'P': (180, 180, 255), # Light blue - special platform
         }
 
+        # leftmost live tile column; only endless levels (endless.py) move it
+        self.first_column = 0
+        self._terrain = None
         self.load_level()
 
     def load_level(self):
-        with open(self.filename, "r") as f:
-            lines = [line.rstrip("\n") for line in f.readlines()]
+        # plain txt/csv grid, or a 'levels.pack#N' reference (see levelpack.py)
+        lines = read_rows(self.filename)
 
+        self.rows = lines
         self.height = len(lines)
         self.width = max(len(line) for line in lines)
 
         for y, line in enumerate(lines):
             for x, ch in enumerate(line):
-                world_x = x * TILE_SIZE
-                world_y = y * TILE_SIZE
-                rect = pygame.Rect(world_x, world_y, TILE_SIZE, TILE_SIZE)
-
-                if ch == "#":
-                    self.platforms.append((rect, ch))
-                elif ch == "C":
-                    self.coin_spawns.append((world_x, world_y))
-                elif ch == "@":
-                    self.player_spawn = (world_x, world_y)
-                elif ch == "E":
-                    # Map legacy 'E' to Chaser type
-                    self.enemy_spawns.append(("C", (world_x, world_y)))
-                elif ch == "$":
-                    self.platforms.append((rect, ch))
-                elif ch == "P":
-                    # Keep special platform visual, also treat as a Patroller spawn
-                    self.platforms.append((rect, ch))
-                    self.enemy_spawns.append(("P", (world_x, world_y)))
-
-    def draw(self, surface, cam_x):
+                self._add_cell(x, y, ch)
+        self._terrain = TerrainProfile(self)
+
+    def _add_cell(self, x, y, ch):
+        world_x = x * TILE_SIZE
+        world_y = y * TILE_SIZE
+        rect = pygame.Rect(world_x, world_y, TILE_SIZE, TILE_SIZE)
+
+        if ch == "#":
+            self._add_platform((rect, ch))
+        elif ch == "C":
+            self.coin_spawns.append((world_x, world_y))
+        elif ch == "@":
+            self.player_spawn = (world_x, world_y)
+        elif ch == "E":
+            # Map legacy 'E' to Chaser type
+            self.enemy_spawns.append(("C", (world_x, world_y)))
+        elif ch == "$":
+            self._add_platform((rect, ch))
+        elif ch == "P":
+            # Keep special platform visual, also treat as a Patroller spawn
+            self._add_platform((rect, ch))
+            self.enemy_spawns.append(("P", (world_x, world_y)))
+
+    def _remove_cell(self, x, y, ch):
+        world_x = x * TILE_SIZE
+        world_y = y * TILE_SIZE
+        if ch in ("#", "$", "P"):
+            for plat in self.platforms_in(pygame.Rect(world_x, world_y, TILE_SIZE, TILE_SIZE)):
+                rect = plat[0] if isinstance(plat, tuple) else plat
+                if rect.topleft == (world_x, world_y):
+                    self._remove_platform(plat)
+                    break
+        if ch == "C" and (world_x, world_y) in self.coin_spawns:
+            self.coin_spawns.remove((world_x, world_y))
+        elif ch in ("E", "P"):
+            spawn = ("C" if ch == "E" else "P", (world_x, world_y))
+            if spawn in self.enemy_spawns:
+                self.enemy_spawns.remove(spawn)
+        # a removed '@' keeps the old spawn point unless another '@' is added
+
+    def _add_platform(self, plat):
+        self.platforms.append(plat)
+        if getattr(self, '_index_platforms', None) is self.platforms:
+            # keep the collision index current instead of rebuilding it
+            key = self._order_key(plat)
+            for cell in self._cells_of(plat):
+                entries = self._index.setdefault(cell, [])
+                entries.append((key, plat))
+                entries.sort()
+            self._index_count = len(self.platforms)
+
+    def _remove_platform(self, plat):
+        for i, other in enumerate(self.platforms):
+            if other is plat:
+                del self.platforms[i]
+                break
+        if getattr(self, '_index_platforms', None) is self.platforms:
+            for cell in self._cells_of(plat):
+                entries = self._index.get(cell, [])
+                entries[:] = [e for e in entries if e[1] is not plat]
+            self._index_count = len(self.platforms)
+
+    def diff_rows(self, new_rows):
+        """Cells that differ between the loaded grid and new_rows: {(x, y): (old, new)}."""
+        changes = {}
+        for y in range(max(len(self.rows), len(new_rows))):
+            old = self.rows[y] if y < len(self.rows) else ''
+            new = new_rows[y] if y < len(new_rows) else ''
+            if old == new:
+                continue
+            for x in range(max(len(old), len(new))):
+                a = old[x] if x < len(old) else '.'
+                b = new[x] if x < len(new) else '.'
+                if a != b:
+                    changes[(x, y)] = (a, b)
+        return changes
+
+    def apply_rows(self, new_rows):
+        """Patch only the cells that changed to match new_rows; returns the changes.
+
+        Platforms, spawn lists and the collision index are updated in place and
+        every callable in self.listeners is told about the changed cells so
+        caches built from the level can patch themselves too.
+        """
+        changes = self.diff_rows(new_rows)
+        for (x, y), (old, new) in changes.items():
+            self._remove_cell(x, y, old)
+            self._add_cell(x, y, new)
+        self.rows = list(new_rows)
+        self.height = len(new_rows)
+        self.width = max((len(line) for line in new_rows), default=0)
+        if changes:
+            self._terrain = TerrainProfile(self)
+            for listener in list(self.listeners):
+                listener(changes)
+        return changes
+
+    @staticmethod
+    def _rect_of(plat):
+        return plat[0] if isinstance(plat, tuple) else plat
+
+    def _cells_of(self, plat):
+        rect = self._rect_of(plat)
+        for ty in range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1):
+            for tx in range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1):
+                yield (tx, ty)
+
+    def _order_key(self, plat):
+        # row-major, matching the order cells are read from the file
+        rect = self._rect_of(plat)
+        self._index_seq += 1
+        return (rect.top, rect.left, self._index_seq)
+
+    def _build_index(self):
+        # tile cell -> sorted [(order key, platform)], for local collision queries
+        index = {}
+        spans_cells = False
+        self._index_seq = 0
+        for plat in self.platforms:
+            cells = list(self._cells_of(plat))
+            spans_cells = spans_cells or len(cells) > 1
+            key = self._order_key(plat)
+            for cell in cells:
+                index.setdefault(cell, []).append((key, plat))
+        for entries in index.values():
+            entries.sort()
+        self._index = index
+        self._index_dedupe = spans_cells
+        self._index_platforms = self.platforms
+        self._index_count = len(self.platforms)
+
+    def platforms_in(self, rect):
+        """Platforms whose tile cells intersect rect, in row-major tile order.
+
+        Lets per-entity collision loops test a handful of nearby tiles instead of
+        the whole level. The index is rebuilt if self.platforms is replaced or
+        resized from outside; apply_rows() keeps it current itself.
+        """
+        if (getattr(self, '_index_platforms', None) is not self.platforms
+                or self._index_count != len(self.platforms)):
+            self._build_index()
+        get = self._index.get
+        found = []
+        cols = range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1)
+        for ty in range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1):
+            for tx in cols:
+                cell = get((tx, ty))
+                if cell:
+                    found += cell
+        if len(found) > 1:
+            found = sorted(dict(found).items()) if self._index_dedupe else sorted(found)
+        return [plat for _, plat in found]
+
+    @property
+    def terrain(self):
+        """TerrainProfile of the current tiles.
+
+        Built at load and after apply_rows(); rebuilt here if self.platforms is
+        replaced or resized from outside.
+        """
+        terrain = self._terrain
+        if terrain is None or terrain.platforms is not self.platforms or terrain.count != len(self.platforms):
+            terrain = self._terrain = TerrainProfile(self)
+        return terrain
+
+    def draw(self, canvas, cam_x):
         for rect, symbol in self.platforms:
             color = self.colors.get(symbol, (120, 120, 120))
-            pygame.draw.rect(surface, color,
-                             (rect.x - cam_x, rect.y, rect.width, rect.height))
+            canvas.rect(color, (rect.x - cam_x, rect.y, rect.width, rect.height))
+        self.draw_markers(canvas, cam_x)
 
+    def draw_markers(self, canvas, cam_x):
         # Draw coins
+        coin = canvas.sprite(('marker', 'C'), circle_sprite, self.colors["C"], 12)
         for (x, y) in self.coin_spawns:
-            pygame.draw.circle(surface, self.colors["C"], (x - cam_x + 32, y + 32), 12)
+            canvas.submit(LAYER_MARKERS, coin, (x - cam_x + 20, y + 20))
 
         # Draw enemies (editor-style markers). Support typed and legacy formats.
+        marker = canvas.sprite(('marker', 'E'), rect_sprite, self.colors["E"], (48, 48))
         for item in self.enemy_spawns:
             if isinstance(item, tuple) and len(item) == 2 and isinstance(item[0], str):
                 _, (x, y) = item
             else:
                 x, y = item
-            pygame.draw.rect(surface, self.colors["E"], (x - cam_x + 8, y + 16, 48, 48))
+            canvas.submit(LAYER_MARKERS, marker, (x - cam_x + 8, y + 16))
+
+
+class TerrainProfile:
+    """Per-column terrain tables of a Level.
+
+    Tables cover the level's live columns, first..width-1, and are indexed by
+    column - first (first is 0 except in endless levels). Heights are pixel y
+    values (smaller is higher) and columns are absolute; None means there is none.
+
+        solid[i]      bitmask of the solid tile rows
+        floor[i]      top of the solid run standing on the bottom row, None over a pit
+        surface[i]    top of the highest solid cell with air above it
+        ceiling[i]    underside of the lowest solid cell above the floor
+        next_gap[i]   first pit column at or after this one
+        gap_end[i]    column just past the pit that starts at next_gap[i]
+        next_wall[i]  first column after this one whose floor is higher
+    """
+
+    def __init__(self, level):
+        self.platforms = level.platforms
+        self.count = len(level.platforms)
+        first, width = level.first_column, level.width
+        n = max(0, width - first)
+        solid = [0] * n
+        for plat in level.platforms:
+            for tx, ty in level._cells_of(plat):
+                if first <= tx < width and ty >= 0:
+                    solid[tx - first] |= 1 << ty
+        rows = max([level.height] + [mask.bit_length() for mask in solid])
+        self.first = first
+        self.width = width
+        self.solid = solid
+        self.floor = [None] * n
+        self.surface = [None] * n
+        self.ceiling = [None] * n
+        bottom = rows - 1
+        for i, mask in enumerate(solid):
+            top = next((r for r in range(1, rows) if mask >> r & 1 and not mask >> (r - 1) & 1), None)
+            if top is not None:
+                self.surface[i] = top * TILE_SIZE
+            if bottom < 0 or not mask >> bottom & 1:
+                continue
+            r = bottom
+            while r > 0 and mask >> (r - 1) & 1:
+                r -= 1
+            self.floor[i] = r * TILE_SIZE
+            above = mask & ((1 << r) - 1)
+            if above:
+                self.ceiling[i] = above.bit_length() * TILE_SIZE
+
+        self.next_gap = [None] * n
+        self.gap_end = [None] * n
+        gap = end = None
+        for i in range(n - 1, -1, -1):
+            c = first + i
+            if self.floor[i] is None:
+                if gap != c + 1:
+                    end = c + 1
+                gap = c
+            self.next_gap[i], self.gap_end[i] = gap, end
+
+        # next higher floor to the right, keeping a stack of candidates; pits are lowest
+        depth = [float('inf') if y is None else y for y in self.floor]
+        self.next_wall = [None] * n
+        stack = []
+        for i in range(n - 1, -1, -1):
+            while stack and depth[stack[-1]] >= depth[i]:
+                stack.pop()
+            self.next_wall[i] = first + stack[-1] if stack else None
+            stack.append(i)
+
+    def floor_at(self, c):
+        """floor of column c, None over a pit or outside the live columns."""
+        return self.floor[c - self.first] if self.first <= c < self.width else None
+
+    def solid_in(self, rect):
+        """True if any solid tile intersects rect."""
+        top = max(0, rect.top // TILE_SIZE)
+        bottom = (rect.bottom - 1) // TILE_SIZE
+        if bottom < top:
+            return False
+        rows = ((1 << (bottom + 1)) - 1) ^ ((1 << top) - 1)
+        first = max(self.first, rect.left // TILE_SIZE)
+        last = min(self.width - 1, (rect.right - 1) // TILE_SIZE)
+        return any(self.solid[c - self.first] & rows for c in range(first, last + 1))
+
+    def clear_ahead(self, c):
+        """Columns after c before the next pit or higher floor (up to the last live column)."""
+        if not self.first <= c < self.width:
+            return 0
+        i = c - self.first
+        ahead = [n for n in (self.next_gap[i], self.next_wall[i]) if n is not None and n > c]
+        return min(ahead) - c - 1 if ahead else self.width - c - 1
@@ -0,0 +1,256 @@
+"""Level completability checker: can the player get from '@' to the end trigger and every coin?
+
+Reachability is searched over standing places (an empty cell above a solid
+one). Walking joins neighbours on the same row; every other move is flown
+with the real Player.update against the level's tiles: a full jump left,
+right or straight up (with a run-up when the ledge allows one), and walking
+off an edge. Landing cells become new places; coins and the end trigger
+count as reached if the player's rect touches them at any tick, standing or
+in flight. Enemies are ignored and input is assumed frame-perfect (jumping
+off the last pixel of a ledge), so a pass means the terrain allows it, not
+that the AutoPlayer will manage it.
+
+Levels are checked in a process pool:
+
+    python levelcheck.py                         # levels/ and data/, including packs
+    python levelcheck.py levels/level1.txt data/levels.pack#3 --json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from level import TILE_SIZE
+from levelpack import open_pack, make_ref
+from physics import set_pos
+from player import RUN_SPEED, JUMP_HOLD_TIME
+from sim import Simulation
+
+DT = 1.0 / 60
+MAX_FLIGHT_TICKS = 240
+
+
+class _Grid:
+    """Solid cells of a Level plus the trigger and coin targets of its Simulation."""
+
+    def __init__(self, sim):
+        level = sim.level
+        self.level = level
+        self.width = level.width
+        self.solid = set()
+        for plat in level.platforms:
+            rect = plat[0] if isinstance(plat, tuple) else plat
+            for ty in range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1):
+                for tx in range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1):
+                    self.solid.add((tx, ty))
+        self.trigger_x = sim.end_trigger_x
+        self.death_y = sim.screen_height + 120
+        self.coins = {(c['rect'].x // TILE_SIZE, c['rect'].y // TILE_SIZE): c['rect'] for c in sim.coins}
+
+    def standing(self, x, y):
+        return (x, y) not in self.solid and (x, y + 1) in self.solid
+
+
+class _Flyer:
+    """Flies the real Player through the level and reports where it lands."""
+
+    def __init__(self, grid, player):
+        self.grid = grid
+        self.player = player
+
+    def place(self, left, top, vel_x=0.0, on_ground=True):
+        p = self.player
+        set_pos(p, float(left), float(top))
+        p.vel_x, p.vel_y = vel_x, 0.0
+        p.on_ground, p.jumping, p.jump_timer = on_ground, False, 0.0
+
+    def stand(self, left, y, vel_x):
+        self.place(left, (y + 1) * TILE_SIZE - self.player.rect.height, vel_x)
+
+    def fly(self, direction, jump, touched):
+        """Fly from the placed state; returns the landing place or None (fell out / no landing)."""
+        p, grid, level = self.player, self.grid, self.grid.level
+        airborne = not p.on_ground
+        hold = int(JUMP_HOLD_TIME / DT) + 2
+        for tick in range(MAX_FLIGHT_TICKS):
+            p.handle_input(direction < 0, direction > 0, jump and tick < hold, False, (), None, None)
+            p.update(level.platforms_in(p.rect.inflate(2 * TILE_SIZE, 2 * TILE_SIZE)), DT)
+            self._touch(touched)
+            if p.rect.top > grid.death_y:
+                return None
+            if not p.on_ground:
+                airborne = True
+            elif airborne:
+                return self._landing()
+            elif not jump and tick > MAX_FLIGHT_TICKS // 4:
+                return None  # walked along something instead of falling
+        return None
+
+    def _touch(self, touched):
+        rect, grid = self.player.rect, self.grid
+        if rect.right >= grid.trigger_x:
+            touched.add('end')
+        for ty in range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1):
+            for tx in range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1):
+                if (tx, ty) in grid.coins and rect.colliderect(grid.coins[(tx, ty)]):
+                    touched.add((tx, ty))
+
+    def _landing(self):
+        rect, grid = self.player.rect, self.grid
+        y = rect.bottom // TILE_SIZE - 1
+        centre = rect.centerx // TILE_SIZE
+        # prefer the column under the centre; a player overhanging an edge stands on the other one
+        for x in (centre, rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE):
+            if grid.standing(x, y):
+                return (x, y)
+        return None
+
+
+def _launches(grid, x, y, pw):
+    """(left, vel_x, direction, jump) flights worth trying from the place (x, y) for a player pw wide."""
+    centre = x * TILE_SIZE + (TILE_SIZE - pw) // 2
+    yield centre, 0.0, 0, True
+    for d in (-1, 1):
+        nx = x + d
+        # two cells of floor behind give close to full RUN_SPEED
+        run_up = grid.standing(x - d, y) and grid.standing(x - 2 * d, y)
+        vel = d * RUN_SPEED if run_up else 0.0
+        if grid.standing(nx, y):
+            left = centre
+        elif (nx, y) in grid.solid:
+            # against the wall
+            left = x * TILE_SIZE if d < 0 else (x + 1) * TILE_SIZE - pw
+        else:
+            # overhanging the edge by all but one pixel
+            left = x * TILE_SIZE - pw + 1 if d < 0 else (x + 1) * TILE_SIZE - 1
+            yield left, vel, d, False
+        yield left, vel, d, True
+
+
+def check_level(ref, screen_height=720):
+    """Reachability report for one level file or pack reference (a JSON-able dict)."""
+    sim = Simulation(ref, seed=0, screen_height=screen_height)
+    grid = _Grid(sim)
+    flyer = _Flyer(grid, sim.player)
+    result = {'level': ref, 'width': grid.width, 'coins': len(grid.coins)}
+
+    # the player drops from the '@' cell
+    touched = set()
+    flyer.place(*sim.level.player_spawn, on_ground=False)
+    start = flyer.fly(0, False, touched)
+    if start is None:
+        result.update(completable=False, reason='spawn has no floor', reachable=0,
+                      furthest_column=sim.level.player_spawn[0] // TILE_SIZE, blocking_column=None,
+                      unreachable_coins=[list(c) for c in sorted(grid.coins)])
+        return result
+
+    seen = {start}
+    queue = [start]
+    flights = 0
+    while queue:
+        x, y = queue.pop()
+        touched.add((x, y))
+        right = (x + 1) * TILE_SIZE
+        if right >= grid.trigger_x:
+            touched.add('end')
+        nexts = [(x + d, y) for d in (-1, 1) if grid.standing(x + d, y)]
+        for left, vel, d, jump in _launches(grid, x, y, sim.player.rect.width):
+            flights += 1
+            flyer.stand(left, y, vel)
+            landing = flyer.fly(d, jump, touched)
+            if landing:
+                nexts.append(landing)
+        for place in nexts:
+            if place not in seen:
+                seen.add(place)
+                queue.append(place)
+
+    unreachable = sorted(c for c in grid.coins if c not in touched)
+    furthest = max(x for x, _ in seen)
+    completable = 'end' in touched
+    result.update(completable=completable, reachable=len(seen), flights=flights,
+                  furthest_column=furthest,
+                  blocking_column=None if completable else furthest + 1,
+                  reason=None if completable else _blocker(grid, furthest + 1, seen),
+                  unreachable_coins=[list(c) for c in unreachable])
+    return result
+
+
+def _blocker(grid, column, seen):
+    """Describe why the column past the furthest reachable one stops the player."""
+    rows = [y for _, y in seen]
+    if any((column, y) in grid.solid for y in range(min(rows) - 2, max(rows) + 1)):
+        return f"wall at column {column}"
+    return f"gap at column {column}"
+
+
+def level_refs(paths):
+    """Expand directories, globs and packs into level files / pack references."""
+    refs = []
+    for path in paths:
+        if '#' in path:
+            refs.append(path)
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(('.txt', '.csv', '.pack')):
+                    refs.extend(level_refs([os.path.join(path, name)]))
+        elif path.endswith('.pack'):
+            pack = open_pack(path)
+            refs.extend(make_ref(path, level_id) for level_id in pack.ids())
+        else:
+            refs.extend(sorted(glob.glob(path)) or [path])
+    return refs
+
+
+def _check_safely(ref):
+    try:
+        return check_level(ref)
+    except Exception as e:
+        return {'level': ref, 'completable': False, 'error': f"{type(e).__name__}: {e}"}
+
+
+def check_levels(refs, workers=None):
+    """check_level() for every ref in a process pool, results in input order."""
+    if workers == 1 or len(refs) <= 1:
+        return [_check_safely(ref) for ref in refs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_check_safely, refs))
+
+
+def format_result(r):
+    if 'error' in r:
+        return f"[error] {r['level']}: {r['error']}"
+    coins = f"{r['coins'] - len(r['unreachable_coins'])}/{r['coins']} coins"
+    if r['completable']:
+        line = f"[ok]    {r['level']}: end reachable, {coins}"
+    else:
+        line = f"[fail]  {r['level']}: end unreachable ({r['reason']}; furthest column {r['furthest_column']}), {coins}"
+    if r['unreachable_coins']:
+        line += "; unreachable coins at " + ' '.join(f"({x},{y})" for x, y in r['unreachable_coins'])
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that levels can be completed")
+    parser.add_argument('paths', nargs='*', default=['levels', 'data'],
+                        help="level files, directories, packs or pack#id references")
+    parser.add_argument('--workers', type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument('--json', action='store_true', help="print one JSON result per line")
+    parser.add_argument('--strict-coins', action='store_true', help="also fail on unreachable coins")
+    args = parser.parse_args(argv)
+
+    results = check_levels(level_refs(args.paths), args.workers)
+    failed = 0
+    for r in results:
+        print(json.dumps(r) if args.json else format_result(r))
+        if not r['completable'] or (args.strict_coins and r.get('unreachable_coins')):
+            failed += 1
+    if not args.json:
+        print(f"[check] {len(results) - failed}/{len(results)} levels passed")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Level pack archive: many levels in one file with an indexed table of contents.
+
+Layout (little-endian):
+
+    header   magic b'AMLP', version u16, reserved u16, count u32
+    index    count x (level_id u32, data_offset u64, data_len u32,
+                      width u16, height u16, meta_offset u64, meta_len u32)
+    blobs    level rows as ASCII joined by '\\n', then UTF-8 JSON metadata
+
+Readers memory-map the file and only slice the bytes of the level they ask
+for. Levels inside a pack are referenced as "path/to/levels.pack#<id>"
+anywhere a level filename is accepted.
+
+    python levelpack.py pack -o data/levels.pack data/level*.csv levels/*.txt
+    python levelpack.py list data/levels.pack
+"""
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+MAGIC = b'AMLP'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+ENTRY = struct.Struct('<IQIHHQI')
+REF_SEP = '#'
+
+
+class LevelPackError(ValueError):
+    pass
+
+
+def split_ref(filename):
+    """'levels.pack#3' -> ('levels.pack', 3); plain paths -> (path, None)."""
+    path, sep, level_id = filename.rpartition(REF_SEP)
+    if sep and path.endswith('.pack') and level_id.isdigit():
+        return path, int(level_id)
+    return filename, None
+
+
+def make_ref(path, level_id):
+    return f"{path}{REF_SEP}{level_id}"
+
+
+class LevelPack:
+    """Read-only, memory-mapped view of a pack file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise LevelPackError(f"empty level pack: {path}")
+        size = len(self._mm)
+        if size < HEADER.size:
+            self.close()
+            raise LevelPackError(f"truncated level pack ({size} bytes): {path}")
+        magic, version, _, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise LevelPackError(f"not a level pack (or unsupported version): {path}")
+        if size < HEADER.size + count * ENTRY.size:
+            self.close()
+            raise LevelPackError(f"truncated level pack (index of {count} levels, {size} bytes): {path}")
+        self._index = {}
+        for i in range(count):
+            entry = ENTRY.unpack_from(self._mm, HEADER.size + i * ENTRY.size)
+            level_id, data_off, data_len, _, _, meta_off, meta_len = entry
+            if data_off + data_len > size or meta_off + meta_len > size:
+                self.close()
+                raise LevelPackError(f"truncated level pack (level {level_id} ends past {size} bytes): {path}")
+            self._index[level_id] = entry
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __contains__(self, level_id):
+        return level_id in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def ids(self):
+        return sorted(self._index)
+
+    def info(self, level_id):
+        _, _, _, width, height, meta_off, meta_len = self._entry(level_id)
+        meta = json.loads(self._mm[meta_off:meta_off + meta_len].decode('utf-8')) if meta_len else {}
+        return {'id': level_id, 'width': width, 'height': height, **meta}
+
+    def rows(self, level_id):
+        _, off, length, _, _, _, _ = self._entry(level_id)
+        return self._mm[off:off + length].decode('ascii').split('\n')
+
+    def _entry(self, level_id):
+        try:
+            return self._index[level_id]
+        except KeyError:
+            raise LevelPackError(f"level {level_id} not in {self.path}") from None
+
+
+_open_packs = {}
+
+
+def open_pack(path):
+    """Shared LevelPack for path, reopened if the file was rewritten."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _open_packs.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    if cached:
+        cached[1].close()
+    pack = LevelPack(path)
+    _open_packs[path] = (stamp, pack)
+    return pack
+
+
+def read_rows(filename):
+    """Grid rows for a plain level file or a 'pack#id' reference."""
+    path, level_id = split_ref(filename)
+    if level_id is not None:
+        return open_pack(path).rows(level_id)
+    with open(path, 'r') as f:
+        return [line.rstrip('\n') for line in f.readlines()]
+
+
+def write_pack(path, levels):
+    """Write levels [(level_id, rows, meta)] to path atomically."""
+    levels = sorted(levels, key=lambda item: item[0])
+    ids = [level_id for level_id, _, _ in levels]
+    if len(set(ids)) != len(ids):
+        raise LevelPackError("duplicate level ids")
+    offset = HEADER.size + ENTRY.size * len(levels)
+    entries, blobs = [], []
+    for level_id, rows, meta in levels:
+        data = '\n'.join(rows).encode('ascii')
+        meta_bytes = json.dumps(meta, sort_keys=True).encode('utf-8')
+        width = max((len(r) for r in rows), default=0)
+        entries.append(ENTRY.pack(level_id, offset, len(data), width, len(rows),
+                                  offset + len(data), len(meta_bytes)))
+        blobs += [data, meta_bytes]
+        offset += len(data) + len(meta_bytes)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(levels)))
+        f.writelines(entries)
+        f.writelines(blobs)
+    os.replace(tmp, path)
+
+
+def _level_id_from_name(path):
+    m = re.search(r'level(\d+)', os.path.basename(path))
+    return int(m.group(1)) if m else None
+
+
+def pack_files(out, files):
+    """Pack loose txt/csv levels; ids come from 'levelN' names, later files take the next free id."""
+    levels = []
+    used = set()
+    for path in files:
+        level_id = _level_id_from_name(path)
+        if level_id is None or level_id in used:
+            level_id = max(used, default=0) + 1
+        used.add(level_id)
+        levels.append((level_id, read_rows(path), {'name': os.path.basename(path), 'source': path}))
+    write_pack(out, levels)
+    return levels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect level packs")
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('pack', help="convert loose level files into a pack")
+    p.add_argument('-o', '--output', default=os.path.join('data', 'levels.pack'))
+    p.add_argument('files', nargs='+')
+    p = sub.add_parser('list', help="print a pack's table of contents")
+    p.add_argument('pack')
+    args = parser.parse_args(argv)
+
+    if args.cmd == 'pack':
+        levels = pack_files(args.output, args.files)
+        for level_id, rows, meta in levels:
+            print(f"[pack] {level_id:4d}  {meta['source']}  {max((len(r) for r in rows), default=0)}x{len(rows)}")
+        print(f"[pack] wrote {len(levels)} levels to {args.output}")
+    else:
+        pack = LevelPack(args.pack)
+        for level_id in pack.ids():
+            info = pack.info(level_id)
+            print(f"{level_id:4d}  {info['width']}x{info['height']}  {info.get('name', '')}")
+        pack.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Lookahead AutoPlayer: beam search over short action sequences on a cloned simulation.
+
+    sim = Simulation(level_file, autoplayer=LookaheadPlayer())
+    sim.step(dt)    # AutoPlayer ticks now ask the planner for input
+
+Every `macro_ticks` ticks the live state is captured (snapshot.capture) and
+restored into a private scratch Simulation that shares the live Level. Plans
+are sequences of macro actions, each held for `macro_ticks` ticks; they are
+rolled out there by beam search up to `horizon` ticks ahead, or until
+`budget_ms` runs out (None searches the whole beam, which is slower but
+deterministic), and the first macro of the best plan is played.
+
+Enemies too far away to reach the player within the horizon are dropped from
+the scratch copy, which makes a rollout tick about four times cheaper than a
+live one. A decision at the defaults costs a few hundred rollout ticks.
+"""
+import time
+from player import RUN_SPEED
+from level import TILE_SIZE
+from pickups import PickupIndex
+from sim import Simulation, RUNNING
+from snapshot import capture, restore
+
+# (move_left, move_right, jump, shoot) held for one macro
+MACROS = (
+    (False, True, False, True),   # run right, shooting
+    (False, True, True, True),    # jump right
+    (False, False, False, True),  # stand and shoot
+    (True, False, False, False),  # back off
+    (True, False, True, False),   # jump back
+)
+
+# Plan value: pixels of progress, plus these per point / event
+SCORE_WEIGHT = 0.5
+LIFE_LOST = -5000.0
+COMPLETED_BONUS = 100000.0
+# enemies are assumed no faster than this when pruning the scratch copy (px/s)
+MAX_ENEMY_SPEED = 200
+
+
+class LookaheadPlayer:
+    """Plans with beam search on a scratch copy of the Simulation it is asked to drive."""
+
+    def __init__(self, horizon=60, macro_ticks=12, beam=2, budget_ms=12.0, dt=1 / 60):
+        self.macro_ticks = macro_ticks
+        self.depth = max(1, horizon // macro_ticks)
+        self.beam = beam
+        self.budget = None if budget_ms is None else budget_ms / 1000.0
+        self.dt = dt
+        self.window = horizon * dt * (RUN_SPEED + MAX_ENEMY_SPEED) + 2 * TILE_SIZE
+        self._scratch = None
+        self._plan = []
+        self._left = 0      # ticks left of the current macro
+        self._last_time = None
+        # per-decision stats, for tuning budget_ms
+        self.decisions = 0
+        self.rollout_ticks = 0
+        self.timeouts = 0
+
+    def act(self, sim):
+        """Input for this tick as (move_left, move_right, jump, shoot)."""
+        if self._last_time is None or sim.time < self._last_time:
+            # new episode, or the game was restored to an earlier state
+            self._plan, self._left = [], 0
+        self._last_time = sim.time
+        if self._left <= 0:
+            self._plan = self._search(sim)
+            self._left = self.macro_ticks
+        self._left -= 1
+        return self._plan[0]
+
+    def _sync(self, sim):
+        scratch = self._scratch
+        if scratch is None or scratch.level_file != sim.level_file:
+            scratch = self._scratch = Simulation(sim.level_file, seed=0, screen_width=sim.screen_width,
+                                                 screen_height=sim.screen_height)
+        # the live Level is only read while stepping, so share it (hot reloads included);
+        # an endless one is streamed by the live game alone
+        scratch.level = sim.level
+        scratch.streaming = False
+        scratch.coins = [dict(coin) for coin in sim.coins]
+        scratch.pickups = PickupIndex(scratch.coins)
+        restore(scratch, capture(sim))
+        x = scratch.player.rect.centerx
+        scratch.enemies[:] = [e for e in scratch.enemies if abs(e.rect.centerx - x) < self.window]
+        return scratch
+
+    def _run(self, scratch, macro, lives):
+        """Hold macro for one macro's ticks; False once the branch has lost a life or ended."""
+        for _ in range(self.macro_ticks):
+            scratch.control(*macro)
+            if scratch.update(self.dt) is not RUNNING or scratch.lives < lives:
+                return False
+        self.rollout_ticks += self.macro_ticks
+        # below the screen means falling into a pit, before the rules notice
+        return scratch.player.rect.top <= scratch.screen_height
+
+    def _value(self, scratch, root, alive):
+        x, score, lives = root
+        value = scratch.player.rect.centerx - x + SCORE_WEIGHT * (scratch.score - score)
+        if not alive:
+            value += LIFE_LOST * max(1, lives - scratch.lives)
+        if scratch.level_completed:
+            value += COMPLETED_BONUS
+        return value
+
+    def _search(self, sim):
+        deadline = float('inf') if self.budget is None else time.perf_counter() + self.budget
+        self.decisions += 1
+        scratch = self._sync(sim)
+        root = (scratch.player.rect.centerx, scratch.score, scratch.lives)
+        root_snap = capture(scratch)
+
+        # the rest of the previous plan is the baseline, so a tight budget keeps a steady course
+        best_value, best = None, None
+        if len(self._plan) > 1:
+            carry = self._plan[1:] + self._plan[-1:]
+            alive = True
+            for macro in carry:
+                alive = self._run(scratch, macro, root[2])
+                if not alive:
+                    break
+            best_value, best = self._value(scratch, root, alive), carry
+
+        nodes = [(root_snap, [])]
+        for depth in range(self.depth):
+            last = depth == self.depth - 1
+            children = []
+            for snap, seq in nodes:
+                for macro in MACROS:
+                    if time.perf_counter() > deadline and best is not None:
+                        self.timeouts += 1
+                        return best
+                    restore(scratch, snap)
+                    alive = self._run(scratch, macro, root[2])
+                    value = self._value(scratch, root, alive)
+                    plan = seq + [macro]
+                    if best_value is None or value > best_value:
+                        best_value, best = value, plan
+                    if alive and not last:
+                        children.append((value, capture(scratch), plan))
+            children.sort(key=lambda child: -child[0])
+            nodes = [(snap, plan) for _, snap, plan in children[:self.beam]]
+            if not nodes:
+                break
+        return best
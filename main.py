@@ -4,13 +4,32 @@ import os
 import traceback
 import random
 import math
-from player import Player
-from enemy import Patroller, Chaser
-from bullet import Bullet
-from level import Level, TILE_SIZE
+import time
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from level import TILE_SIZE
 from hud import HUD
-from ai import AdaptiveAI, AutoPlayer
-from utils import load_highscore, save_highscore, play_sound, clamp
+from ai import AdaptiveAI
+from sim import Simulation, RUNNING, DEAD, COMPLETED
+from snapshot import capture, restore, snapshot_level, RewindBuffer, SnapshotError
+from lookahead import LookaheadPlayer
+from framesched import FrameScheduler
+from renderstate import RenderState, SpriteRecorder, StateBuffer, replay
+from hotreload import LevelWatcher
+from levelpack import open_pack, make_ref, split_ref
+from telemetry import Telemetry, TelemetrySink
+from recorder import TrajectoryRecorder
+from framecap import FrameCapture
+from sharedstate import StatePublisher, DEFAULT_NAME as STATE_SEGMENT
+from endless import endless_ref, is_endless
+from allocprof import AllocTracker
+from tilelayer import TileLayer
+from render import Canvas, parse_resolution, circle_sprite, LAYER_CLOUDS, LAYER_BIRDS, LAYER_COINS
+from runstore import RunStore
+from sampleprof import SamplingProfiler, DEFAULT_HZ as PROFILE_HZ
+from utils import play_sound, clamp, get_font
 BACKGROUND_IMG = None
 
 
@@ -21,35 +40,105 @@ DATA_DIR = 'data'
 ASSETS_DIR = 'assets'
 SOUND_DIR = os.path.join(ASSETS_DIR, 'sounds')
 
-# Init pygame
-# Be explicit about audio init to avoid rare freezes when no device/driver
-is_audio_enabled = True
-try:
-    # Prefer a stable Windows driver; fallback is handled below
-    if sys.platform.startswith('win') and 'SDL_AUDIODRIVER' not in os.environ:
-        os.environ['SDL_AUDIODRIVER'] = 'directsound'
-    pygame.mixer.pre_init(44100, -16, 2, 512)
-except Exception:
-    is_audio_enabled = False
-
-pygame.init()
-try:
-    if is_audio_enabled and not pygame.mixer.get_init():
-        pygame.mixer.init()
-except Exception:
-    is_audio_enabled = False
-
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("AI Mario – Smart Platform Adventure")
-clock = pygame.time.Clock()
-
-# Load background image after display init; fall back to gradient if missing
-try:
-    BACKGROUND_IMG = pygame.image.load(os.path.join("assets", "tiles", "sky.png")).convert()
-    # scale to fit window to avoid partial fills
-    BACKGROUND_IMG = pygame.transform.smoothscale(BACKGROUND_IMG, (SCREEN_WIDTH, SCREEN_HEIGHT))
-except Exception:
-    BACKGROUND_IMG = None
+# Subsystems are created on first use (init_display/init_audio/load_assets/init_ai)
+# so that importing this module does no I/O. --headless skips the window and audio.
+headless = False
+screen = None
+# Everything in the game loop draws through `canvas` in window coordinates;
+# below 1.0 it renders offscreen at that fraction of the window size and is
+# upscaled once per frame (--render-res=640x360 or 0.5; F2 toggles at runtime)
+canvas = None
+render_scale = 1.0
+# ring-buffer cache of the level tiles, rebuilt when the level changes
+tile_layer = None
+clock = None
+is_audio_enabled = False
+_audio_initialized = False
+_assets_loaded = False
+sound_coin = None
+sound_jump = None
+sound_shoot = None
+
+# Startup timing: phase name -> seconds, reported once when the first frame is shown
+startup_phases = {}
+_startup_t0 = time.perf_counter()
+_startup_reported = False
+
+@contextmanager
+def _phase(name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_phases[name] = startup_phases.get(name, 0.0) + (time.perf_counter() - t0)
+
+def report_startup():
+    """Log time-to-first-frame broken down by phase (only the first call logs)."""
+    global _startup_reported
+    if _startup_reported:
+        return
+    _startup_reported = True
+    total = time.perf_counter() - _startup_t0
+    parts = ' '.join(f"{name}={secs * 1000:.1f}ms" for name, secs in startup_phases.items())
+    other = max(0.0, total - sum(startup_phases.values()))
+    _log(f"[startup] {parts} other={other * 1000:.1f}ms first_frame={total * 1000:.1f}ms")
+
+def init_display():
+    """Open the window on first use (a dummy SDL video driver when headless)."""
+    global screen, clock, canvas
+    if screen is not None:
+        return screen
+    with _phase('display'):
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("AI Mario – Smart Platform Adventure")
+        clock = pygame.time.Clock()
+        canvas = Canvas(screen, render_scale)
+    return screen
+
+def init_audio():
+    """Open the mixer and load sound effects on first use; never in headless mode."""
+    global is_audio_enabled, _audio_initialized, sound_coin, sound_jump, sound_shoot
+    if _audio_initialized:
+        return is_audio_enabled
+    _audio_initialized = True
+    if headless:
+        is_audio_enabled = False
+        return False
+    with _phase('audio'):
+        # Be explicit about audio init to avoid rare freezes when no device/driver
+        is_audio_enabled = True
+        try:
+            # Prefer a stable Windows driver; fallback is handled below
+            if sys.platform.startswith('win') and 'SDL_AUDIODRIVER' not in os.environ:
+                os.environ['SDL_AUDIODRIVER'] = 'directsound'
+            pygame.mixer.pre_init(44100, -16, 2, 512)
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except Exception:
+            is_audio_enabled = False
+        sound_coin = safe_play_sound(os.path.join(SOUND_DIR, 'coin.wav'))
+        sound_jump = safe_play_sound(os.path.join(SOUND_DIR, 'jump.wav'))
+        sound_shoot = safe_play_sound(os.path.join(SOUND_DIR, 'shoot.wav'))
+        apply_volume()
+    return is_audio_enabled
+
+def load_assets():
+    """Load the background image once the display exists; fall back to gradient if missing."""
+    global BACKGROUND_IMG, _assets_loaded
+    if _assets_loaded:
+        return
+    init_display()
+    _assets_loaded = True
+    with _phase('assets'):
+        try:
+            BACKGROUND_IMG = pygame.image.load(os.path.join("assets", "tiles", "sky.png")).convert()
+            # scale to fit window to avoid partial fills
+            BACKGROUND_IMG = pygame.transform.smoothscale(BACKGROUND_IMG, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        except Exception:
+            BACKGROUND_IMG = None
 
 # Utility: safe play_sound wrapper (play_sound may already be resilient)
 def safe_play_sound(path):
@@ -62,10 +151,6 @@ def safe_play_sound(path):
         print(f"[warn] sound missing or failed to load: {path}")
         return None
 
-sound_coin = safe_play_sound(os.path.join(SOUND_DIR, 'coin.wav'))
-sound_jump = safe_play_sound(os.path.join(SOUND_DIR, 'jump.wav'))
-sound_shoot = safe_play_sound(os.path.join(SOUND_DIR, 'shoot.wav'))
-
 # Global sound state and helpers
 is_muted = False
 _BASE_MUSIC_VOL = 0.6
@@ -94,23 +179,23 @@ def toggle_mute():
 def get_sound_button_rect():
     return pygame.Rect(SCREEN_WIDTH - 56, 10, 46, 36)
 
-def draw_sound_button(surface):
+def draw_sound_button(canvas):
     # Simple speaker icon in top-right
     rect = get_sound_button_rect()
     bx, by, bw, bh = rect.x, rect.y, rect.width, rect.height
-    pygame.draw.rect(surface, (0, 0, 0), rect, 2)
+    canvas.rect((0, 0, 0), rect, 2)
     # speaker
     sx = bx + 10
     sy = by + bh // 2
-    pygame.draw.polygon(surface, (240, 240, 240), [(sx, sy-8), (sx+10, sy-8), (sx+18, sy-14), (sx+18, sy+14), (sx+10, sy+8), (sx, sy+8)])
+    canvas.polygon((240, 240, 240), [(sx, sy-8), (sx+10, sy-8), (sx+18, sy-14), (sx+18, sy+14), (sx+10, sy+8), (sx, sy+8)])
     if is_muted:
         # draw X
-        pygame.draw.line(surface, (220, 60, 60), (bx+28, by+8), (bx+bw-6, by+bh-8), 3)
-        pygame.draw.line(surface, (220, 60, 60), (bx+bw-6, by+8), (bx+28, by+bh-8), 3)
+        canvas.line((220, 60, 60), (bx+28, by+8), (bx+bw-6, by+bh-8), 3)
+        canvas.line((220, 60, 60), (bx+bw-6, by+8), (bx+28, by+bh-8), 3)
     else:
         # sound waves
-        pygame.draw.arc(surface, (240,240,240), (bx+24, by+6, 16, 12), 0.2, 3.0, 2)
-        pygame.draw.arc(surface, (240,240,240), (bx+26, by+2, 22, 20), 0.2, 3.0, 2)
+        canvas.arc((240,240,240), (bx+24, by+6, 16, 12), 0.2, 3.0, 2)
+        canvas.arc((240,240,240), (bx+26, by+2, 22, 20), 0.2, 3.0, 2)
     return rect
 
 WHITE = (255, 255, 255)
@@ -134,42 +219,66 @@ def update_parallax(dt):
             b['speed'] = random.uniform(60, 120)
             b['flap'] = random.uniform(0, 6.28)
 
-def draw_parallax(surface):
-    # clouds
+def _cloud_sprite(sx, sy):
+    # three puffy ellipses; the top one pokes sy//3 above the cloud's y
+    surf = pygame.Surface((sx + sx//2, sy + sy//3), pygame.SRCALPHA)
+    top = sy//3
+    pygame.draw.ellipse(surf, (255, 255, 255), (0, top, sx, sy))
+    pygame.draw.ellipse(surf, (255, 255, 255), (sx//3, 0, sx, sy))
+    pygame.draw.ellipse(surf, (255, 255, 255), (sx//2, top, sx, sy))
+    return surf
+
+BIRD_ORIGIN = (12, 8)
+
+def _bird_sprite(wing_dy):
+    # body centred at BIRD_ORIGIN, wing tips wing_dy below it
+    surf = pygame.Surface((26, 17), pygame.SRCALPHA)
+    x, y = BIRD_ORIGIN
+    wing, body = 8, 10
+    color = (50, 50, 50)
+    pygame.draw.circle(surf, color, (x, y), body//2)
+    pygame.draw.polygon(surf, (220, 160, 40), [(x+6, y), (x+12, y-2), (x+12, y+2)])
+    pygame.draw.line(surf, color, (x-2, y), (x-2-wing, y + wing_dy), 3)
+    pygame.draw.line(surf, color, (x+2, y), (x+2+wing, y + wing_dy), 3)
+    return surf
+
+def draw_clouds(canvas):
     for c in clouds:
         sx, sy = int(60 * c['scale']), int(30 * c['scale'])
-        x, y = int(c['x']), int(c['y'])
-        pygame.draw.ellipse(surface, (255, 255, 255), (x, y, sx, sy))
-        pygame.draw.ellipse(surface, (255, 255, 255), (x + sx//3, y - sy//3, sx, sy))
-        pygame.draw.ellipse(surface, (255, 255, 255), (x + sx//2, y, sx, sy))
-    # birds
+        sprite = canvas.sprite(('cloud', sx, sy), _cloud_sprite, sx, sy)
+        canvas.submit(LAYER_CLOUDS, sprite, (int(c['x']), int(c['y']) - sy//3))
+
+def draw_birds(canvas):
+    ox, oy = BIRD_ORIGIN
     for b in birds:
         x = int(b['x'])
         y = int(b['y'] + math.sin(b['flap']) * 6)
-        wing, body = 8, 10
-        color = (50, 50, 50)
-        pygame.draw.circle(surface, color, (x, y), body//2)
-        pygame.draw.polygon(surface, (220, 160, 40), [(x+6, y), (x+12, y-2), (x+12, y+2)])
-        wy = int(y + math.sin(b['flap']*2.0) * 6)
-        pygame.draw.line(surface, color, (x-2, y), (x-2-wing, wy), 3)
-        pygame.draw.line(surface, color, (x+2, y), (x+2+wing, wy), 3)
-
-def draw_castle_and_flag(surface, cam_x):
-    cx = end_scene['castle_x'] - cam_x
+        # wing position is quantized to whole pixels, so 13 sprites cover the flap cycle
+        wing_dy = int(y + math.sin(b['flap']*2.0) * 6) - y
+        sprite = canvas.sprite(('bird', wing_dy), _bird_sprite, wing_dy)
+        canvas.submit(LAYER_BIRDS, sprite, (x - ox, y - oy))
+
+def castle_state():
+    return (end_scene['castle_x'], end_scene['pole_top_y'], end_scene['pole_base_y'], end_scene['flag_y'])
+
+def draw_castle_and_flag(canvas, cam_x, castle, decorations=True):
+    # castle is castle_state() of the frame being drawn
+    castle_x, pole_top_y, pole_base_y, fy = castle
+    cx = castle_x - cam_x
     ground_y = SCREEN_HEIGHT - TILE_SIZE
-    pygame.draw.rect(surface, (170, 100, 70), (cx, ground_y - 120, 150, 120))
-    pygame.draw.rect(surface, (120, 70, 50), (cx, ground_y - 120, 150, 120), 3)
-    for i in range(5):
-        pygame.draw.rect(surface, (170, 100, 70), (cx + 10 + i*28, ground_y - 140, 18, 20))
-    pygame.draw.rect(surface, (60, 40, 30), (cx + 60, ground_y - 50, 30, 50))
+    canvas.rect((170, 100, 70), (cx, ground_y - 120, 150, 120))
+    canvas.rect((120, 70, 50), (cx, ground_y - 120, 150, 120), 3)
+    if decorations:
+        for i in range(5):
+            canvas.rect((170, 100, 70), (cx + 10 + i*28, ground_y - 140, 18, 20))
+        canvas.rect((60, 40, 30), (cx + 60, ground_y - 50, 30, 50))
     pole_x = cx + 160
-    pygame.draw.rect(surface, (220, 220, 220), (pole_x, end_scene['pole_top_y'], 6, end_scene['pole_base_y'] - end_scene['pole_top_y']))
+    canvas.rect((220, 220, 220), (pole_x, pole_top_y, 6, pole_base_y - pole_top_y))
     flag_w, flag_h = 60, 36
-    fy = end_scene['flag_y']
-    pygame.draw.rect(surface, (230, 30, 30), (pole_x + 6, fy, flag_w, flag_h))
-    pygame.draw.rect(surface, (255, 255, 255), (pole_x + 6, fy, flag_w, flag_h), 2)
-    small = pygame.font.Font(None, 28)
-    surface.blit(small.render("vipul", True, (255, 255, 255)), (pole_x + 10, fy + flag_h//2 - small.get_height()//2))
+    canvas.rect((230, 30, 30), (pole_x + 6, fy, flag_w, flag_h))
+    canvas.rect((255, 255, 255), (pole_x + 6, fy, flag_w, flag_h), 2)
+    if decorations:
+        canvas.text("vipul", 28, (255, 255, 255), (pole_x + 10, fy + flag_h//2), anchor='midleft')
     return pole_x, flag_w, flag_h
 
 def process_end_scene(dt):
@@ -197,26 +306,81 @@ def process_end_scene(dt):
             end_scene['phase'] = 'done'
 
 current_level = 1
-level_file = os.path.join(DATA_DIR, f'level{current_level}.csv')
-highscore_file = os.path.join(DATA_DIR, 'highscore.json')
+# resolved by level_source() on first reset_game; --endless[=SEED] sets an
+# endless:SEED reference instead, a streamed procedural level (see endless.py)
+level_file = None
+LEVEL_PACK = os.path.join(DATA_DIR, 'levels.pack')
+highscore_file = os.path.join(DATA_DIR, 'highscore.json')  # before run history; imported once
+runs_file = os.path.join(DATA_DIR, 'runs.sqlite3')
 ai_state_file = os.path.join(DATA_DIR, 'ai_state.json')
 
 # high-level states
 menu_state = 'start'
 game_running = False
 show_autoplayer = False
+# 'heuristic' (ai.AutoPlayer) or 'lookahead' (lookahead.LookaheadPlayer); --autoplayer=NAME
+autoplayer_mode = 'heuristic'
 autotest_enabled = False
-autotest_deadline_ms = 0
-
-# create adaptive AI (guard against bad json)
-try:
-    adaptive_ai = AdaptiveAI(ai_state_file)
-except Exception:
-    print("[warn] AdaptiveAI construction failed, creating default AI state.")
-    try:
-        adaptive_ai = AdaptiveAI(None)
-    except Exception:
-        adaptive_ai = None
+autotest_deadline = None
+# --hot-reload: patch edits to the level file into the running game
+hot_reload_enabled = False
+level_watcher = None
+# --telemetry[=PATH]: per-second and per-episode JSONL performance records
+telemetry = None
+# Per-tick snapshots for Backspace rewind (--no-rewind disables; off in autotest and
+# headless runs, where a snapshot per tick costs more than the tick, unless --rewind); F5/F9 quick save/load
+rewind_enabled = True
+rewind_buffer = None
+REWIND_SECONDS = 30.0
+REWIND_SPEED = 2  # ticks stepped back per frame while Backspace is held
+QUICKSAVE_FILE = os.path.join(DATA_DIR, 'snapshots', 'quick.snap')
+resume_file = None  # --resume=PATH: restore this snapshot on the first reset_game
+# --alloc-track[=N]: tracemalloc report (per-frame peak, per-line retained growth) every N frames (slow)
+alloc_tracker = None
+ALLOC_REPORT_FRAMES = 600
+# windowed play steps the simulation at a fixed 1/FPS and skips up to this many
+# renders in a row to keep up (--max-frame-skip=N); see framesched.py
+MAX_FRAME_SKIP = 4
+frame_scheduler = None
+# --threads: simulation and rendering on separate threads (see renderstate.py)
+threaded = False
+# --record[=DIR]: per-tick trajectory dataset (see recorder.py)
+recorder = None
+# --capture[=DIR]: PNG frames of the game (see framecap.py); --capture-last=N
+# keeps only the last N (as PNGs) in memory until a death or crash, --capture-every=N
+# thins them (recommended headless, where unpaced frames outrun the encoders)
+frame_capture = None
+# --publish[=NAME]: live state in shared memory for other processes (see sharedstate.py)
+state_publisher = None
+# --profile[=HZ] samples the game from launch and F7 starts/stops it (see sampleprof.py);
+# loop_phase roots the main thread's stacks: events, sim, render or wait
+profiler = None
+profile_hz = PROFILE_HZ
+loop_phase = 'menu'
+
+# history of finished games, opened by init_runs() on first use (see runstore.py)
+run_store = None
+
+# adaptive AI is created by init_ai() on first use (reads ai_state_file)
+adaptive_ai = None
+_ai_initialized = False
+
+def init_ai():
+    global adaptive_ai, _ai_initialized
+    if _ai_initialized:
+        return adaptive_ai
+    _ai_initialized = True
+    with _phase('ai_state'):
+        # guard against bad json
+        try:
+            adaptive_ai = AdaptiveAI(ai_state_file)
+        except Exception:
+            print("[warn] AdaptiveAI construction failed, creating default AI state.")
+            try:
+                adaptive_ai = AdaptiveAI(None)
+            except Exception:
+                adaptive_ai = None
+    return adaptive_ai
 
 ai_save_timer = 0.0
 
@@ -229,6 +393,7 @@ def _log(msg):
         pass
 
 # game globals (initialized in reset_game)
+sim = None
 player = None
 level = None
 bullets = []
@@ -256,27 +421,42 @@ end_scene = {
     'wave_timer': 0.0,
 }
 
+def level_source(n):
+    """Level file reference for level n: an entry of data/levels.pack if there is
+    one (see levelpack.py), otherwise data/level{n}.csv. None if level n doesn't exist."""
+    if os.path.exists(LEVEL_PACK):
+        try:
+            if n in open_pack(LEVEL_PACK):
+                return make_ref(LEVEL_PACK, n)
+        except (OSError, ValueError):
+            _log(f"[warn] unreadable level pack {LEVEL_PACK}; using loose level files")
+    candidate = os.path.join(DATA_DIR, f'level{n}.csv')
+    return candidate if os.path.exists(candidate) else None
+
 def advance_level(loop_to_1=True):
     global current_level, level_file
     next_level = current_level + 1
-    candidate = os.path.join(DATA_DIR, f'level{next_level}.csv')
-    if os.path.exists(candidate):
+    candidate = level_source(next_level)
+    if candidate:
         current_level = next_level
         level_file = candidate
     else:
         if loop_to_1:
             current_level = 1
-            level_file = os.path.join(DATA_DIR, 'level1.csv')
+            level_file = level_source(1) or os.path.join(DATA_DIR, 'level1.csv')
         else:
             # fallback keeps current level
-            level_file = os.path.join(DATA_DIR, f'level{current_level}.csv')
+            level_file = level_source(current_level) or os.path.join(DATA_DIR, f'level{current_level}.csv')
 
 def reset_game():
-    global player, level, bullets, enemies, score, lives, game_camera, hud, coins, level_file, clouds, birds, level_completed, level_complete_timer, movers, spikes, end_scene
+    global sim, level_watcher, player, level, bullets, enemies, score, lives, game_camera, hud, coins, level_file, clouds, birds, level_completed, level_complete_timer, movers, spikes, end_scene, rewind_buffer, resume_file
+
+    init_ai()
+    init_audio()
 
     # start background music for the level (replace existing music if any)
     try:
-        if pygame.mixer.get_init():
+        if is_audio_enabled and pygame.mixer.get_init():
             try:
                 pygame.mixer.music.stop()
             except Exception:
@@ -289,34 +469,37 @@ def reset_game():
 
     _log('[reset] start')
 
+    if level_file is None:
+        level_file = level_source(current_level) or os.path.join(DATA_DIR, f'level{current_level}.csv')
+
     # ✅ ensure valid level_file before using it
-    if not os.path.exists(level_file):
+    if not is_endless(level_file) and not os.path.exists(split_ref(level_file)[0]):
         alt_file = os.path.join("levels", "level1.txt")
         if os.path.exists(alt_file):
             level_file = alt_file
         else:
             raise FileNotFoundError(f"Level file missing: {level_file}")
 
-    # load level safely
-    level = Level(level_file)
-
-    # Fallback: synthesize a ground if no platforms
-    if not getattr(level, 'platforms', []):
-        tiles = max(30, SCREEN_WIDTH // TILE_SIZE)
-        y = SCREEN_HEIGHT - TILE_SIZE
-        level.platforms = [pygame.Rect(x * TILE_SIZE, y, TILE_SIZE, TILE_SIZE) for x in range(tiles)]
-        level.width = tiles
-        level.height = max(1, getattr(level, 'height', 0))
-
-    # create player
-    player = Player(level.player_spawn, SCREEN_HEIGHT)
-    bullets = []
-    enemies = []
-    coins = []
+    # load level and spawn entities; gameplay rules live in Simulation
+    load_t0 = time.perf_counter()
+    with _phase('level'):
+        sim = Simulation(level_file, current_level, adaptive_ai,
+                         screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT,
+                         autoplayer=LookaheadPlayer(dt=1.0 / FPS) if autoplayer_mode == 'lookahead' else None)
+    if telemetry:
+        telemetry.start_episode((time.perf_counter() - load_t0) * 1000.0)
+    sim.sound_jump, sim.sound_shoot, sim.sound_coin = sound_jump, sound_shoot, sound_coin
+    level_watcher = LevelWatcher(level_file) if hot_reload_enabled else None
+    level = sim.level
+    player = sim.player
+    bullets = sim.bullets
+    enemies = sim.enemies
+    coins = sim.coins
     score = 0
     lives = 3
     game_camera = {'x': 0}
-    hud = HUD(SCREEN_WIDTH)
+    with _phase('fonts'):
+        hud = HUD(SCREEN_WIDTH)
     level_completed = False
     level_complete_timer = 0.0
 
@@ -342,8 +525,7 @@ def reset_game():
     spikes = []
 
     # Configure end-of-level castle/flag position near far right of the level
-    castle_margin = 220
-    end_scene['castle_x'] = max(60, level.width * TILE_SIZE - castle_margin)
+    end_scene['castle_x'] = sim.castle_x
     ground_y = SCREEN_HEIGHT - TILE_SIZE
     pole_h = 160
     end_scene['pole_base_y'] = ground_y
@@ -355,59 +537,122 @@ def reset_game():
     end_scene['wave_phase'] = 0.0
     end_scene['wave_timer'] = 0.0
 
-    # enemies (support both typed (etype, pos) and legacy (x,y) formats)
-    for spawn in getattr(level, 'enemy_spawns', []):
-        try:
-            if isinstance(spawn, tuple) and len(spawn) == 2 and isinstance(spawn[0], str):
-                etype, pos = spawn
-            else:
-                etype, pos = 'P', spawn
-            speed_scale = 1.0 + 0.15 * (current_level - 1)
-            # Force all enemies to be Patrollers (no chasing)
-            params = (adaptive_ai.get_params() if adaptive_ai else {}).copy()
-            params['speed'] = int(60 * speed_scale)
-            enemies.append(Patroller(pos, params))
-        except Exception:
-            _log(f"[warn] failed to spawn enemy {spawn}")
-
-    # Extra enemies to make it livelier: sample platforms to place patrollers (scaled by difficulty)
-    try:
-        plats = [p[0] if isinstance(p, tuple) else p for p in getattr(level, 'platforms', [])]
-        plats = [r for r in plats if isinstance(r, pygame.Rect)]
-        random.shuffle(plats)
-        extra = min(12, max(4, len(plats)//15 + (current_level - 1)))
-        for i in range(extra):
-            rect = plats[i % len(plats)]
-            x = rect.x + 8
-            y = rect.top - 44
-            speed_scale = 1.0 + 0.15 * (current_level - 1)
-            params = (adaptive_ai.get_params() if adaptive_ai else {}).copy()
-            params['speed'] = int(60 * speed_scale)
-            enemies.append(Patroller((x, y), params))
-    except Exception:
-        _log('[warn] failed to add extra enemies')
-
-    # coins (safe fallback)
-    for pos in getattr(level, 'coin_spawns', []):
-        coins.append({'pos': pos, 'rect': pygame.Rect(pos[0], pos[1], TILE_SIZE, TILE_SIZE), 'taken': False})
-
     # ✅ use len(getattr(...)) so it won’t crash if missing
     _log(f"[reset] done platforms={len(getattr(level, 'platforms', []))} "
          f"enemies={len(getattr(level, 'enemy_spawns', []))} "
          f"coins={len(getattr(level, 'coin_spawns', []))} "
          f"spawn={getattr(level, 'player_spawn', (0,0))}")
 
-def save_score(new_score):
-    highscore = load_highscore(highscore_file)
-    if new_score > highscore:
-        save_highscore(highscore_file, new_score)
+    rewind_buffer = RewindBuffer(REWIND_SECONDS, FPS) if rewind_enabled else None
+    if resume_file:
+        path, resume_file = resume_file, None
+        load_snapshot(path)
+
+END_PHASES = ('idle', 'approach', 'wave', 'raise', 'done')
+
+def snapshot_game():
+    """Snapshot of the running game: Simulation plus camera, end scene and decorations."""
+    extras = [game_camera['x'], level_complete_timer, float(level_completed), ai_save_timer,
+              end_scene['castle_x'], end_scene['pole_base_y'], end_scene['pole_top_y'],
+              end_scene['flag_y'], float(end_scene['raising']), END_PHASES.index(end_scene['phase']),
+              end_scene['target_x'], end_scene['wave_phase'], end_scene['wave_timer'],
+              len(clouds), len(birds)]
+    for c in clouds:
+        extras += (c['x'], c['y'], c['scale'], c['speed'])
+    for b in birds:
+        extras += (b['x'], b['y'], b['speed'], b['flap'])
+    # the global random module drives cloud/bird respawns
+    return capture(sim, extras, rngs=(random,))
+
+def restore_game(data):
+    global level_file, current_level, level_completed, level_complete_timer, ai_save_timer, score, lives, clouds, birds
+    ref, number = snapshot_level(data)
+    if sim is None or ref != sim.level_file:
+        level_file, current_level = ref, number
+        reset_game()
+    extras = restore(sim, data, rngs=(random,))
+    (game_camera['x'], level_complete_timer, completed, ai_save_timer,
+     end_scene['castle_x'], end_scene['pole_base_y'], end_scene['pole_top_y'],
+     end_scene['flag_y'], raising, phase, end_scene['target_x'], end_scene['wave_phase'],
+     end_scene['wave_timer'], n_clouds, n_birds) = extras[:15]
+    level_completed = bool(completed)
+    end_scene['raising'] = bool(raising)
+    end_scene['phase'] = END_PHASES[int(phase)]
+    for key in ('castle_x', 'pole_base_y', 'pole_top_y', 'flag_y', 'target_x'):
+        end_scene[key] = int(end_scene[key])
+    game_camera['x'] = int(game_camera['x'])
+    i = 15
+    clouds = []
+    for _ in range(int(n_clouds)):
+        x, y, scale, speed = extras[i:i + 4]
+        clouds.append({'x': x, 'y': int(y), 'scale': scale, 'speed': speed})
+        i += 4
+    birds = []
+    for _ in range(int(n_birds)):
+        x, y, speed, flap = extras[i:i + 4]
+        birds.append({'x': x, 'y': int(y), 'speed': speed, 'flap': flap})
+        i += 4
+    score, lives = sim.score, sim.lives
+
+def save_snapshot(path):
+    if sim.streaming:
+        _log("[snapshot] not available in endless mode")
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(snapshot_game())
+    os.replace(tmp, path)
+    _log(f"[snapshot] saved {path}")
+
+def load_snapshot(path):
+    if sim is not None and sim.streaming:
+        _log("[snapshot] not available in endless mode")
+        return False
+    try:
+        with open(path, 'rb') as f:
+            restore_game(f.read())
+    except (OSError, SnapshotError) as e:
+        _log(f"[snapshot] could not load {path}: {e}")
+        return False
+    if rewind_buffer is not None:
+        rewind_buffer.clear()
+    _log(f"[snapshot] loaded {path}")
+    return True
+
+def init_runs():
+    global run_store
+    if run_store is None:
+        try:
+            run_store = RunStore(runs_file, legacy_highscore=highscore_file)
+            atexit.register(run_store.close)
+        except Exception as e:
+            _log(f"[warn] run history unavailable: {e}")
+            run_store = False
+    return run_store
+
+def end_episode(outcome):
+    if telemetry and sim:
+        telemetry.end_episode(outcome, sim, adaptive_ai, current_level)
+    if frame_scheduler:
+        _log(frame_scheduler.report())
+    if sim and init_runs():
+        if outcome in ('dead', 'completed', 'timeout') and sim.score > run_store.highscore():
+            _log(f"[runs] new highscore {sim.score}")
+        run_store.record(outcome, sim.score, level=current_level, level_ref=sim.level_file,
+                         duration=round(sim.time, 3), deaths=sim.deaths,
+                         autoplayer=autoplayer_mode if show_autoplayer else 'off',
+                         ai=adaptive_ai.get_params() if adaptive_ai else None)
 
 def handle_menu():
     global menu_state, game_running
-    title_font = pygame.font.Font(None, 56)
-    font = pygame.font.Font(None, 40)
+    init_display()
+    title_font = get_font(56)
+    font = get_font(40)
     title_surf = title_font.render("AI Mario – Smart Platform Adventure", True, WHITE)
-    hint_font = pygame.font.Font(None, 20)
+    hint_font = get_font(20)
 
     btn_w, btn_h = 260, 64
     start_rect = pygame.Rect((SCREEN_WIDTH - btn_w) // 2, 220, btn_w, btn_h)
@@ -467,26 +712,277 @@ def handle_menu():
         screen.blit(hint, ((SCREEN_WIDTH - hint.get_width()) // 2, quit_rect.bottom + 12))
 
         pygame.display.flip()
+        report_startup()
         clock.tick(FPS)
 
 def draw_camera_bg():
+    # one line per canvas row, so a reduced render resolution draws fewer
     top = (140, 200, 255)
     bottom = (90, 150, 210)
-    steps = SCREEN_HEIGHT
+    surface = canvas.surface
+    width, steps = surface.get_size()
     for y in range(steps):
         t = y / max(1, steps - 1)
         r = int(top[0] * (1 - t) + bottom[0] * t)
         g = int(top[1] * (1 - t) + bottom[1] * t)
         b = int(top[2] * (1 - t) + bottom[2] * t)
-        pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
+
+def draw_level(lvl, cam_x):
+    global tile_layer
+    if tile_layer is None or tile_layer.level is not lvl or tile_layer.canvas is not canvas:
+        if tile_layer:
+            tile_layer.close()
+        tile_layer = TileLayer(lvl, canvas)
+    tile_layer.draw(cam_x)
+    lvl.draw_markers(canvas, cam_x)
+
+def start_profiler():
+    global profiler
+    profiler = SamplingProfiler(os.path.join(DATA_DIR, 'profiles', time.strftime('profile-%Y%m%d-%H%M%S.folded')),
+                                profile_hz, phase=lambda: loop_phase)
+    for thread in threading.enumerate():
+        if thread.name == 'sim':
+            profiler.watch(thread)
+    profiler.start()
+    _log(f"[profile] sampling at {profile_hz} Hz")
+
+def stop_profiler():
+    global profiler
+    if profiler and profiler.running:
+        profiler.stop()
+        _log(profiler.report())
+    profiler = None
+
+def toggle_profiler():
+    # F7
+    if profiler and profiler.running:
+        stop_profiler()
+    else:
+        start_profiler()
+
+def toggle_render_scale():
+    # F2: switch between full resolution and the configured internal resolution
+    low = render_scale if render_scale < 1.0 else 0.5
+    canvas.set_scale(1.0 if canvas.scale < 1.0 else low)
+    w, h = canvas.size
+    _log(f"[render] internal resolution {w}x{h}")
 
 def update_camera():
-    cam_x = clamp(player.rect.centerx - SCREEN_WIDTH // 2, 0, level.width * TILE_SIZE - SCREEN_WIDTH)
+    cam_x = clamp(player.rect.centerx - SCREEN_WIDTH // 2, level.first_column * TILE_SIZE,
+                  level.width * TILE_SIZE - SCREEN_WIDTH)
     game_camera['x'] = cam_x
 
+paused = False
+game_tick = 0  # simulation ticks stepped by step_game()
+
+def handle_game_key(key):
+    """Keys that act on the game state (both loops; the simulation thread with --threads).
+
+    Returns False once the game is over.
+    """
+    global show_autoplayer, paused
+    if key == pygame.K_ESCAPE:
+        end_episode('quit')
+        return False
+    if key == pygame.K_F1:
+        show_autoplayer = not show_autoplayer
+    if key == pygame.K_p:
+        paused = not paused
+    if key == pygame.K_F5:
+        save_snapshot(QUICKSAVE_FILE)
+    if key == pygame.K_F9:
+        load_snapshot(QUICKSAVE_FILE)
+    if key == pygame.K_r:
+        # restart current level
+        end_episode('restart')
+        try:
+            reset_game()
+        except Exception:
+            _log('[error] reset_game failed on restart:')
+            traceback.print_exc()
+            return False
+    return True
+
+def step_game(dt, keys):
+    """Advance the game by one tick with the held keys; returns False once the game is over."""
+    global score, lives, ai_save_timer, level_completed, level_complete_timer, game_tick
+    game_tick += 1
+
+    # Level complete overlay (with congratulations) after raise completes or timer ends
+    if level_completed and (end_scene['phase'] == 'done' or level_complete_timer <= 0):
+        level_complete_timer -= dt
+        if level_complete_timer <= 0:
+            if autotest_enabled and time.monotonic() >= autotest_deadline:
+                # a bot that never dies would otherwise keep advancing past the deadline
+                return False
+            # Progress after showing overlay
+            advance_level(loop_to_1=True)
+            try:
+                reset_game()
+            except Exception:
+                _log('[error] reset_game failed after level completion:')
+                traceback.print_exc()
+                return False
+        return True
+
+    if level_watcher:
+        rows = level_watcher.poll()
+        if rows:
+            changes = sim.apply_level_rows(rows)
+            end_scene['castle_x'] = sim.castle_x
+            _log(f"[reload] {level_file}: {len(changes)} cells changed")
+
+    run_auto = show_autoplayer and not level_completed
+
+    rewinding = keys[pygame.K_BACKSPACE] and rewind_buffer is not None and len(rewind_buffer) > 1
+    if rewinding:
+        # hold Backspace to step back through the last REWIND_SECONDS instead of updating
+        restore_game(rewind_buffer.rewind(REWIND_SPEED))
+    elif run_auto and adaptive_ai and not level_completed:
+        sim.autopilot()
+    else:
+        move_left = keys[pygame.K_a] or keys[pygame.K_LEFT]
+        move_right = keys[pygame.K_d] or keys[pygame.K_RIGHT]
+        jump = keys[pygame.K_w] or keys[pygame.K_SPACE]
+        shoot = keys[pygame.K_j] or keys[pygame.K_k]
+        sim.control(move_left, move_right, jump, shoot)
+
+    # player, bullets, enemies, coins, AI bookkeeping, end trigger and fall death
+    status = RUNNING if rewinding else sim.update(dt, game_camera['x'])
+    if frame_capture and sim.lives < lives:
+        # the frames leading up to a lost life
+        frame_capture.dump('dead' if status == DEAD else 'death')
+    score, lives = sim.score, sim.lives
+    if status == DEAD:
+        end_episode('dead')
+        if state_publisher:
+            state_publisher.publish(sim, game_camera['x'], game_tick)   # observers see game_over
+        return False
+    if sim.streaming and autotest_enabled and time.monotonic() >= autotest_deadline:
+        # an endless level never completes, so a bot that keeps living ends the soak here
+        end_episode('timeout')
+        return False
+    if not level_completed:
+        update_camera()
+    if status == COMPLETED:
+        # Trigger end scene (castle + flag); approach pole before raising
+        end_episode('completed')
+        level_completed = True
+        level_complete_timer = 4.0
+        end_scene['phase'] = 'approach'
+        end_scene['target_x'] = end_scene['castle_x'] + 160 - 18  # stand by the pole
+        end_scene['raising'] = False
+
+    if not rewinding:
+        # Update decorative actors (parallax, independent of camera)
+        update_parallax(dt)
+
+        # End-scene phases: approach -> wave -> raise -> overlay
+        process_end_scene(dt)
+
+    if not rewinding:
+        ai_save_timer += dt
+        if ai_save_timer >= 2.0:
+            try:
+                if adaptive_ai:
+                    adaptive_ai.save()
+            except Exception:
+                _log("[warn] adaptive_ai.save failed")
+            ai_save_timer = 0.0
+
+    if rewind_buffer is not None and not rewinding:
+        rewind_buffer.push(snapshot_game())
+    if recorder and not rewinding:
+        recorder.record(sim)
+    if state_publisher:
+        state_publisher.publish(sim, game_camera['x'], game_tick)
+    return True
+
+def capture_render_state():
+    """Everything draw_frame() needs from the current tick, detached from the live objects."""
+    cam_x = game_camera['x']
+    background = SpriteRecorder()
+    draw_clouds(background)
+    # Birds, coins and entities are queued as sprites and blitted per layer in flush()
+    rec = SpriteRecorder()
+    draw_birds(rec)
+    for coin in coins:
+        if not coin['taken']:
+            r = coin['rect'].width // 2
+            cx = coin['rect'].x - cam_x + r
+            cy = coin['rect'].y + coin['rect'].height // 2
+            sprite = rec.sprite(('coin', r), circle_sprite, (255, 215, 0), r)
+            rec.submit(LAYER_COINS, sprite, (cx - r, cy - r))
+    player.draw(rec, cam_x)
+    for enemy in enemies:
+        enemy.draw(rec, cam_x)
+    for bullet in bullets:
+        bullet.draw(rec, cam_x)
+
+    arm = None
+    if level_completed and end_scene['phase'] in ('wave', 'raise'):
+        # player waving arm (simple overlay arm)
+        px = player.rect.x - cam_x
+        py = player.rect.y
+        ang = math.sin(end_scene['wave_phase'])
+        arm_len = 18
+        x1 = px + (26 if player.facing_right else 6)
+        y1 = py + 16
+        x2 = int(x1 + arm_len * math.cos(1.2 + ang*0.8) * (1 if player.facing_right else -1))
+        y2 = int(y1 - arm_len * math.sin(1.2 + ang*0.8))
+        arm = ((x1, y1), (x2, y2))
+
+    overlay = level_completed and (end_scene['phase'] == 'done' or level_complete_timer <= 0)
+    return RenderState(game_tick, level, cam_x, paused, castle_state(), arm, overlay,
+                       background.items(), rec.items(), (score, lives, current_level, show_autoplayer))
+
+def draw_frame(state, shed=()):
+    """Draw a RenderState and flip; shed names optional drawing to leave out (see framesched.py)."""
+    cam_x = state.cam_x
+    if state.paused:
+        # Draw paused overlay
+        if BACKGROUND_IMG:
+            canvas.blit(BACKGROUND_IMG, (0, 0))
+        else:
+            draw_camera_bg()
+        draw_level(state.level, cam_x)
+        canvas.flush()
+
+    # Draw end-of-level castle and flag (after level, before entities)
+    draw_castle_and_flag(canvas, cam_x, state.castle, 'castle' not in shed)
+    if state.arm:
+        canvas.line((255, 220, 200), *state.arm, 4)
+
+    if state.overlay:
+        canvas.overlay((0, 0, 0, 140))
+        canvas.text("Congratulations!", 72, (255, 255, 255), (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80), anchor='midtop')
+        canvas.text("You completed the level", 40, (255, 255, 0), (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 20), anchor='midtop')
+        canvas.present()
+        pygame.display.flip()
+        return
+
+    if BACKGROUND_IMG:
+        canvas.blit(BACKGROUND_IMG, (0, 0))
+    else:
+        draw_camera_bg()
+
+    # Draw clouds (behind level); clouds and birds are the first work shed under load
+    if 'clouds' not in shed:
+        replay(canvas, state.clouds)
+        canvas.flush()
+
+    draw_level(state.level, cam_x)
+    replay(canvas, state.sprites, (LAYER_BIRDS,) if 'birds' in shed else ())
+    canvas.flush()
+    hud.draw(canvas, *state.hud)
+    # Draw mute button last so it stays on top
+    draw_sound_button(canvas)
+    canvas.present()
+    pygame.display.flip()
+
 def game_loop():
-    global score, lives, game_running, show_autoplayer, ai_save_timer, level_completed, level_complete_timer
-    run_auto = False
+    global game_running, paused, frame_scheduler, loop_phase
     paused = False
     _log('[game] enter')
 
@@ -494,332 +990,296 @@ def game_loop():
         # ensure required game globals exist
         if player is None or level is None:
             raise RuntimeError("Game not initialized: player or level missing")
+        init_display()
+        load_assets()
+        if threaded:
+            frame_scheduler = None
+            game_loop_threaded()
+            return
+        frame_t0 = time.perf_counter()
+        if not headless:
+            # a fresh one per game, so time spent in menus is not counted as lag
+            frame_scheduler = FrameScheduler(FPS, MAX_FRAME_SKIP)
+        steps = 0
 
         while game_running:
-            dt = clock.tick(FPS) / 1000.0
+            loop_phase = 'wait'
+            if headless:
+                # no frame limiter: step at the nominal rate as fast as possible
+                clock.tick()
+                dt = 1.0 / FPS
+                render = True
+            else:
+                # fixed step; while behind real time, don't sleep and skip rendering
+                clock.tick(FPS if frame_scheduler.paced else 0)
+                render = frame_scheduler.begin_frame()
+                dt = frame_scheduler.dt
+            steps += 1
+            if telemetry and render:
+                now = time.perf_counter()
+                telemetry.frame(now - frame_t0, sim, adaptive_ai, steps, frame_scheduler)
+                frame_t0 = now
+            if render:
+                steps = 0
+            if alloc_tracker:
+                alloc_tracker.frame()
+                if alloc_tracker.frames >= ALLOC_REPORT_FRAMES:
+                    _log(alloc_tracker.report())
+                    alloc_tracker.reset()
+            loop_phase = 'events'
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        game_running = False
-                        return
-                    if event.key == pygame.K_F1:
-                        show_autoplayer = not show_autoplayer
-                    if event.key == pygame.K_p:
-                        paused = not paused
                     if event.key == pygame.K_m:
                         toggle_mute()
-                    if event.key == pygame.K_r:
-                        # restart current level
-                        try:
-                            reset_game()
-                        except Exception:
-                            _log('[error] reset_game failed on restart:')
-                            traceback.print_exc()
-                            game_running = False
-                            return
+                    elif event.key == pygame.K_F2:
+                        toggle_render_scale()
+                    elif event.key == pygame.K_F7:
+                        toggle_profiler()
+                    elif not handle_game_key(event.key):
+                        game_running = False
+                        return
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if get_sound_button_rect().collidepoint(event.pos):
                         toggle_mute()
 
-            keys = pygame.key.get_pressed()
-
-            if paused:
-                # Draw paused overlay and continue loop without updating game state
-                if BACKGROUND_IMG:
-                    screen.blit(BACKGROUND_IMG, (0, 0))
-                else:
-                    draw_camera_bg()
-                level.draw(screen, game_camera['x'])
-
-            # Draw end-of-level castle and flag (after level, before entities)
-            cx = end_scene['castle_x'] - game_camera['x']
-            ground_y = SCREEN_HEIGHT - TILE_SIZE
-            # castle body
-            pygame.draw.rect(screen, (170, 100, 70), (cx, ground_y - 120, 150, 120))
-            pygame.draw.rect(screen, (120, 70, 50), (cx, ground_y - 120, 150, 120), 3)
-            # battlements
-            for i in range(5):
-                pygame.draw.rect(screen, (170, 100, 70), (cx + 10 + i*28, ground_y - 140, 18, 20))
-            # door
-            pygame.draw.rect(screen, (60, 40, 30), (cx + 60, ground_y - 50, 30, 50))
-            # flag pole
-            pole_x = cx + 160
-            pygame.draw.rect(screen, (220, 220, 220), (pole_x, end_scene['pole_top_y'], 6, end_scene['pole_base_y'] - end_scene['pole_top_y']))
-            # flag
-            flag_w, flag_h = 60, 36
-            fy = end_scene['flag_y']
-            pygame.draw.rect(screen, (230, 30, 30), (pole_x + 6, fy, flag_w, flag_h))
-            pygame.draw.rect(screen, (255, 255, 255), (pole_x + 6, fy, flag_w, flag_h), 2)
-            small = pygame.font.Font(None, 28)
-            txt = small.render("vipul", True, (255, 255, 255))
-            screen.blit(txt, (pole_x + 10, fy + flag_h//2 - txt.get_height()//2))
-
-            # Draw player waving arm when in wave phase (simple overlay arm)
-            if level_completed and end_scene['phase'] in ('wave', 'raise'):
-                px = player.rect.x - game_camera['x']
-                py = player.rect.y
-                # arm swing
-                ang = math.sin(end_scene['wave_phase'])
-                arm_len = 18
-                x1 = px + (26 if player.facing_right else 6)
-                y1 = py + 16
-                x2 = int(x1 + arm_len * math.cos(1.2 + ang*0.8) * (1 if player.facing_right else -1))
-                y2 = int(y1 - arm_len * math.sin(1.2 + ang*0.8))
-                pygame.draw.line(screen, (255, 220, 200), (x1, y1), (x2, y2), 4)
-
-            
-            # Level complete overlay (with congratulations) after raise completes or timer ends
-            if level_completed and (end_scene['phase'] == 'done' or level_complete_timer <= 0):
-                level_complete_timer -= dt
-                overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 140))
-                screen.blit(overlay, (0, 0))
-                title = pygame.font.Font(None, 72).render("Congratulations!", True, (255, 255, 255))
-                sub = pygame.font.Font(None, 40).render("You completed the level", True, (255, 255, 0))
-                screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, SCREEN_HEIGHT//2 - 80))
-                screen.blit(sub, (SCREEN_WIDTH//2 - sub.get_width()//2, SCREEN_HEIGHT//2 - 20))
-                if level_complete_timer <= 0:
-                    # Progress after showing overlay
-                    advance_level(loop_to_1=True)
-                    try:
-                        reset_game()
-                    except Exception:
-                        _log('[error] reset_game failed after level completion:')
-                        traceback.print_exc()
-                        game_running = False
-                        return
-                pygame.display.flip()
-                continue
-
-            if show_autoplayer and not level_completed:
-                run_auto = True
-            else:
-                run_auto = False
-
-            if run_auto and adaptive_ai and not level_completed:
-                AutoPlayer.control(player, level, enemies, coins, bullets, sound_jump, sound_shoot)
-            else:
-                move_left = keys[pygame.K_a] or keys[pygame.K_LEFT]
-                move_right = keys[pygame.K_d] or keys[pygame.K_RIGHT]
-                jump = keys[pygame.K_w] or keys[pygame.K_SPACE]
-                shoot = keys[pygame.K_j] or keys[pygame.K_k]
-                if not level_completed:
-                    player.handle_input(move_left, move_right, jump, shoot, bullets, sound_jump, sound_shoot)
-
-            # Use only static level platforms for collisions
-            if not level_completed:
-                player.update(level.platforms, dt)
-                update_camera()
-
-            # Update decorative actors (parallax, independent of camera)
-            for c in clouds:
-                c['x'] -= c['speed'] * dt
-                if c['x'] < -220:
-                    c['x'] = SCREEN_WIDTH + random.randint(10, 200)
-                    c['y'] = random.randint(20, SCREEN_HEIGHT // 2)
-                    c['scale'] = random.uniform(0.6, 1.4)
-                    c['speed'] = random.uniform(10, 30) * (0.6 + (1.6 - c['scale']))
-
-            for b in birds:
-                b['x'] -= b['speed'] * dt
-                b['flap'] += dt * 8.0
-                if b['x'] < -60:
-                    b['x'] = SCREEN_WIDTH + random.randint(50, 300)
-                    b['y'] = random.randint(80, SCREEN_HEIGHT // 2 + 80)
-                    b['speed'] = random.uniform(60, 120)
-                    b['flap'] = random.uniform(0, 6.28)
-
-            # End-scene phases: approach -> wave -> raise -> overlay
-            if level_completed:
-                if end_scene['phase'] == 'approach':
-                    # Move player toward the pole
-                    if player.rect.x < end_scene['target_x']:
-                        player.rect.x += int(120 * dt)
-                        player.facing_right = True
-                    else:
-                        end_scene['phase'] = 'wave'
-                        end_scene['wave_timer'] = 1.2
-                        end_scene['wave_phase'] = 0.0
-                elif end_scene['phase'] == 'wave':
-                    end_scene['wave_timer'] -= dt
-                    end_scene['wave_phase'] += dt * 12.0
-                    if end_scene['wave_timer'] <= 0:
-                        end_scene['phase'] = 'raise'
-                        end_scene['raising'] = True
-                elif end_scene['phase'] == 'raise':
-                    if end_scene['raising']:
-                        end_scene['flag_y'] = max(end_scene['pole_top_y'] + 10, end_scene['flag_y'] - int(80 * dt))
-                        if end_scene['flag_y'] <= end_scene['pole_top_y'] + 10:
-                            end_scene['raising'] = False
-                            end_scene['phase'] = 'done'
-
-            # bullets
-            for bullet in bullets[:]:
-                bullet.update(dt)
-                for enemy in enemies:
-                    if bullet.rect.colliderect(enemy.rect):
-                        enemy.health -= 1
-                        try:
-                            enemy.hit_timer = 0.12
-                        except Exception:
-                            pass
-                        if bullet in bullets:
-                            bullets.remove(bullet)
-                        if enemy.health <= 0:
-                            score += 100
-                            if enemy in enemies:
-                                enemies.remove(enemy)
-                            break
-                if bullet.lifetime <= 0 and bullet in bullets:
-                    bullets.remove(bullet)
-
-            # enemies
-            for enemy in enemies[:]:
-                if not level_completed:
-                    enemy.update(level.platforms, player, dt, game_camera['x'])
-                if enemy.rect.colliderect(player.rect) and getattr(player, 'invuln_timer', 0) <= 0:
-                    lives -= 1
-                    player.invuln_timer = 1.2
-                    if sound_coin:
-                        sound_coin.play()
-                    if lives == 0:
-                        save_score(score)
-                        game_running = False
-                        return
-                    else:
-                        player.respawn(level.player_spawn)
-                if enemy.rect.top > SCREEN_HEIGHT:
-                    if enemy in enemies:
-                        enemies.remove(enemy)
-
-            # coins
-            for coin in coins:
-                if not coin['taken'] and player.rect.colliderect(coin['rect']):
-                    coin['taken'] = True
-                    score += 10
-                    if sound_coin:
-                        sound_coin.play()
-
-            # AI bookkeeping
-            try:
-                if adaptive_ai:
-                    adaptive_ai.track_score(score)
-                    adaptive_ai.update_enemies(enemies)
-            except Exception:
-                _log("[warn] adaptive_ai threw during update; continuing")
-            ai_save_timer += dt
-            if ai_save_timer >= 2.0:
-                try:
-                    if adaptive_ai:
-                        adaptive_ai.save()
-                except Exception:
-                    _log("[warn] adaptive_ai.save failed")
-                ai_save_timer = 0.0
-
-            # Trigger end scene (castle + flag) slightly before absolute level end
-            end_trigger_x = end_scene['castle_x'] - 20
-            if not level_completed and player.rect.right >= end_trigger_x:
-                save_score(score)
-                level_completed = True
-                # Approach pole before raising
-                level_complete_timer = 4.0
-                end_scene['phase'] = 'approach'
-                end_scene['target_x'] = end_scene['castle_x'] + 160 - 18  # stand by the pole
-                end_scene['raising'] = False
-
-            # Spike hazards disabled
-
-            # fall death
-            if player.rect.top > SCREEN_HEIGHT + 120:
-                if getattr(player, 'invuln_timer', 0) <= 0:
-                    lives -= 1
-                    player.invuln_timer = 1.2
-                    if lives == 0:
-                        save_score(score)
-                        game_running = False
-                        return
-                    else:
-                        player.respawn(level.player_spawn)
+            loop_phase = 'sim'
+            if not step_game(dt, pygame.key.get_pressed()):
+                game_running = False
+                return
 
-            # drawing
-            if BACKGROUND_IMG:
-                screen.blit(BACKGROUND_IMG, (0, 0))
-            else:
-                draw_camera_bg()
-
-            # Draw clouds (behind level)
-            for c in clouds:
-                sx = int(60 * c['scale'])
-                sy = int(30 * c['scale'])
-                x = int(c['x'])
-                y = int(c['y'])
-                # simple puffy cloud using ellipses
-                pygame.draw.ellipse(screen, (255, 255, 255), (x, y, sx, sy))
-                pygame.draw.ellipse(screen, (255, 255, 255), (x + sx//3, y - sy//3, sx, sy))
-                pygame.draw.ellipse(screen, (255, 255, 255), (x + sx//2, y, sx, sy))
-
-            level.draw(screen, game_camera['x'])
-
-            # Draw birds (mid-ground, between level and player)
-            for b in birds:
-                x = int(b['x'])
-                y = int(b['y'] + math.sin(b['flap']) * 6)
-                wing = 8
-                body = 10
-                color = (50, 50, 50)
-                # body
-                pygame.draw.circle(screen, color, (x, y), body//2)
-                # beak
-                pygame.draw.polygon(screen, (220, 160, 40), [(x+6, y), (x+12, y-2), (x+12, y+2)])
-                # wings (flapping)
-                wy = int(y + math.sin(b['flap']*2.0) * 6)
-                pygame.draw.line(screen, color, (x-2, y), (x-2-wing, wy), 3)
-                pygame.draw.line(screen, color, (x+2, y), (x+2+wing, wy), 3)
-            for coin in coins:
-                if not coin['taken']:
-                    cx = coin['rect'].x - game_camera['x'] + coin['rect'].width // 2
-                    cy = coin['rect'].y + coin['rect'].height // 2
-                    pygame.draw.circle(screen, (255, 215, 0), (cx, cy), coin['rect'].width // 2)
-            player.draw(screen, game_camera['x'])
-            for enemy in enemies:
-                enemy.draw(screen, game_camera['x'])
-            for bullet in bullets:
-                bullet.draw(screen, game_camera['x'])
-            hud.draw(screen, score, lives, current_level, show_autoplayer)
-            # Draw mute button last so it stays on top
-            draw_sound_button(screen)
-            pygame.display.flip()
+            if not render:
+                # behind real time: this iteration only advances the simulation
+                continue
+            loop_phase = 'render'
+            draw_frame(capture_render_state(), frame_scheduler.shed if frame_scheduler else ())
+            if frame_capture:
+                frame_capture.grab(screen, game_tick)
+            if frame_scheduler:
+                frame_scheduler.end_frame()
+            report_startup()
 
     except Exception:
         _log('[error] exception inside game_loop:')
         traceback.print_exc()
+        if frame_capture:
+            frame_capture.dump('crash')
         # pause so you can read the error in terminal
         pygame.time.wait(1500)
         # ensure we return to menu in a safe state
         game_running = False
         menu_state = 'start'
 
+def _sim_thread(states, commands, held, stop):
+    """--threads: step the game at FPS and publish a RenderState after every tick."""
+    global game_running
+    dt = 1.0 / FPS
+    next_tick = time.perf_counter()
+    try:
+        while game_running and not stop.is_set():
+            while not commands.empty():
+                if not handle_game_key(commands.get()):
+                    game_running = False
+                    return
+            if not step_game(dt, held[0]):
+                game_running = False
+                return
+            states.publish(capture_render_state())
+            if not headless:
+                next_tick += dt
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -0.25:
+                    # far behind (e.g. a stall): slow down instead of rushing to catch up
+                    next_tick = time.perf_counter()
+    except Exception:
+        _log('[error] exception in simulation thread:')
+        traceback.print_exc()
+        if frame_capture:
+            frame_capture.dump('crash')
+        game_running = False
+    finally:
+        states.close()
+
+def game_loop_threaded():
+    """--threads: the simulation runs on its own thread; this one handles events and draws.
+
+    Game keys go to the simulation thread through a queue and the held keys
+    are read from `held`, so pygame's event and display calls stay here.
+    """
+    global game_running, loop_phase
+    states = StateBuffer()
+    commands = queue.SimpleQueue()
+    held = [pygame.key.get_pressed()]
+    stop = threading.Event()
+    worker = threading.Thread(target=_sim_thread, args=(states, commands, held, stop), name='sim', daemon=True)
+    frame_t0 = time.perf_counter()
+    seq, last_tick = 0, game_tick
+    worker.start()
+    if profiler:
+        profiler.watch(worker)
+    try:
+        while not states.closed:
+            clock.tick()
+            loop_phase = 'events'
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    stop.set()
+                    worker.join(1.0)
+                    pygame.quit()
+                    sys.exit()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_m:
+                        toggle_mute()
+                    elif event.key == pygame.K_F2:
+                        toggle_render_scale()
+                    elif event.key == pygame.K_F7:
+                        toggle_profiler()
+                    else:
+                        commands.put(event.key)
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    if get_sound_button_rect().collidepoint(event.pos):
+                        toggle_mute()
+            held[0] = pygame.key.get_pressed()
+
+            # draw each published state once; a slow frame just skips to the newest
+            loop_phase = 'wait'
+            new_seq, state = states.wait(seq, 0.1)
+            if new_seq == seq or state is None or states.closed:
+                continue
+            seq = new_seq
+            if telemetry:
+                now = time.perf_counter()
+                telemetry.frame(now - frame_t0, sim, adaptive_ai, state.tick - last_tick)
+                frame_t0 = now
+            last_tick = state.tick
+            if alloc_tracker:
+                alloc_tracker.frame()
+                if alloc_tracker.frames >= ALLOC_REPORT_FRAMES:
+                    _log(alloc_tracker.report())
+                    alloc_tracker.reset()
+            loop_phase = 'render'
+            draw_frame(state)
+            if frame_capture:
+                frame_capture.grab(screen, state.tick)
+            report_startup()
+    finally:
+        stop.set()
+        worker.join()
+    game_running = False
+
 if __name__ == "__main__":
     # make errors visible in console
     sys.tracebacklimit = None
 
-    # Parse simple CLI flag for automated soak testing
+    # Parse simple CLI flags for automated soak testing
+    autotest_seconds = 0.0
+    capture_path, capture_last, capture_every = None, 0, 1
+    rewind_flag = None
     for arg in sys.argv[1:]:
         if arg.startswith('--autotest='):
             try:
-                seconds = float(arg.split('=', 1)[1])
+                autotest_seconds = float(arg.split('=', 1)[1])
             except Exception:
-                seconds = 120.0
+                autotest_seconds = 120.0
             autotest_enabled = True
-            autotest_deadline_ms = pygame.time.get_ticks() + int(seconds * 1000)
+        elif arg == '--headless':
+            headless = True
+        elif arg == '--hot-reload':
+            hot_reload_enabled = True
+        elif arg == '--telemetry' or arg.startswith('--telemetry='):
+            path = arg.split('=', 1)[1] if '=' in arg else os.path.join(
+                DATA_DIR, 'telemetry', time.strftime('run-%Y%m%d-%H%M%S.jsonl'))
+            telemetry = Telemetry(TelemetrySink(path))
+            atexit.register(telemetry.close)
+            _log(f"[telemetry] writing {path}")
+        elif arg == '--record' or arg.startswith('--record='):
+            path = arg.split('=', 1)[1] if '=' in arg else os.path.join(
+                DATA_DIR, 'datasets', time.strftime('run-%Y%m%d-%H%M%S'))
+            recorder = TrajectoryRecorder(path)
+            atexit.register(recorder.close)
+            _log(f"[record] writing {path}")
+        elif arg == '--capture' or arg.startswith('--capture='):
+            capture_path = arg.split('=', 1)[1] if '=' in arg else ''
+        elif arg.startswith('--capture-last='):
+            capture_last = max(0, int(arg.split('=', 1)[1]))
+        elif arg.startswith('--capture-every='):
+            capture_every = max(1, int(arg.split('=', 1)[1]))
+        elif arg == '--publish' or arg.startswith('--publish='):
+            state_publisher = StatePublisher(arg.split('=', 1)[1] if '=' in arg else STATE_SEGMENT)
+            atexit.register(state_publisher.close)
+            _log(f"[state] publishing to shared memory {state_publisher.name}")
+        elif arg == '--profile' or arg.startswith('--profile='):
+            if '=' in arg:
+                profile_hz = max(1, int(arg.split('=', 1)[1]))
+            start_profiler()
+        elif arg.startswith('--autoplayer='):
+            autoplayer_mode = arg.split('=', 1)[1]
+            if autoplayer_mode not in ('heuristic', 'lookahead'):
+                _log(f"[warn] unknown autoplayer {autoplayer_mode}; using heuristic")
+                autoplayer_mode = 'heuristic'
+        elif arg.startswith('--max-frame-skip='):
+            MAX_FRAME_SKIP = max(0, int(arg.split('=', 1)[1]))
+        elif arg == '--threads':
+            threaded = True
+        elif arg == '--endless' or arg.startswith('--endless='):
+            level_file = endless_ref(arg.split('=', 1)[1] if '=' in arg else 0)
+        elif arg == '--no-rewind':
+            rewind_flag = False
+        elif arg == '--rewind':
+            rewind_flag = True
+        elif arg.startswith('--resume='):
+            resume_file = arg.split('=', 1)[1]
+        elif arg.startswith('--render-res='):
+            render_scale = parse_resolution(arg.split('=', 1)[1], (SCREEN_WIDTH, SCREEN_HEIGHT))
+        elif arg == '--alloc-track' or arg.startswith('--alloc-track='):
+            if '=' in arg:
+                ALLOC_REPORT_FRAMES = max(1, int(arg.split('=', 1)[1]))
+            alloc_tracker = AllocTracker()
+            alloc_tracker.start()
+
+    # a profile started with --profile or F7 is written on the way out
+    atexit.register(stop_profiler)
+
+    if capture_path is not None or capture_last:
+        capture_path = capture_path or os.path.join(DATA_DIR, 'captures', time.strftime('run-%Y%m%d-%H%M%S'))
+        frame_capture = FrameCapture(capture_path, capture_last, capture_every)
+        atexit.register(lambda: (frame_capture.close(), _log(frame_capture.report())))
+        _log(f"[capture] writing {capture_path}" + (f", keeping the last {capture_last} frames" if capture_last else ""))
+        if headless and capture_every == 1:
+            # unpaced frames come faster than the ~10 ms PNG encodes; the excess is dropped
+            _log("[capture] headless runs outpace the encoders and will drop frames; use --capture-every=N")
+
+    if headless and not autotest_enabled:
+        # there is no window to click through the menu, so headless implies autotest
+        autotest_enabled = True
+        autotest_seconds = 120.0
+
+    # nobody holds Backspace in an autotest, so don't pay for a snapshot every tick
+    rewind_enabled = rewind_flag if rewind_flag is not None else not autotest_enabled
+
+    if threaded and hot_reload_enabled:
+        # level reloads would change tiles under the render thread
+        _log("[warn] --hot-reload is not supported with --threads; disabled")
+        hot_reload_enabled = False
+
+    if is_endless(level_file):
+        # snapshots (and so rewind) can't bring back chunks that were dropped,
+        # and the tiles change under the render thread as the level streams
+        rewind_enabled = False
+        for enabled, flag in ((hot_reload_enabled, '--hot-reload'), (threaded, '--threads')):
+            if enabled:
+                _log(f"[warn] {flag} is not supported with --endless; disabled")
+        hot_reload_enabled = threaded = False
 
     if autotest_enabled:
         # Bypass menu and run continuous games with AutoPlayer until deadline
         show_autoplayer = True
-        while pygame.time.get_ticks() < autotest_deadline_ms:
+        autotest_deadline = time.monotonic() + autotest_seconds
+        while time.monotonic() < autotest_deadline:
             try:
                 reset_game()
             except Exception:
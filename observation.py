@@ -0,0 +1,125 @@
+import numpy as np
+from level import TILE_SIZE
+
+# Cell codes in the uint8 grid
+EMPTY = 0
+SOLID = 1      # '#'
+BONUS = 2      # '$'
+SPECIAL = 3    # 'P'
+COIN = 4
+ENEMY = 5
+BULLET = 6
+PLAYER = 7
+
+TILE_CODES = {'#': SOLID, '$': BONUS, 'P': SPECIAL}
+
+
+class TileEncoder:
+    """Camera-centred uint8 tile view of a Simulation, updated incrementally.
+
+    The static grid is built once from the level. Each encode() only rewrites
+    the cells whose dynamic occupant (player, enemy, bullet) changed, and clears
+    coins when the simulation reports new pickups. The returned window is a
+    view into the padded grid, so it must be copied if kept across steps.
+    """
+
+    def __init__(self, sim, view=(11, 21)):
+        self.sim = sim
+        self.view_rows, self.view_cols = view
+        self.pad_y = self.view_rows // 2 + 1
+        self.pad_x = self.view_cols // 2 + 1
+        self.rebuild()
+
+    def rebuild(self):
+        """Re-read the whole level; call after Simulation.reset()."""
+        level = self.sim.level
+        rows = max(1, level.height) + 2 * self.pad_y
+        cols = max(1, level.width) + 2 * self.pad_x
+        self.base = np.zeros((rows, cols), dtype=np.uint8)
+        for plat in level.platforms:
+            rect, ch = plat if isinstance(plat, tuple) else (plat, '#')
+            self.set_cell(rect.x // TILE_SIZE, rect.y // TILE_SIZE, TILE_CODES.get(ch, SOLID))
+        for coin in self.sim.coins:
+            if not coin['taken']:
+                self.set_cell(coin['rect'].x // TILE_SIZE, coin['rect'].y // TILE_SIZE, COIN)
+        self.grid = self.base.copy()
+        self._stamped = {}
+        self._coins_seen = self.sim.coins_taken
+        self._shape = (level.height, level.width)
+        if self._on_level_change not in level.listeners:
+            level.listeners.append(self._on_level_change)
+
+    def _on_level_change(self, changes):
+        # hot-reloaded cells: patch them, or rebuild if the level was resized
+        level = self.sim.level
+        if (level.height, level.width) != self._shape:
+            self.rebuild()
+            return
+        for (tx, ty), (_, ch) in changes.items():
+            self.set_cell(tx, ty, COIN if ch == 'C' else TILE_CODES.get(ch, EMPTY))
+
+    def set_cell(self, tx, ty, code):
+        """Write a static cell (level coordinates); dynamic stamps are reapplied on the next encode()."""
+        r, c = ty + self.pad_y, tx + self.pad_x
+        if 0 <= r < self.base.shape[0] and 0 <= c < self.base.shape[1]:
+            self.base[r, c] = code
+            if hasattr(self, 'grid') and (r, c) not in self._stamped:
+                self.grid[r, c] = code
+
+    def _cell(self, rect):
+        r = rect.centery // TILE_SIZE + self.pad_y
+        c = rect.centerx // TILE_SIZE + self.pad_x
+        if 0 <= r < self.base.shape[0] and 0 <= c < self.base.shape[1]:
+            return r, c
+        return None
+
+    def _sync_coins(self):
+        sim = self.sim
+        if sim.coins_taken == self._coins_seen:
+            return
+        self._coins_seen = sim.coins_taken
+        for coin in sim.coins:
+            if coin['taken']:
+                cell = self._cell(coin['rect'])
+                if cell and self.base[cell] == COIN:
+                    self.base[cell] = EMPTY
+                    if cell not in self._stamped:
+                        self.grid[cell] = EMPTY
+
+    def encode(self):
+        """Patch moved entities into the grid and return the window around the player."""
+        sim = self.sim
+        self._sync_coins()
+
+        # Later stamps win: bullets < enemies < player
+        stamped = {}
+        for bullet in sim.bullets:
+            cell = self._cell(bullet.rect)
+            if cell:
+                stamped[cell] = BULLET
+        for enemy in sim.enemies:
+            cell = self._cell(enemy.rect)
+            if cell:
+                stamped[cell] = ENEMY
+        centre = self._cell(sim.player.rect)
+        if centre:
+            stamped[centre] = PLAYER
+
+        grid, base, old = self.grid, self.base, self._stamped
+        for cell in old:
+            if cell not in stamped:
+                grid[cell] = base[cell]
+        for cell, code in stamped.items():
+            if old.get(cell) != code:
+                grid[cell] = code
+        self._stamped = stamped
+
+        if centre is None:
+            # player off the grid (e.g. falling out): clamp the window to the nearest edge
+            r = min(max(sim.player.rect.centery // TILE_SIZE + self.pad_y, 0), grid.shape[0] - 1)
+            c = min(max(sim.player.rect.centerx // TILE_SIZE + self.pad_x, 0), grid.shape[1] - 1)
+        else:
+            r, c = centre
+        r0 = min(max(r - self.view_rows // 2, 0), grid.shape[0] - self.view_rows)
+        c0 = min(max(c - self.view_cols // 2, 0), grid.shape[1] - self.view_cols)
+        return grid[r0:r0 + self.view_rows, c0:c0 + self.view_cols]
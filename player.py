@@ -1,10 +1,42 @@
 import pygame
 from bullet import Bullet
 from utils import clamp
+from physics import solid_rects, move, get_pos, set_pos
+from render import LAYER_PLAYER, rect_sprite
 
 GRAVITY = 1200
 JUMP_VELOCITY = 500
 MAX_FALL_SPEED = 900
+# Horizontal motion: each 1/60 s the velocity gains 18 px/s per held direction and
+# keeps 86% of itself. update() integrates that exactly for any dt, so run speed
+# approaches RUN_SPEED whatever the step size.
+RUN_ACCEL = 18
+RUN_DRAG = 0.86
+RUN_SPEED = RUN_ACCEL * RUN_DRAG / (1 - RUN_DRAG)
+# While jump is held during the first JUMP_HOLD_TIME, extra lift is applied
+JUMP_HOLD_TIME = 0.13
+JUMP_HOLD_LIFT = GRAVITY * 0.72
+
+_sprite_cache = {}
+
+def _load_sprite_pair(size):
+    # Shared by all Player instances so respawns/resets don't reload the image
+    if size not in _sprite_cache:
+        try:
+            img = pygame.image.load("assets/tiles/player.png").convert_alpha()
+            img = pygame.transform.smoothscale(img, size)
+            _sprite_cache[size] = (img, pygame.transform.flip(img, True, False))
+        except Exception:
+            _sprite_cache[size] = (None, None)
+    return _sprite_cache[size]
+
+def _fallback_sprite(size, color, facing_right):
+    # drawn when assets/tiles/player.png is missing
+    surf = rect_sprite(color, size)
+    eye_color = (255, 255, 255) if facing_right else (30, 30, 30)
+    pygame.draw.circle(surf, eye_color, (22 if facing_right else 10, 12), 4)
+    pygame.draw.rect(surf, (40, 40, 40), (7, 33, 18, 8), 2)
+    return surf
 
 class Player:
     def __init__(self, spawn_pos, screen_height):
@@ -18,44 +50,37 @@ class Player:
         self.screen_height = screen_height
         self.shoot_cooldown = 0.0
         self.invuln_timer = 0.0
-        # Static sprite (no run animation)
+        # Input latched by handle_input and consumed by the next update
+        self.move_input = 0
+        self.jump_held = False
+        self.shoot_held = False
+        # Static sprite (no run animation), loaded on first draw
         self.sprite_right = None
         self.sprite_left = None
-        try:
-            img = pygame.image.load("assets/tiles/player.png").convert_alpha()
-            img = pygame.transform.smoothscale(img, (self.rect.width, self.rect.height))
-            self.sprite_right = img
-            self.sprite_left = pygame.transform.flip(img, True, False)
-        except Exception:
-            self.sprite_right = None
-            self.sprite_left = None
 
     def handle_input(self, move_left, move_right, jump, shoot, bullets, sound_jump, sound_shoot):
+        self.move_input = 0
         if move_left:
-            self.vel_x -= 18
+            self.move_input -= 1
             self.facing_right = False
         if move_right:
-            self.vel_x += 18
+            self.move_input += 1
             self.facing_right = True
 
-        # 🦘 Jump
+        # 🦘 Jump (held-jump lift is applied in update so it scales with dt)
+        self.jump_held = bool(jump)
         if jump:
             if self.on_ground:
                 self.jumping = True
-                self.jump_timer = 0.13
+                self.jump_timer = JUMP_HOLD_TIME
                 self.vel_y = -JUMP_VELOCITY
                 if sound_jump:
                     sound_jump.play()
-        if self.jumping and jump:
-            self.jump_timer -= 1 / 60
-            if self.jump_timer > 0:
-                self.vel_y -= GRAVITY * 0.012
-            else:
-                self.jumping = False
         if not jump:
             self.jumping = False
 
         # 🔫 Shoot
+        self.shoot_held = bool(shoot)
         if shoot and self.shoot_cooldown <= 0:
             bx = self.rect.centerx + (28 if self.facing_right else -20)
             bullets.append(Bullet((bx, self.rect.centery), self.facing_right))
@@ -71,50 +96,53 @@ class Player:
             self.invuln_timer = max(0.0, self.invuln_timer - dt)
 
         # Horizontal movement
-        self.vel_x *= 0.86
-        self.rect.x += int(self.vel_x * dt)
+        decay = RUN_DRAG ** (dt * 60)
+        self.vel_x = self.vel_x * decay + self.move_input * RUN_SPEED * (1 - decay)
 
         # Vertical movement
+        if self.jumping and self.jump_held:
+            self.jump_timer -= dt
+            if self.jump_timer > 0:
+                self.vel_y -= JUMP_HOLD_LIFT * dt
+            else:
+                self.jumping = False
         self.vel_y += GRAVITY * dt
         self.vel_y = clamp(self.vel_y, -JUMP_VELOCITY, MAX_FALL_SPEED)
-        self.rect.y += int(self.vel_y * dt)
-
-        # 🧱 Collision detection
-        self.on_ground = False
-        for plat in platforms:
-            rect = plat[0] if isinstance(plat, tuple) else plat
-            if not isinstance(rect, pygame.Rect):
-                continue
-
-            if self.rect.colliderect(rect):
-                # Landing on platform
-                if self.vel_y > 0:
-                    self.rect.bottom = rect.top
-                    self.vel_y = 0
-                    self.on_ground = True
-                # Hitting ceiling
-                elif self.vel_y < 0:
-                    self.rect.top = rect.bottom
-                    self.vel_y = 0
+        self.move_input = 0
+        self.jump_held = False
+        self.shoot_held = False
+
+        # 🧱 Swept collision against the level tiles on both axes
+        x, y = get_pos(self)
+        x, y, hit_x, hit_y = move(x, y, self.rect.width, self.rect.height,
+                                  self.vel_x * dt, self.vel_y * dt, solid_rects(platforms))
+        set_pos(self, x, y)
+        self.on_ground = hit_y > 0
+        if hit_y:
+            # Landing on platform or hitting ceiling
+            self.vel_y = 0
+        if hit_x:
+            # Walking into a wall
+            self.vel_x = 0
 
         # Animate
         self._animate(dt)
 
-    def draw(self, surface, cam_x):
+    def draw(self, canvas, cam_x):
         px = self.rect.x - cam_x
+        if self.sprite_right is None:
+            self.sprite_right, self.sprite_left = _load_sprite_pair(self.rect.size)
         if self.sprite_right:
             sprite = self.sprite_right if self.facing_right else self.sprite_left
-            surface.blit(sprite, (px, self.rect.y))
+            sprite = canvas.scaled(sprite)
         else:
             color = (220, 60, 30) if self.invuln_timer <= 0 else (220, 160, 160)
-            pygame.draw.rect(surface, color, (px, self.rect.y, self.rect.width, self.rect.height))
-            eye_color = (255, 255, 255) if self.facing_right else (30, 30, 30)
-            pygame.draw.circle(surface, eye_color,
-                               (px + 22 if self.facing_right else px + 10, self.rect.y + 12), 4)
-            pygame.draw.rect(surface, (40, 40, 40), (px + 7, self.rect.y + 33, 18, 8), 2)
+            key = ('player', self.rect.size, color, self.facing_right)
+            sprite = canvas.sprite(key, _fallback_sprite, self.rect.size, color, self.facing_right)
+        canvas.submit(LAYER_PLAYER, sprite, (px, self.rect.y))
 
     def respawn(self, spawn_pos):
-        self.rect.x, self.rect.y = spawn_pos
+        set_pos(self, float(spawn_pos[0]), float(spawn_pos[1]))
         self.vel_x = 0
         self.vel_y = 0
         self.on_ground = False
@@ -0,0 +1,183 @@
+"""Gameplay trajectory recorder: one row per simulation tick, written as columnar .npy shards.
+
+    rec = TrajectoryRecorder('data/datasets/run-1')
+    sim.update(dt); rec.record(sim)      # every tick, human or AutoPlayer
+    rec.close()
+
+    shards = load_dataset('data/datasets/run-1')   # memory-mapped
+    xs = [shard['x'] for shard in shards]
+
+record() copies the tick into the next row of a preallocated structured
+chunk (one assignment, plus one for the enemy offsets). Full chunks go to a background thread that splits them
+into one .npy file per column under shard-NNNNNN/ and rewrites manifest.json,
+so the game thread never serializes or touches the disk. Recording into a
+directory that already has a manifest appends to it.
+
+    python recorder.py data/datasets/run-1        # summary of a recording
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+
+import numpy as np
+
+# enemies closest to the player by x, as (dx, dy) centre offsets; NaN when fewer
+NEARBY_ENEMIES = 4
+CHUNK_ROWS = 1 << 16
+
+# per-tick scalars; 'enemies' is kept in its own (rows, NEARBY_ENEMIES, 2) buffer
+SCALARS = np.dtype([
+    ('episode', 'u4'),
+    ('tick', 'u4'),          # tick within the episode
+    ('x', 'f4'), ('y', 'f4'),
+    ('vel_x', 'f4'), ('vel_y', 'f4'),
+    ('on_ground', '?'),
+    ('move', 'i1'),          # input applied this tick: -1 left, 0 none, 1 right
+    ('jump', '?'),
+    ('shoot', '?'),
+    ('score', 'i4'),
+    ('lives', 'i1'),
+])
+ENEMIES = np.dtype(('f4', (NEARBY_ENEMIES, 2)))
+COLUMNS = [(name, SCALARS[name]) for name in SCALARS.names] + [('enemies', ENEMIES)]
+
+MANIFEST = 'manifest.json'
+_NO_ENEMY = [float('nan')] * 2
+_STOP = object()
+
+
+class TrajectoryRecorder:
+    """Buffers per-tick rows in chunks of `chunk_rows` and writes full chunks in the background."""
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        os.makedirs(path, exist_ok=True)
+        self.manifest = read_manifest(path) if os.path.exists(os.path.join(path, MANIFEST)) else {
+            'version': 1,
+            'columns': [{'name': name, 'dtype': dtype.base.str, 'shape': list(dtype.shape)}
+                        for name, dtype in COLUMNS],
+            'rows': 0,
+            'episodes': 0,
+            'shards': [],
+        }
+        self.episode = self.manifest['episodes'] - 1
+        self.errors = 0
+        self._sim = None
+        self._last_time = None
+        self._tick = 0
+        self._free = queue.SimpleQueue()
+        self._chunk = self._new_chunk()
+        self._rows = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='recorder-writer', daemon=True)
+        self._thread.start()
+
+    def _new_chunk(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return np.empty(self.chunk_rows, SCALARS), np.empty(self.chunk_rows, ENEMIES)
+
+    def record(self, sim):
+        """Append the simulation's state after a tick; a new Simulation or reset starts an episode."""
+        if sim is not self._sim or sim.time < self._last_time:
+            self._sim = sim
+            self.episode += 1
+            self._tick = 0
+        self._last_time = sim.time
+        p = sim.player
+        px, py = p.rect.center
+        near = sorted(sim.enemies, key=lambda e: abs(e.rect.centerx - px))[:NEARBY_ENEMIES]
+        enemies = [[e.rect.centerx - px, e.rect.centery - py] for e in near]
+        enemies += [_NO_ENEMY] * (NEARBY_ENEMIES - len(enemies))
+        scalars, offsets = self._chunk
+        move, jump, shoot = sim.last_action
+        scalars[self._rows] = (self.episode, self._tick, p.rect.x, p.rect.y, p.vel_x, p.vel_y,
+                               p.on_ground, move, jump, shoot, sim.score, sim.lives)
+        offsets[self._rows] = enemies
+        self._tick += 1
+        self._rows += 1
+        if self._rows == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Hand the rows buffered so far to the writer thread."""
+        if self._rows:
+            self._queue.put((self._chunk, self._rows, self.episode))
+            self._chunk = self._new_chunk()
+            self._rows = 0
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            chunk, rows, episode = item
+            try:
+                self._write(chunk[0][:rows], chunk[1][:rows], episode)
+            except Exception as e:
+                self.errors += 1
+                print(f"[record] shard write failed: {e}")
+            self._free.put(chunk)
+
+    def _write(self, scalars, enemies, last_episode):
+        manifest = self.manifest
+        name = f"shard-{len(manifest['shards']):06d}"
+        directory = os.path.join(self.path, name)
+        os.makedirs(directory, exist_ok=True)
+        for column in SCALARS.names:
+            # field views are strided; save() writes them out contiguously
+            np.save(os.path.join(directory, column + '.npy'), scalars[column])
+        np.save(os.path.join(directory, 'enemies.npy'), enemies)
+        manifest['shards'].append({'name': name, 'rows': len(scalars),
+                                   'first_episode': int(scalars['episode'][0]), 'last_episode': last_episode})
+        manifest['rows'] += len(scalars)
+        manifest['episodes'] = last_episode + 1
+        tmp = os.path.join(self.path, MANIFEST + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp, os.path.join(self.path, MANIFEST))
+
+    def close(self):
+        """Write the partial chunk and wait for the writer to finish."""
+        if self._thread.is_alive():
+            self.flush()
+            self._queue.put(_STOP)
+            self._thread.join()
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_dataset(path, columns=None, mmap_mode='r'):
+    """Shards of a recording as a list of {column: array}, memory-mapped by default."""
+    manifest = read_manifest(path)
+    names = columns or [c['name'] for c in manifest['columns']]
+    return [{name: np.load(os.path.join(path, shard['name'], name + '.npy'), mmap_mode=mmap_mode)
+             for name in names}
+            for shard in manifest['shards']]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a recorded gameplay dataset")
+    parser.add_argument('path', help="recording directory (with manifest.json)")
+    args = parser.parse_args(argv)
+
+    manifest = read_manifest(args.path)
+    shards = load_dataset(args.path, ['episode', 'x', 'score'])
+    print(f"[record] {args.path}: {manifest['rows']} ticks, {manifest['episodes']} episodes, "
+          f"{len(manifest['shards'])} shards")
+    for shard, info in zip(shards, manifest['shards']):
+        print(f"  {info['name']}: {info['rows']} ticks, episodes {info['first_episode']}-{info['last_episode']}, "
+              f"x {shard['x'].min():.0f}..{shard['x'].max():.0f}, best score {shard['score'].max()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
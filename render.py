@@ -0,0 +1,189 @@
+import math
+import pygame
+from utils import get_font
+
+# Sprite layers, flushed in this order (one Surface.blits call each)
+LAYER_CLOUDS = 0
+LAYER_MARKERS = 1
+LAYER_BIRDS = 2
+LAYER_COINS = 3
+LAYER_PLAYER = 4
+LAYER_ENEMIES = 5
+LAYER_BULLETS = 6
+
+
+class Canvas:
+    """Draw target that takes logical (window) coordinates and renders at scale.
+
+    At scale 1.0 it draws straight onto the display surface. Below that it
+    draws into an offscreen surface of the reduced internal resolution, and
+    present() upscales it to the window with one pygame.transform.scale call.
+    Text is rendered with fonts at the scaled size rather than scaled glyphs.
+
+    Entities submit pre-rendered sprites (see sprite()) to a per-layer queue
+    instead of issuing draw calls; flush() blits each layer with one
+    Surface.blits call, lowest layer first.
+    """
+
+    def __init__(self, display, scale=1.0):
+        self.display = display
+        self.logical_size = display.get_size()
+        self._scaled = {}
+        self._overlays = {}
+        self._sprites = {}
+        self._queue = {}
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        scale = min(max(float(scale), 0.1), 1.0)
+        self.scale = scale
+        w, h = self.logical_size
+        if scale == 1.0:
+            self.surface = self.display
+        else:
+            # same pixel format as the display so the upscale is a straight copy
+            self.surface = pygame.Surface((max(1, round(w * scale)), max(1, round(h * scale))), 0, self.display)
+        self._scaled.clear()
+        self._overlays.clear()
+
+    @property
+    def size(self):
+        return self.surface.get_size()
+
+    def present(self):
+        if self.surface is not self.display:
+            pygame.transform.scale(self.surface, self.display.get_size(), self.display)
+
+    # coordinate mapping
+    def pt(self, pos):
+        s = self.scale
+        return (math.floor(pos[0] * s), math.floor(pos[1] * s))
+
+    def box(self, rect):
+        """Map a logical (x, y, w, h) via its edges so neighbouring tiles stay seamless."""
+        x, y, w, h = rect
+        s = self.scale
+        if s == 1.0:
+            return x, y, w, h
+        x0, y0 = math.floor(x * s), math.floor(y * s)
+        return x0, y0, max(1, math.floor((x + w) * s) - x0), max(1, math.floor((y + h) * s) - y0)
+
+    def _w(self, width):
+        return width if width <= 0 or self.scale == 1.0 else max(1, round(width * self.scale))
+
+    # primitives
+    def fill(self, color):
+        self.surface.fill(color)
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(self.surface, color, self.box(rect), self._w(width), self._w(border_radius))
+
+    def ellipse(self, color, rect, width=0):
+        pygame.draw.ellipse(self.surface, color, self.box(rect), self._w(width))
+
+    def arc(self, color, rect, start, stop, width=1):
+        pygame.draw.arc(self.surface, color, self.box(rect), start, stop, self._w(width))
+
+    def circle(self, color, center, radius, width=0):
+        if self.scale == 1.0:
+            pygame.draw.circle(self.surface, color, center, radius, width)
+        else:
+            pygame.draw.circle(self.surface, color, self.pt(center), max(1, round(radius * self.scale)), self._w(width))
+
+    def line(self, color, start, end, width=1):
+        if self.scale == 1.0:
+            pygame.draw.line(self.surface, color, start, end, width)
+        else:
+            pygame.draw.line(self.surface, color, self.pt(start), self.pt(end), self._w(width))
+
+    def polygon(self, color, points, width=0):
+        if self.scale == 1.0:
+            pygame.draw.polygon(self.surface, color, points, width)
+        else:
+            pygame.draw.polygon(self.surface, color, [self.pt(p) for p in points], self._w(width))
+
+    # images and text
+    def scaled(self, image):
+        """image resized for this canvas, cached per source surface."""
+        if self.scale == 1.0:
+            return image
+        entry = self._scaled.get(id(image))
+        if entry is None or entry[0] is not image:
+            w, h = image.get_size()
+            size = (max(1, round(w * self.scale)), max(1, round(h * self.scale)))
+            # keep the source alive so its id() is not reused while cached
+            entry = self._scaled[id(image)] = (image, pygame.transform.smoothscale(image, size))
+        return entry[1]
+
+    def blit(self, image, pos):
+        """Blit a full-resolution image at a logical position."""
+        self.surface.blit(self.scaled(image), self.pt(pos))
+
+    def text(self, string, size, color, pos, anchor='topleft'):
+        """Render text at the scaled font size and place its `anchor` at logical pos."""
+        surf = get_font(max(6, round(size * self.scale))).render(string, True, color)
+        rect = surf.get_rect(**{anchor: self.pt(pos)})
+        self.surface.blit(surf, rect)
+        return rect
+
+    # batched sprites
+    def sprite(self, key, build, *args):
+        """Sprite for `key` at canvas scale; build(*args) draws it at full size on a miss."""
+        image = self._sprites.get(key)
+        if image is None:
+            image = build(*args)
+            if pygame.display.get_surface() is not None:
+                # match the display format so blits are plain copies
+                image = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+            self._sprites[key] = image
+        return self.scaled(image)
+
+    def submit(self, layer, image, pos):
+        """Queue an already-scaled image (from sprite()/scaled()) at a logical position."""
+        items = self._queue.get(layer)
+        if items is None:
+            items = self._queue[layer] = []
+        s = self.scale
+        items.append((image, (math.floor(pos[0] * s), math.floor(pos[1] * s))))
+
+    def flush(self):
+        """Blit every queued layer in order and empty the queue."""
+        if not self._queue:
+            return
+        blits = self.surface.blits
+        for layer in sorted(self._queue):
+            items = self._queue[layer]
+            if items:
+                blits(items, False)
+                items.clear()
+
+    def overlay(self, rgba):
+        """Fill the whole canvas with a translucent colour (the surface is reused)."""
+        surf = self._overlays.get(rgba)
+        if surf is None:
+            surf = self._overlays[rgba] = pygame.Surface(self.size, pygame.SRCALPHA)
+            surf.fill(rgba)
+        self.surface.blit(surf, (0, 0))
+
+
+def circle_sprite(color, radius):
+    """Filled circle; draw its top-left at (cx - radius, cy - radius)."""
+    surf = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+    pygame.draw.circle(surf, color, (radius, radius), radius)
+    return surf
+
+
+def rect_sprite(color, size):
+    """Opaque filled rectangle."""
+    surf = pygame.Surface(size)
+    surf.fill(color)
+    return surf
+
+
+def parse_resolution(text, window_size):
+    """'640x360' or '0.5' -> scale relative to the window width."""
+    text = text.strip().lower()
+    if 'x' in text:
+        w, _ = text.split('x', 1)
+        return int(w) / window_size[0]
+    return float(text)
@@ -0,0 +1,93 @@
+"""Immutable per-tick render snapshots and the double buffer that hands them over.
+
+game_loop draws from a RenderState captured after each simulation tick
+rather than from the live objects. With `main.py --threads` the simulation
+runs on a worker thread that publishes a RenderState into a StateBuffer every
+tick, and the main thread draws whichever one is newest, so neither waits for
+the other beyond a reference swap.
+
+Entity draw methods are written against Canvas; SpriteRecorder stands in for
+it while capturing and stores (layer, sprite spec, position) entries, which
+replay() turns into real sprites and queue submissions on the render side.
+"""
+import threading
+from collections import namedtuple
+
+RenderState = namedtuple('RenderState', (
+    'tick',      # simulation ticks so far
+    'level',     # Level (tiles are read-only while a game runs)
+    'cam_x',
+    'paused',
+    'castle',    # (castle_x, pole_top_y, pole_base_y, flag_y)
+    'arm',       # waving arm line (start, end) or None
+    'overlay',   # level-complete overlay showing
+    'clouds',    # recorded sprites drawn behind the tiles
+    'sprites',   # recorded sprites drawn over the tiles
+    'hud',       # (score, lives, level number, autoplayer shown)
+))
+
+
+class SpriteRecorder:
+    """Canvas stand-in for the sprite queue: records what would be submitted."""
+
+    def __init__(self):
+        self._items = []
+
+    def sprite(self, key, build, *args):
+        return (key, build, args)
+
+    def scaled(self, image):
+        return (None, image, ())
+
+    def submit(self, layer, image, pos):
+        self._items.append((layer, image, pos))
+
+    def items(self):
+        return tuple(self._items)
+
+
+def replay(canvas, items, skip_layers=()):
+    """Submit recorded sprites to a real Canvas (built and cached by it as usual)."""
+    for layer, (key, build, args), pos in items:
+        if layer in skip_layers:
+            continue
+        image = canvas.scaled(build) if key is None else canvas.sprite(key, build, *args)
+        canvas.submit(layer, image, pos)
+
+
+class StateBuffer:
+    """Two-slot buffer: the writer fills the back slot and flips, readers take the front.
+
+    States are immutable, so a reader may keep using one after later flips.
+    """
+
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+        self._cond = threading.Condition()
+        self.seq = 0
+        self.closed = False
+
+    def publish(self, state):
+        back = 1 - self._front
+        self._slots[back] = state
+        with self._cond:
+            self._front = back
+            self.seq += 1
+            self._cond.notify_all()
+
+    def latest(self):
+        """(seq, state) of the newest publication; state is None before the first."""
+        with self._cond:
+            return self.seq, self._slots[self._front]
+
+    def wait(self, seq, timeout=None):
+        """Block until something newer than `seq` is published (or close()/timeout); see latest()."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq != seq or self.closed, timeout)
+            return self.seq, self._slots[self._front]
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
@@ -0,0 +1,184 @@
+"""Run history in SQLite: one row per finished game, written by a background thread.
+
+    store = RunStore('data/runs.sqlite3')
+    store.record(outcome='dead', level=1, score=420, duration=61.2, deaths=3,
+                 autoplayer='heuristic', ai={'speed': 88, ...})
+    store.highscore()             # best score overall, or on one level
+    store.leaderboard(level=1)    # best runs, newest first on ties
+    store.close()
+
+record() only queues the row. The writer thread commits whatever has queued
+up in one transaction, so a soak that ends thousands of games costs one
+insert batch per burst instead of a file rewrite per game. The database runs
+in WAL mode, so queries from the game thread read alongside the writer;
+rows show up once their batch commits (flush() waits for that).
+Leaderboard and highscore queries use the score and (level, score) indexes.
+
+The first open imports the old data/highscore.json best score as an
+'imported' run, so the highscore carries over.
+
+    python runstore.py [data/runs.sqlite3] [--level N] [--limit 10]
+"""
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from utils import load_highscore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,       -- unix time
+    level INTEGER,
+    level_ref TEXT,               -- level file or reference (endless:SEED, pack entries)
+    outcome TEXT NOT NULL,        -- dead, completed, quit, restart, timeout, imported
+    score INTEGER NOT NULL,
+    duration REAL,                -- simulated seconds
+    deaths INTEGER,
+    autoplayer TEXT,              -- off, heuristic or lookahead
+    ai TEXT                       -- AdaptiveAI parameters at the end, as JSON
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC, ended_at DESC);
+CREATE INDEX IF NOT EXISTS runs_by_level ON runs (level, score DESC, ended_at DESC);
+"""
+COLUMNS = ('ended_at', 'level', 'level_ref', 'outcome', 'score', 'duration', 'deaths', 'autoplayer', 'ai')
+BATCH = 500
+_STOP = object()
+
+
+def _connect(path):
+    con = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    con.execute('PRAGMA journal_mode=WAL')
+    con.execute('PRAGMA synchronous=NORMAL')   # durable at checkpoints; a crash loses at most the last batch
+    return con
+
+
+class RunStore:
+    """Queues finished runs for the writer thread and answers leaderboard queries."""
+
+    def __init__(self, path, legacy_highscore=None):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.errors = 0
+        self._con = _connect(path)
+        self._lock = threading.Lock()   # the query connection is shared by callers
+        with self._con:
+            self._con.executescript(SCHEMA)
+        if legacy_highscore and os.path.exists(legacy_highscore):
+            self._import_highscore(legacy_highscore)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='runstore-writer', daemon=True)
+        self._thread.start()
+
+    def _import_highscore(self, path):
+        with self._con:
+            if self._con.execute('SELECT 1 FROM runs LIMIT 1').fetchone() is None:
+                score = load_highscore(path)
+                if score:
+                    self._con.execute('INSERT INTO runs (ended_at, outcome, score) VALUES (?, ?, ?)',
+                                      (os.path.getmtime(path), 'imported', score))
+
+    def record(self, outcome, score, level=None, level_ref=None, duration=None, deaths=None,
+               autoplayer=None, ai=None, ended_at=None):
+        self._queue.put((time.time() if ended_at is None else ended_at, level, level_ref, outcome,
+                         int(score), duration, deaths, autoplayer,
+                         None if ai is None else json.dumps(ai, sort_keys=True)))
+
+    def _run(self):
+        con = _connect(self.path)
+        insert = f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+        stop = False
+        while not stop:
+            rows = [self._queue.get()]
+            while len(rows) < BATCH:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            taken = len(rows)
+            stop = any(row is _STOP for row in rows)
+            rows = [row for row in rows if row is not _STOP]
+            try:
+                with con:
+                    con.executemany(insert, rows)
+            except sqlite3.Error as e:
+                self.errors += 1
+                print(f"[runs] could not store {len(rows)} runs: {e}")
+            for _ in range(taken):
+                self._queue.task_done()
+        con.close()
+
+    def flush(self):
+        """Wait until every recorded run is committed."""
+        self._queue.join()
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._con.execute(sql, args).fetchall()
+
+    def highscore(self, level=None):
+        """Best score overall or on one level (0 without runs)."""
+        if level is None:
+            rows = self._query('SELECT score FROM runs ORDER BY score DESC LIMIT 1')
+        else:
+            rows = self._query('SELECT score FROM runs WHERE level = ? ORDER BY score DESC LIMIT 1', (level,))
+        return rows[0][0] if rows else 0
+
+    def leaderboard(self, limit=10, level=None):
+        """Best runs as dicts, highest score first and newest first on ties."""
+        where, args = ('WHERE level = ?', (level,)) if level is not None else ('', ())
+        rows = self._query(f"SELECT {', '.join(COLUMNS)} FROM runs {where} "
+                           f"ORDER BY score DESC, ended_at DESC LIMIT ?", args + (limit,))
+        runs = [dict(zip(COLUMNS, row)) for row in rows]
+        for run in runs:
+            run['ai'] = json.loads(run['ai']) if run['ai'] else None
+        return runs
+
+    def count(self, level=None):
+        if level is None:
+            return self._query('SELECT COUNT(*) FROM runs')[0][0]
+        return self._query('SELECT COUNT(*) FROM runs WHERE level = ?', (level,))[0][0]
+
+    def close(self):
+        """Commit queued runs and stop the writer."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        with self._lock:
+            self._con.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the best recorded runs")
+    parser.add_argument('path', nargs='?', default=os.path.join('data', 'runs.sqlite3'))
+    parser.add_argument('--level', type=int, default=None, help="only runs on this level")
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"[runs] no run history at {args.path}")
+        return 1
+    store = RunStore(args.path)
+    try:
+        where = f" on level {args.level}" if args.level is not None else ""
+        print(f"[runs] {store.count(args.level)} runs{where}, highscore {store.highscore(args.level)}")
+        for i, run in enumerate(store.leaderboard(args.limit, args.level), 1):
+            when = time.strftime('%Y-%m-%d %H:%M', time.localtime(run['ended_at']))
+            duration = f"{run['duration']:.1f}s" if run['duration'] is not None else '-'
+            print(f"  {i:2d}. {run['score']:6d}  level {run['level'] if run['level'] is not None else '-'}  "
+                  f"{run['outcome']:9s} {duration:>8s}  deaths {run['deaths'] if run['deaths'] is not None else '-'}  "
+                  f"{run['autoplayer'] or '-':9s} {when}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""Live game state in shared memory, for observers in other processes.
+
+    pub = StatePublisher('ai-mario')            # main.py --publish[=NAME]
+    pub.publish(sim, cam_x, tick)                # every tick
+    pub.close()
+
+    reader = StateReader('ai-mario')             # any other process
+    state = reader.read()                        # consistent copy of the newest tick
+    state['player']['x'], state['enemies'][:state['n_enemies']]['x']
+
+The segment is a HEADER followed by two SLOT records, fixed-layout NumPy
+structured dtypes; entity tables hold at most MAX_ENEMIES, MAX_BULLETS and
+MAX_COINS entries (the n_* counts say how many are live, the rest is stale).
+The k-th publish() writes slot k % 2 in place and then stores k in
+header['seq']; nothing is serialized and the game never waits for readers.
+
+A reader picks the slot of the current seq, copies it and checks that seq
+did not move meanwhile. The writer is busy with the other slot until the
+next tick, so a reader has a whole tick to copy before it has to retry.
+Readers attach read-only views, so any number can watch at no cost to the
+game. (The store order relies on x86-style ordered stores; there is no
+memory fence in Python.)
+
+    python sharedstate.py ai-mario               # print the live state twice a second
+"""
+import argparse
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_NAME = 'ai-mario-state'
+MAGIC = 0x4D415249   # 'MARI'
+VERSION = 1
+MAX_ENEMIES = 64
+MAX_BULLETS = 32
+MAX_COINS = 256
+
+HEADER = np.dtype([
+    ('magic', 'u4'),
+    ('version', 'u4'),
+    ('seq', 'u8'),           # number of publishes so far; 0 before the first
+    ('slot_bytes', 'u4'),
+    ('max_enemies', 'u2'),
+    ('max_bullets', 'u2'),
+    ('max_coins', 'u2'),
+    ('pad', 'u1', 42),       # slots start 64 bytes in
+])
+PLAYER = np.dtype([('x', 'i4'), ('y', 'i4'), ('vel_x', 'f4'), ('vel_y', 'f4'),
+                   ('on_ground', '?'), ('facing_right', '?'), ('invuln', 'f4')])
+ENEMY = np.dtype([('x', 'i4'), ('y', 'i4'), ('w', 'i2'), ('h', 'i2'),
+                  ('health', 'i1'), ('facing_right', '?')])
+BULLET = np.dtype([('x', 'i4'), ('y', 'i4'), ('vel_x', 'f4')])
+COIN = np.dtype([('x', 'i4'), ('y', 'i4')])   # uncollected coins only
+SLOT = np.dtype([
+    ('tick', 'u8'),
+    ('time', 'f8'),
+    ('score', 'i4'),
+    ('lives', 'i4'),
+    ('level', 'i4'),
+    ('cam_x', 'i4'),
+    ('game_over', '?'),
+    ('level_completed', '?'),
+    ('player', PLAYER),
+    ('n_enemies', 'u2'),
+    ('n_bullets', 'u2'),
+    ('n_coins', 'u2'),
+    ('enemies', ENEMY, (MAX_ENEMIES,)),
+    ('bullets', BULLET, (MAX_BULLETS,)),
+    ('coins', COIN, (MAX_COINS,)),
+])
+SIZE = HEADER.itemsize + 2 * SLOT.itemsize
+
+# segments published by this process (see StateReader.__init__)
+_published = set()
+
+
+def _views(buf):
+    header = np.ndarray((), HEADER, buf)
+    slots = np.ndarray((2,), SLOT, buf, offset=HEADER.itemsize)
+    return header, slots
+
+
+class StatePublisher:
+    """Owns the segment and writes one slot per tick."""
+
+    def __init__(self, name=DEFAULT_NAME):
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=SIZE)
+        except FileExistsError:
+            # left behind by a game that didn't exit cleanly
+            stale = shared_memory.SharedMemory(name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name, create=True, size=SIZE)
+        self.name = name
+        _published.add(name)
+        self.header, self.slots = _views(self.shm.buf)
+        self.header[()] = (MAGIC, VERSION, 0, SLOT.itemsize, MAX_ENEMIES, MAX_BULLETS, MAX_COINS, 0)
+        self.seq = 0
+        # per slot: (index, version) of the pickups it last wrote; the coin
+        # table is rewritten only when they change
+        self._coins_key = [None, None]
+
+    def publish(self, sim, cam_x=0, tick=None):
+        seq = self.seq + 1
+        slot = self.slots[seq % 2]
+        p = sim.player
+        slot['tick'] = seq if tick is None else tick
+        slot['time'] = sim.time
+        slot['score'] = sim.score
+        slot['lives'] = sim.lives
+        slot['level'] = sim.current_level
+        slot['cam_x'] = cam_x
+        slot['game_over'] = sim.game_over
+        slot['level_completed'] = sim.level_completed
+        slot['player'] = (p.rect.x, p.rect.y, p.vel_x, p.vel_y, p.on_ground, p.facing_right, p.invuln_timer)
+
+        enemies = sim.enemies[:MAX_ENEMIES]
+        slot['n_enemies'] = len(enemies)
+        if enemies:
+            slot['enemies'][:len(enemies)] = [(e.rect.x, e.rect.y, e.rect.width, e.rect.height,
+                                               e.health, e.facing_right) for e in enemies]
+        bullets = sim.bullets[:MAX_BULLETS]
+        slot['n_bullets'] = len(bullets)
+        if bullets:
+            slot['bullets'][:len(bullets)] = [(b.rect.x, b.rect.y, b.vel_x) for b in bullets]
+
+        # coins change only on pickups and level edits; most ticks skip them
+        pickups = sim.pickups
+        last = self._coins_key[seq % 2]
+        if last is None or last[0] is not pickups or last[1] != pickups.version:
+            self._coins_key[seq % 2] = (pickups, pickups.version)
+            coins = list(pickups)[:MAX_COINS]
+            slot['n_coins'] = len(coins)
+            if coins:
+                slot['coins'][:len(coins)] = [c['pos'] for c in coins]
+
+        self.header['seq'] = seq
+        self.seq = seq
+
+    def close(self):
+        if self.shm is not None:
+            del self.header, self.slots
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+            _published.discard(self.name)
+
+
+class StateReader:
+    """Attaches to a publisher's segment; read() returns consistent copies of the newest tick."""
+
+    def __init__(self, name=DEFAULT_NAME):
+        try:
+            self.shm = shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            # before 3.13 every attach is tracked and the segment would be
+            # unlinked when this process exits; only the publisher owns it
+            # (and in the publisher's own process the one registration is its)
+            from multiprocessing import resource_tracker
+            self.shm = shared_memory.SharedMemory(name)
+            if name not in _published:
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.header, self.slots = _views(self.shm.buf)
+        if self.header['magic'] != MAGIC or self.header['version'] != VERSION:
+            self.close()
+            raise ValueError(f"{name} is not a game state segment (version {VERSION})")
+        self.header.flags.writeable = False
+        self.slots.flags.writeable = False
+        self.retries = 0
+
+    @property
+    def seq(self):
+        return int(self.header['seq'])
+
+    def read(self, out=None):
+        """Copy of the newest slot (into `out` if given), or None before the first tick."""
+        if out is None:
+            out = np.empty((), SLOT)
+        while True:
+            seq = self.seq
+            if seq == 0:
+                return None
+            out[()] = self.slots[seq % 2]
+            if self.seq == seq:
+                return out
+            self.retries += 1
+
+    def wait(self, seq, timeout=None):
+        """Poll until header seq moves past `seq`; returns the new seq (or `seq` on timeout)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.seq == seq:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.001)
+        return self.seq
+
+    def close(self):
+        if self.shm is not None:
+            del self.header, self.slots
+            self.shm.close()
+            self.shm = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the live game state published by main.py --publish")
+    parser.add_argument('name', nargs='?', default=DEFAULT_NAME, help="shared memory segment name")
+    parser.add_argument('--interval', type=float, default=0.5, help="seconds between lines")
+    args = parser.parse_args(argv)
+
+    try:
+        reader = StateReader(args.name)
+    except FileNotFoundError:
+        print(f"[state] no segment named {args.name}; start the game with --publish")
+        return 1
+    state = np.empty((), SLOT)
+    try:
+        while True:
+            if reader.read(state) is not None:
+                p = state['player']
+                print(f"[state] tick {state['tick']} level {state['level']} x {p['x']} y {p['y']} "
+                      f"score {state['score']} lives {state['lives']} enemies {state['n_enemies']} "
+                      f"bullets {state['n_bullets']} coins {state['n_coins']}")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
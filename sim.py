@@ -0,0 +1,297 @@
+import random
+import pygame
+from player import Player, MAX_FALL_SPEED, GRAVITY
+from enemy import Patroller
+from level import Level, TILE_SIZE
+from ai import AutoPlayer
+from pickups import PickupIndex
+from endless import EndlessLevel, is_endless
+
+# the castle stands this far left of the level's right edge
+CASTLE_MARGIN = 220
+# an endless level's castle: further than any run gets
+ENDLESS_CASTLE_X = 1 << 30
+
+# update() results
+RUNNING = None
+DEAD = 'dead'
+COMPLETED = 'completed'
+
+
+class Simulation:
+    """Game state and per-tick rules without any display, audio or frame limiter.
+
+    game_loop drives one of these for the real game; sweeps and training
+    environments step it directly as fast as the CPU allows.
+    """
+
+    def __init__(self, level_file, current_level=1, adaptive_ai=None, seed=None,
+                 screen_width=1280, screen_height=720, autoplayer=None):
+        self.level_file = level_file
+        self.current_level = current_level
+        self.adaptive_ai = adaptive_ai
+        # object with act(sim) -> (left, right, jump, shoot), e.g. lookahead.LookaheadPlayer;
+        # None uses the heuristic AutoPlayer
+        self.autoplayer = autoplayer
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.rng = random.Random(seed)
+        # Optional sounds; left as None when headless
+        self.sound_jump = None
+        self.sound_shoot = None
+        self.sound_coin = None
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        level = EndlessLevel(self.level_file) if is_endless(self.level_file) else Level(self.level_file)
+
+        # Fallback: synthesize a ground if no platforms
+        if not getattr(level, 'platforms', []):
+            tiles = max(30, self.screen_width // TILE_SIZE)
+            y = self.screen_height - TILE_SIZE
+            level.platforms = [pygame.Rect(x * TILE_SIZE, y, TILE_SIZE, TILE_SIZE) for x in range(tiles)]
+            level.width = tiles
+            level.height = max(1, getattr(level, 'height', 0))
+
+        self.level = level
+        # endless levels stream chunks as the player moves (see endless.py); copies
+        # that only plan on a shared level (lookahead.py) turn this off
+        self.streaming = isinstance(level, EndlessLevel)
+        self.player = Player(level.player_spawn, self.screen_height)
+        self.bullets = []
+        self.enemies = []
+        self.coins = []
+        self.score = 0
+        self.lives = 3
+        self.level_completed = False
+        self.game_over = False
+        self.time = 0.0
+        self.kills = 0
+        self.deaths = 0
+        self.coins_taken = 0
+        # (move, jump, shoot) the player applied on the last tick; Player.update clears its latches
+        self.last_action = (0, False, False)
+
+        self._place_castle()
+
+        self._spawn_enemies()
+
+        # coins (safe fallback)
+        for pos in getattr(level, 'coin_spawns', []):
+            self.coins.append(self._coin(pos))
+        # uncollected coins by x, for pickups and the AutoPlayer's nearest coin
+        self.pickups = PickupIndex(self.coins)
+
+    def apply_level_rows(self, rows):
+        """Patch an edited level grid into the running game (see hotreload.py).
+
+        Platforms, spawn lists and coins follow the new grid; the player, score,
+        collected coins elsewhere and live enemies are left as they are.
+        """
+        changes = self.level.apply_rows(rows)
+        for (x, y), (old, new) in changes.items():
+            pos = (x * TILE_SIZE, y * TILE_SIZE)
+            if old == 'C':
+                for coin in [c for c in self.coins if c['pos'] == pos]:
+                    self.pickups.remove(coin)
+                self.coins[:] = [c for c in self.coins if c['pos'] != pos]
+            if new == 'C':
+                coin = self._coin(pos)
+                self.coins.append(coin)
+                self.pickups.add(coin)
+        if changes:
+            self._place_castle()
+        return changes
+
+    def _place_castle(self):
+        # End-of-level castle sits near the far right; the trigger is slightly before it
+        if self.streaming:
+            self.castle_x = ENDLESS_CASTLE_X
+        else:
+            self.castle_x = max(60, self.level.width * TILE_SIZE - CASTLE_MARGIN)
+        self.end_trigger_x = self.castle_x - 20
+
+    @staticmethod
+    def _coin(pos):
+        return {'pos': pos, 'rect': pygame.Rect(pos[0], pos[1], TILE_SIZE, TILE_SIZE), 'taken': False}
+
+    def _stream(self):
+        level = self.level
+        width, first = level.width, level.first_column
+        if not level.stream(self.player.rect.centerx):
+            return
+        if level.first_column != first:
+            # the wall column and everything left of it are gone
+            cut = (level.first_column + 1) * TILE_SIZE
+            for coin in [c for c in self.coins if c['rect'].left < cut]:
+                self.pickups.remove(coin)
+            self.coins[:] = [c for c in self.coins if c['rect'].left >= cut]
+            self.enemies[:] = [e for e in self.enemies if e.rect.left >= cut]
+            self.bullets[:] = [b for b in self.bullets if b.rect.left >= cut]
+        new = width * TILE_SIZE
+        for pos in level.coin_spawns:
+            if pos[0] >= new:
+                coin = self._coin(pos)
+                self.coins.append(coin)
+                self.pickups.add(coin)
+        self._spawn_at([s for s in level.enemy_spawns if s[1][0] >= new])
+
+    def _enemy_params(self):
+        speed_scale = 1.0 + 0.15 * (self.current_level - 1)
+        params = (self.adaptive_ai.get_params() if self.adaptive_ai else {}).copy()
+        params['speed'] = int(60 * speed_scale)
+        return params
+
+    def _spawn_enemies(self):
+        level = self.level
+        self._spawn_at(getattr(level, 'enemy_spawns', []))
+        if self.streaming:
+            # generated chunks place their own enemies
+            return
+
+        # Extra enemies to make it livelier: sample platforms to place patrollers (scaled by difficulty)
+        try:
+            plats = [p[0] if isinstance(p, tuple) else p for p in getattr(level, 'platforms', [])]
+            plats = [r for r in plats if isinstance(r, pygame.Rect)]
+            self.rng.shuffle(plats)
+            extra = min(12, max(4, len(plats)//15 + (self.current_level - 1)))
+            for i in range(extra):
+                rect = plats[i % len(plats)]
+                self.enemies.append(Patroller((rect.x + 8, rect.top - 44), self._enemy_params()))
+        except Exception:
+            print('[warn] failed to add extra enemies')
+
+    def _spawn_at(self, spawns):
+        # enemies (support both typed (etype, pos) and legacy (x,y) formats)
+        for spawn in spawns:
+            try:
+                if isinstance(spawn, tuple) and len(spawn) == 2 and isinstance(spawn[0], str):
+                    etype, pos = spawn
+                else:
+                    etype, pos = 'P', spawn
+                # Force all enemies to be Patrollers (no chasing)
+                self.enemies.append(Patroller(pos, self._enemy_params()))
+            except Exception:
+                print(f"[warn] failed to spawn enemy {spawn}")
+
+    # --- input ---
+    def control(self, move_left, move_right, jump, shoot):
+        if not self.level_completed:
+            self.player.handle_input(move_left, move_right, jump, shoot,
+                                     self.bullets, self.sound_jump, self.sound_shoot)
+
+    def autopilot(self):
+        if self.level_completed:
+            return
+        if self.autoplayer is not None:
+            self.control(*self.autoplayer.act(self))
+        else:
+            AutoPlayer.control(self.player, self.level, self.enemies, self.pickups,
+                               self.bullets, self.sound_jump, self.sound_shoot)
+
+    # --- rules ---
+    def _lose_life(self):
+        self.lives -= 1
+        self.deaths += 1
+        self.player.invuln_timer = 1.2
+        if self.lives == 0:
+            self.game_over = True
+        else:
+            self.player.respawn(self.level.player_spawn)
+
+    def update(self, dt, cam_x=0):
+        """Advance one tick. Returns DEAD on game over, COMPLETED on the tick the
+        end trigger is reached, otherwise RUNNING."""
+        if self.game_over:
+            return DEAD
+        self.time += dt
+        if self.streaming:
+            self._stream()
+        player = self.player
+        level = self.level
+        self.last_action = (player.move_input, player.jump_held, player.shoot_held)
+
+        # Use only static level platforms for collisions, narrowed to the tiles
+        # the player can reach this tick
+        if not self.level_completed:
+            reach = int((abs(player.vel_x) + max(MAX_FALL_SPEED, abs(player.vel_y) + GRAVITY * dt)) * dt) + 1
+            player.update(level.platforms_in(player.rect.inflate(2 * reach, 2 * reach)), dt)
+
+        # bullets
+        enemies = self.enemies
+        bullets = self.bullets
+        for bullet in bullets[:]:
+            start = bullet.rect.copy()
+            reach = int(abs(bullet.vel_x) * dt) + 1
+            bullet.update(dt, level.platforms_in(start.inflate(2 * reach, 0)))
+            # test the whole swept path so fast bullets can't skip over enemies
+            path = start.union(bullet.rect)
+            for enemy in enemies:
+                if path.colliderect(enemy.rect):
+                    enemy.health -= 1
+                    enemy.hit_timer = 0.12
+                    if bullet in bullets:
+                        bullets.remove(bullet)
+                    if enemy.health <= 0:
+                        self.score += 100
+                        self.kills += 1
+                        if enemy in enemies:
+                            enemies.remove(enemy)
+                        break
+            if bullet.lifetime <= 0 and bullet in bullets:
+                bullets.remove(bullet)
+
+        # enemies
+        for enemy in enemies[:]:
+            if not self.level_completed:
+                reach = int(enemy.speed * dt) + 2
+                enemy.update(level.platforms_in(enemy.rect.inflate(2 * reach, 24)), player, dt, cam_x)
+            if enemy.rect.colliderect(player.rect) and getattr(player, 'invuln_timer', 0) <= 0:
+                if self.sound_coin:
+                    self.sound_coin.play()
+                self._lose_life()
+                if self.game_over:
+                    return DEAD
+            if enemy.rect.top > self.screen_height:
+                if enemy in enemies:
+                    enemies.remove(enemy)
+
+        # coins
+        for coin in self.pickups.overlapping(player.rect):
+            self.pickups.take(coin)
+            self.score += 10
+            self.coins_taken += 1
+            if self.sound_coin:
+                self.sound_coin.play()
+
+        # AI bookkeeping
+        if self.adaptive_ai:
+            try:
+                self.adaptive_ai.track_score(self.score)
+                self.adaptive_ai.update_enemies(enemies)
+            except Exception:
+                print("[warn] adaptive_ai threw during update; continuing")
+
+        # Trigger end scene (castle + flag) slightly before absolute level end
+        status = RUNNING
+        if not self.level_completed and player.rect.right >= self.end_trigger_x:
+            self.level_completed = True
+            status = COMPLETED
+
+        # fall death
+        if player.rect.top > self.screen_height + 120:
+            if getattr(player, 'invuln_timer', 0) <= 0:
+                self._lose_life()
+                if self.game_over:
+                    return DEAD
+        return status
+
+    def step(self, dt, action=None):
+        """Apply input then update; action is (left, right, jump, shoot) or None for AutoPlayer."""
+        if action is None:
+            self.autopilot()
+        else:
+            self.control(*action)
+        return self.update(dt)
@@ -0,0 +1,278 @@
+"""Game-state snapshots and a bounded rewind buffer.
+
+A snapshot is a flat binary record (little-endian):
+
+    header   magic b'AMSN', version u16, flags u16, level ref length u32,
+             level u32, enemies u32, bullets u32, coins u32, score samples u32,
+             rngs u32, extras u32
+    ref      level file reference, UTF-8
+    fixed    float64 array: simulation fields, player, coin flags, AdaptiveAI
+             params, RNG gauss state, extras
+    words    uint32 array: Mersenne Twister state of each RNG
+    tail     float64 array: enemies, bullets, AdaptiveAI score samples
+
+Sections whose length varies during play come last, so consecutive ticks
+line up byte for byte up to the tail.
+
+The level grid itself is not stored; it is reloaded from the reference.
+`extras` carries whatever the caller keeps outside the Simulation (camera,
+end scene, decorations) as plain numbers.
+
+RewindBuffer keeps one snapshot per tick: a zlib keyframe every
+`keyframe_every` ticks and zlib(XOR with the previous tick) in between, which
+is mostly zero bytes and compresses to a few hundred bytes.
+"""
+import struct
+import zlib
+from array import array
+from collections import deque
+from bullet import Bullet
+from enemy import Patroller
+from physics import get_pos, set_pos
+
+MAGIC = b'AMSN'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIIIIIII')
+FLAG_AI = 1
+MT_WORDS = 625
+
+# (attribute, kind): 'f' float, 'i' int, 'b' bool
+SIM_FIELDS = (('score', 'i'), ('lives', 'i'), ('kills', 'i'), ('deaths', 'i'),
+              ('coins_taken', 'i'), ('time', 'f'), ('level_completed', 'b'),
+              ('game_over', 'b'), ('castle_x', 'i'), ('end_trigger_x', 'i'))
+PLAYER_FIELDS = (('vel_x', 'f'), ('vel_y', 'f'), ('on_ground', 'b'), ('jumping', 'b'),
+                 ('jump_timer', 'f'), ('facing_right', 'b'), ('shoot_cooldown', 'f'),
+                 ('invuln_timer', 'f'), ('move_input', 'i'), ('jump_held', 'b'))
+ENEMY_FIELDS = (('health', 'i'), ('facing_right', 'b'), ('speed', 'f'),
+                ('detection_range', 'f'), ('hit_timer', 'f'), ('dir', 'i'))
+BULLET_FIELDS = (('vel_x', 'f'), ('lifetime', 'f'), ('last_camera_x', 'f'))
+
+_CAST = {'f': float, 'i': int, 'b': bool}
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _put(values, obj, fields):
+    for name, _ in fields:
+        values.append(getattr(obj, name))
+
+
+def _put_entity(values, entity, fields):
+    values.extend(get_pos(entity))
+    _put(values, entity, fields)
+
+
+def _take(values, i, obj, fields):
+    for name, kind in fields:
+        setattr(obj, name, _CAST[kind](values[i]))
+        i += 1
+    return i
+
+
+def _take_entity(values, i, entity, fields):
+    set_pos(entity, values[i], values[i + 1])
+    return _take(values, i + 2, entity, fields)
+
+
+def capture(sim, extras=(), rngs=()):
+    """Snapshot a Simulation; rngs are extra random.Random-like objects (e.g. the random module)."""
+    values = array('d')
+    _put(values, sim, SIM_FIELDS)
+    _put_entity(values, sim.player, PLAYER_FIELDS)
+    values.extend([1.0 if coin['taken'] else 0.0 for coin in sim.coins])
+    ai = sim.adaptive_ai
+    if ai:
+        values.extend((ai.params['speed'], ai.params['detection_range']))
+    words = array('I')
+    all_rngs = (sim.rng,) + tuple(rngs)
+    for rng in all_rngs:
+        _, state, gauss = rng.getstate()
+        words.extend(state)
+        values.extend((0.0, 0.0) if gauss is None else (1.0, gauss))
+    values.extend(extras)
+
+    tail = array('d')
+    for enemy in sim.enemies:
+        _put_entity(tail, enemy, ENEMY_FIELDS)
+    for bullet in sim.bullets:
+        _put_entity(tail, bullet, BULLET_FIELDS)
+    samples = ai.score_samples if ai else ()
+    tail.extend(samples)
+
+    ref = sim.level_file.encode('utf-8')
+    header = HEADER.pack(MAGIC, VERSION, FLAG_AI if ai else 0, len(ref), sim.current_level,
+                         len(sim.enemies), len(sim.bullets), len(sim.coins), len(samples),
+                         len(all_rngs), len(extras))
+    return b''.join((header, ref, values.tobytes(), words.tobytes(), tail.tobytes()))
+
+
+def _header(data):
+    if len(data) < HEADER.size:
+        raise SnapshotError("truncated snapshot")
+    fields = HEADER.unpack_from(data, 0)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        raise SnapshotError("not a snapshot (or unsupported version)")
+    return fields[2:]
+
+
+def snapshot_level(data):
+    """(level file reference, level number) a snapshot was taken on."""
+    _, ref_len, level_no = _header(data)[:3]
+    return data[HEADER.size:HEADER.size + ref_len].decode('utf-8'), level_no
+
+
+def restore(sim, data, rngs=()):
+    """Load a snapshot into sim (same level) and return its extras as a list of floats.
+
+    The player object, enemy/bullet lists and coin dicts are updated in place,
+    so aliases held by the caller stay valid.
+    """
+    flags, ref_len, _, n_enemies, n_bullets, n_coins, n_samples, n_rngs, n_extras = _header(data)
+    ref = data[HEADER.size:HEADER.size + ref_len].decode('utf-8')
+    if ref != sim.level_file:
+        raise SnapshotError(f"snapshot is for {ref}, simulation has {sim.level_file}")
+    if n_coins != len(sim.coins):
+        raise SnapshotError("coin layout differs from the loaded level")
+    if n_rngs != 1 + len(rngs):
+        raise SnapshotError(f"snapshot holds {n_rngs} RNG states, {1 + len(rngs)} given")
+    has_ai = bool(flags & FLAG_AI)
+    n_fixed = (len(SIM_FIELDS) + 2 + len(PLAYER_FIELDS) + n_coins + (2 if has_ai else 0)
+               + 2 * n_rngs + n_extras)
+    n_tail = (n_enemies * (2 + len(ENEMY_FIELDS)) + n_bullets * (2 + len(BULLET_FIELDS))
+              + (n_samples if has_ai else 0))
+    offset = HEADER.size + ref_len
+    values, words, tail = array('d'), array('I'), array('d')
+    values.frombytes(data[offset:offset + 8 * n_fixed])
+    offset += 8 * n_fixed
+    words.frombytes(data[offset:offset + 4 * MT_WORDS * n_rngs])
+    offset += 4 * MT_WORDS * n_rngs
+    tail.frombytes(data[offset:offset + 8 * n_tail])
+    if len(values) != n_fixed or len(words) != MT_WORDS * n_rngs or len(tail) != n_tail:
+        raise SnapshotError("truncated snapshot")
+
+    i = _take(values, 0, sim, SIM_FIELDS)
+    i = _take_entity(values, i, sim.player, PLAYER_FIELDS)
+    for coin in sim.coins:
+        coin['taken'] = values[i] != 0.0
+        i += 1
+    sim.pickups.refresh()
+    ai = sim.adaptive_ai
+    if has_ai:
+        if ai:
+            ai.params['speed'], ai.params['detection_range'] = values[i], values[i + 1]
+        i += 2
+    for k, rng in enumerate((sim.rng,) + tuple(rngs)):
+        has_gauss, gauss = values[i], values[i + 1]
+        i += 2
+        state = tuple(words[k * MT_WORDS:(k + 1) * MT_WORDS])
+        rng.setstate((3, state, gauss if has_gauss else None))
+    extras = list(values[i:i + n_extras])
+
+    j = 0
+    enemies = []
+    for _ in range(n_enemies):
+        enemy = Patroller((0, 0), {})
+        j = _take_entity(tail, j, enemy, ENEMY_FIELDS)
+        enemies.append(enemy)
+    sim.enemies[:] = enemies
+    bullets = []
+    for _ in range(n_bullets):
+        bullet = Bullet((0, 0), True)
+        j = _take_entity(tail, j, bullet, BULLET_FIELDS)
+        bullets.append(bullet)
+    sim.bullets[:] = bullets
+    if has_ai and ai:
+        ai.score_samples = [int(v) for v in tail[j:j + n_samples]]
+    return extras
+
+
+def _xor(prev, cur):
+    """prev XOR cur, with prev cut or zero-padded to len(cur); also undoes itself that way."""
+    n = len(cur)
+    a = int.from_bytes(prev[:n], 'little')
+    return (a ^ int.from_bytes(cur, 'little')).to_bytes(n, 'little')
+
+
+_KEY, _DELTA = 0, 1
+
+
+class RewindBuffer:
+    """Per-tick snapshot history bounded by duration and by compressed size.
+
+    Ticks are grouped behind a keyframe; whole groups are dropped from the
+    old end once the rest still covers `seconds`, or while over `max_bytes`.
+    """
+
+    def __init__(self, seconds=30.0, hz=60, keyframe_every=60, max_bytes=8 << 20, level=1):
+        self.max_ticks = int(seconds * hz)
+        self.keyframe_every = keyframe_every
+        self.max_bytes = max_bytes
+        self.level = level
+        self._groups = deque()
+        self._ticks = 0
+        self.nbytes = 0
+        self._last = None
+
+    def __len__(self):
+        return self._ticks
+
+    def push(self, snap):
+        group = self._groups[-1] if self._groups else None
+        if group is None or len(group) >= self.keyframe_every:
+            entry = (_KEY, zlib.compress(snap, self.level))
+            self._groups.append([entry])
+        else:
+            entry = (_DELTA, zlib.compress(_xor(self._last, snap), self.level))
+            group.append(entry)
+        self._last = snap
+        self._ticks += 1
+        self.nbytes += len(entry[1])
+        self._evict()
+
+    def _evict(self):
+        groups = self._groups
+        while len(groups) > 1 and (self._ticks - len(groups[0]) >= self.max_ticks
+                                   or self.nbytes > self.max_bytes):
+            dropped = groups.popleft()
+            self._ticks -= len(dropped)
+            self.nbytes -= sum(len(blob) for _, blob in dropped)
+
+    def _decode(self, group, upto):
+        snap = zlib.decompress(group[0][1])
+        for _, blob in group[1:upto + 1]:
+            snap = _xor(snap, zlib.decompress(blob))
+        return snap
+
+    def get(self, back=0):
+        """Snapshot from `back` ticks before the newest, or None if not held."""
+        if back < 0 or back >= self._ticks:
+            return None
+        for group in reversed(self._groups):
+            if back < len(group):
+                return self._decode(group, len(group) - 1 - back)
+            back -= len(group)
+        return None
+
+    def rewind(self, ticks=1):
+        """Drop the newest `ticks` snapshots and return the one now newest (None if empty).
+
+        Pushing after a rewind continues the history from that point.
+        """
+        ticks = min(ticks, self._ticks - 1)
+        for _ in range(max(ticks, 0)):
+            group = self._groups[-1]
+            _, blob = group.pop()
+            self.nbytes -= len(blob)
+            self._ticks -= 1
+            if not group:
+                self._groups.pop()
+        self._last = self.get(0)
+        return self._last
+
+    def clear(self):
+        self._groups.clear()
+        self._ticks = 0
+        self.nbytes = 0
+        self._last = None
@@ -0,0 +1,185 @@
+"""Parameter sweep over AdaptiveAI difficulty tuning using headless AutoPlayer runs.
+
+Each configuration plays a fixed set of seeded episodes in a worker process.
+Finished configurations are cached as JSON under the cache directory, keyed by
+a hash of the configuration, so re-running an interrupted sweep only plays the
+configurations that are missing.
+
+    python sweep.py --param score_threshold=300,500,800 --param speed_step=0.06,0.12,0.24
+    python sweep.py --samples 40 --param speed_step=0.05:0.4 --param range_cap=200:400
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ai import AdaptiveAI, DEFAULT_TUNING
+from sim import Simulation, DEAD, COMPLETED
+
+DEFAULT_LEVEL = os.path.join('data', 'level1.csv')
+DEFAULT_CACHE_DIR = os.path.join('data', 'sweeps')
+SORT_KEYS = ('completion', 'score', 'survival')
+
+
+def parse_space(specs):
+    """Parse 'name=a,b,c' (choices) and 'name=lo:hi' (uniform range) specs."""
+    space = {}
+    for spec in specs:
+        name, sep, values = spec.partition('=')
+        name = name.strip()
+        if not sep or name not in DEFAULT_TUNING:
+            raise ValueError(f"bad --param {spec!r}; expected one of {', '.join(DEFAULT_TUNING)}")
+        if ':' in values:
+            lo, hi = (float(v) for v in values.split(':', 1))
+            space[name] = (lo, hi)
+        else:
+            space[name] = [float(v) for v in values.split(',') if v.strip()]
+    return space
+
+
+def grid_configs(space):
+    for name, values in space.items():
+        if isinstance(values, tuple):
+            raise ValueError(f"range given for {name}; use --samples for random search")
+    names = list(space)
+    for combo in itertools.product(*(space[n] for n in names)):
+        yield dict(DEFAULT_TUNING, **dict(zip(names, combo)))
+
+
+def random_configs(space, samples, seed):
+    rng = random.Random(seed)
+    for _ in range(samples):
+        config = dict(DEFAULT_TUNING)
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                config[name] = round(rng.uniform(*values), 4)
+            else:
+                config[name] = rng.choice(values)
+        yield config
+
+
+def config_key(config, job):
+    """Stable hash of a tuning config plus everything else that affects its results."""
+    payload = json.dumps({'tuning': config, 'job': job}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def run_episode(sim, max_time, dt):
+    """Play one AutoPlayer episode; returns (completed, score, survival_seconds)."""
+    while sim.time < max_time:
+        status = sim.step(dt)
+        if status == COMPLETED:
+            return True, sim.score, sim.time
+        if status == DEAD:
+            return False, sim.score, sim.time
+    return False, sim.score, sim.time
+
+
+def evaluate(config, job):
+    """Run job['episodes'] seeded episodes sharing one AdaptiveAI, like consecutive games."""
+    ai = AdaptiveAI(None, **config)
+    sim = Simulation(job['level'], adaptive_ai=ai, seed=job['seed'])
+    episodes = []
+    for i in range(job['episodes']):
+        sim.reset(seed=job['seed'] + i)
+        completed, score, survival = run_episode(sim, job['max_time'], 1.0 / job['hz'])
+        episodes.append({'completed': completed, 'score': score, 'survival': round(survival, 3),
+                         'enemy_speed': round(ai.params['speed'], 3),
+                         'enemy_range': round(ai.params['detection_range'], 3)})
+    n = len(episodes)
+    return {
+        'tuning': config,
+        'job': job,
+        'completion': sum(e['completed'] for e in episodes) / n,
+        'score': sum(e['score'] for e in episodes) / n,
+        'survival': sum(e['survival'] for e in episodes) / n,
+        'episodes': episodes,
+    }
+
+
+def _evaluate_to_cache(config, job, path):
+    result = evaluate(config, job)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(result, f)
+    os.replace(tmp, path)
+    return result
+
+
+def run_sweep(configs, job, cache_dir=DEFAULT_CACHE_DIR, workers=None, log=print):
+    """Evaluate configs in a process pool, reusing cached results; returns all results."""
+    os.makedirs(cache_dir, exist_ok=True)
+    results = []
+    pending = {}
+    for config in configs:
+        path = os.path.join(cache_dir, config_key(config, job) + '.json')
+        if path in pending:
+            continue
+        if os.path.exists(path):
+            with open(path) as f:
+                results.append(json.load(f))
+        else:
+            pending[path] = config
+    log(f"[sweep] {len(results)} cached, {len(pending)} to run")
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_evaluate_to_cache, config, job, path): config
+                       for path, config in pending.items()}
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results.append(result)
+                log(f"[sweep] {done}/{len(pending)} completion={result['completion']:.2f} "
+                    f"score={result['score']:.0f}")
+    return results
+
+
+def rank(results, sort_key='completion'):
+    order = (sort_key,) + tuple(k for k in SORT_KEYS if k != sort_key)
+    return sorted(results, key=lambda r: tuple(r[k] for k in order), reverse=True)
+
+
+def format_table(results):
+    names = list(DEFAULT_TUNING)
+    header = ['rank', 'complete', 'score', 'survival'] + names
+    rows = [header]
+    for i, r in enumerate(results, 1):
+        rows.append([str(i), f"{r['completion'] * 100:.0f}%", f"{r['score']:.0f}",
+                     f"{r['survival']:.1f}s"] + [f"{r['tuning'][n]:g}" for n in names])
+    widths = [max(len(row[c]) for row in rows) for c in range(len(header))]
+    return '\n'.join('  '.join(cell.rjust(w) for cell, w in zip(row, widths)) for row in rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=SPEC',
+                        help="a,b,c for a grid/choice or lo:hi for a random range")
+    parser.add_argument('--samples', type=int, default=0, help="random search with N samples instead of a grid")
+    parser.add_argument('--episodes', type=int, default=5)
+    parser.add_argument('--max-time', type=float, default=180.0, help="simulated seconds per episode")
+    parser.add_argument('--hz', type=float, default=60.0, help="simulation rate")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--level', default=DEFAULT_LEVEL)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--sort', choices=SORT_KEYS, default='completion')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    space = parse_space(args.param)
+    if args.samples:
+        configs = list(random_configs(space, args.samples, args.seed))
+    else:
+        configs = list(grid_configs(space))
+    job = {'level': args.level, 'episodes': args.episodes, 'max_time': args.max_time,
+           'hz': args.hz, 'seed': args.seed}
+    results = run_sweep(configs, job, args.cache_dir, args.workers)
+    print(format_table(rank(results, args.sort)[:args.top]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
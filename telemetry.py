@@ -0,0 +1,237 @@
+"""Opt-in performance telemetry written as JSONL by a background thread.
+
+Two record types are produced:
+
+    {"type": "second", ...}   once per wall-clock second: frame-time percentiles
+                              and histogram, sim steps/s, entity counts, GC
+                              collections and pause times, RSS, AdaptiveAI params
+    {"type": "episode", ...}  once per game: outcome, score, duration, level
+                              load time, AdaptiveAI params
+
+The game thread only appends dicts to a queue; serialization and disk writes
+happen on the writer thread.
+"""
+import gc
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+# Frame-time histogram bucket upper edges in milliseconds (last bucket is open)
+FRAME_BUCKETS_MS = (4, 8, 12, 16.7, 20, 25, 33.4, 50, 100)
+
+
+def current_rss_bytes():
+    """Resident set size of this process, or None if the platform offers no cheap way."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # peak, not current: kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+class GCMonitor:
+    """Counts collections and times GC pauses per generation via gc.callbacks."""
+
+    def __init__(self):
+        self._start = None
+        self.reset()
+        gc.callbacks.append(self._callback)
+
+    def reset(self):
+        self.collections = [0, 0, 0]
+        self.pause_total = 0.0
+        self.pause_max = 0.0
+
+    def _callback(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            pause = time.perf_counter() - self._start
+            self._start = None
+            self.collections[info.get('generation', 0)] += 1
+            self.pause_total += pause
+            self.pause_max = max(self.pause_max, pause)
+
+    def take(self):
+        """Return and clear the counts accumulated since the last call."""
+        snap = {'collections': list(self.collections),
+                'pause_ms_total': round(self.pause_total * 1000, 3),
+                'pause_ms_max': round(self.pause_max * 1000, 3)}
+        self.reset()
+        return snap
+
+    def close(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+
+_STOP = object()
+
+
+class TelemetrySink:
+    """Buffered JSONL writer; emit() never blocks on disk."""
+
+    def __init__(self, path, flush_interval=1.0, max_queue=10000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(max_queue)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='telemetry-writer', daemon=True)
+        self._thread.start()
+
+    def emit(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        pending = []
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                record = None
+            if record is not None and record is not _STOP:
+                pending.append(json.dumps(record, separators=(',', ':')))
+            now = time.monotonic()
+            if pending and (record is _STOP or now >= next_flush or len(pending) >= 256):
+                self._file.write('\n'.join(pending) + '\n')
+                self._file.flush()
+                pending = []
+                next_flush = now + self.flush_interval
+            if record is _STOP:
+                return
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5.0)
+        self._file.close()
+
+
+class Telemetry:
+    """Aggregates per-frame measurements into per-second and per-episode records."""
+
+    def __init__(self, sink, clock=time.perf_counter):
+        self.sink = sink
+        self.clock = clock
+        self.gc = GCMonitor()
+        self._frame_times = []
+        self._steps = 0
+        self._window_start = clock()
+        self._episode_start = clock()
+        self._episode_frames = 0
+        self.level_load_ms = 0.0
+        self._scheduler = None
+
+    def start_episode(self, level_load_ms=0.0):
+        self.level_load_ms = level_load_ms
+        self._episode_start = self.clock()
+        self._episode_frames = 0
+
+    def frame(self, frame_seconds, sim, adaptive_ai=None, steps=1, scheduler=None):
+        """Record one rendered frame that ran `steps` simulation steps.
+
+        With a framesched.FrameScheduler, its skipped-frame and shedding
+        counters go into each per-second record.
+        """
+        self._scheduler = scheduler
+        self._frame_times.append(frame_seconds * 1000.0)
+        self._steps += steps
+        self._episode_frames += 1
+        now = self.clock()
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self._emit_second(now, elapsed, sim, adaptive_ai)
+
+    def _emit_second(self, now, elapsed, sim, adaptive_ai):
+        times = sorted(self._frame_times)
+        hist = [0] * (len(FRAME_BUCKETS_MS) + 1)
+        for ms in times:
+            i = 0
+            while i < len(FRAME_BUCKETS_MS) and ms > FRAME_BUCKETS_MS[i]:
+                i += 1
+            hist[i] += 1
+        record = {
+            'type': 'second',
+            'ts': time.time(),
+            'frames': len(times),
+            'fps': round(len(times) / elapsed, 2),
+            'frame_ms': {'p50': round(percentile(times, 50), 3),
+                         'p95': round(percentile(times, 95), 3),
+                         'p99': round(percentile(times, 99), 3),
+                         'max': round(times[-1], 3) if times else 0.0},
+            'frame_hist': {'edges_ms': FRAME_BUCKETS_MS, 'counts': hist},
+            'sim_steps_per_sec': round(self._steps / elapsed, 2),
+            'entities': self._entities(sim),
+            'gc': self.gc.take(),
+            'rss_bytes': current_rss_bytes(),
+            'ai': _ai_params(adaptive_ai),
+        }
+        if self._scheduler:
+            record['sched'] = self._scheduler.take()
+        if self.sink.dropped:
+            record['dropped_records'] = self.sink.dropped
+        self.sink.emit(record)
+        self._frame_times = []
+        self._steps = 0
+        self._window_start = now
+
+    @staticmethod
+    def _entities(sim):
+        if sim is None:
+            return {}
+        return {'enemies': len(sim.enemies), 'bullets': len(sim.bullets),
+                'coins_left': len(sim.pickups),
+                'platforms': len(sim.level.platforms)}
+
+    def end_episode(self, outcome, sim, adaptive_ai=None, level=None):
+        self.sink.emit({
+            'type': 'episode',
+            'ts': time.time(),
+            'outcome': outcome,
+            'level': level,
+            'score': sim.score if sim else None,
+            'lives': sim.lives if sim else None,
+            'deaths': sim.deaths if sim else None,
+            'kills': sim.kills if sim else None,
+            'coins': sim.coins_taken if sim else None,
+            'sim_time': round(sim.time, 3) if sim else None,
+            'wall_time': round(self.clock() - self._episode_start, 3),
+            'frames': self._episode_frames,
+            'level_load_ms': round(self.level_load_ms, 3),
+            'ai': _ai_params(adaptive_ai),
+        })
+
+    def close(self):
+        self.gc.close()
+        self.sink.close()
+
+
+def _ai_params(adaptive_ai):
+    if not adaptive_ai:
+        return None
+    return {k: round(v, 4) if isinstance(v, float) else v for k, v in adaptive_ai.get_params().items()}
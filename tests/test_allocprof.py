@@ -0,0 +1,44 @@
+# File: tests/test_allocprof.py
+import unittest
+from allocprof import AllocTracker, AllocationBudgetExceeded
+
+class TestAllocTracker(unittest.TestCase):
+    def test_growth_attributed_to_line(self):
+        kept = []
+        tracker = AllocTracker(retained_budget=1 << 20)
+        tracker.start()
+        try:
+            for _ in range(20):
+                kept.append(bytearray(4096))
+                tracker.frame()
+        finally:
+            tracker.stop()
+        self.assertEqual(tracker.frames, 20)
+        self.assertGreaterEqual(tracker.retained_per_frame(), 4096)
+        fn, _, size, count = tracker.top_lines(1)[0]
+        self.assertTrue(fn.endswith('test_allocprof.py'))
+        self.assertGreaterEqual(size, 4096)
+        tracker.check_budget()
+        with self.assertRaises(AllocationBudgetExceeded):
+            tracker.check_budget(retained=1024)
+
+    def test_temporaries_count_toward_peak_only(self):
+        tracker = AllocTracker(peak_budget=1 << 20, retained_budget=1024)
+        tracker.start()
+        try:
+            for _ in range(20):
+                # freed before the frame ends: invisible to snapshots
+                scratch = [bytearray(4096) for _ in range(8)]
+                del scratch
+                tracker.frame()
+        finally:
+            tracker.stop()
+        self.assertGreaterEqual(tracker.peak_per_frame(), 8 * 4096)
+        self.assertLess(tracker.retained_per_frame(), 1024)
+        tracker.check_budget()
+        with self.assertRaises(AllocationBudgetExceeded) as caught:
+            tracker.check_budget(peak=4096)
+        self.assertIn('peak', str(caught.exception).splitlines()[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# File: tests/test_endless.py
+import unittest
+import pygame
+from endless import (EndlessLevel, generate_chunk, endless_ref, is_endless,
+                     ROWS, CHUNK_COLUMNS, AHEAD_COLUMNS, BEHIND_COLUMNS)
+from level import TILE_SIZE
+from sim import Simulation
+
+class TestEndless(unittest.TestCase):
+    def test_chunks_are_seeded(self):
+        self.assertEqual(generate_chunk('4', 9), generate_chunk('4', 9))
+        self.assertNotEqual([generate_chunk('4', n) for n in range(1, 6)],
+                            [generate_chunk('5', n) for n in range(1, 6)])
+        for column in generate_chunk('4', 3):
+            self.assertEqual(len(column), ROWS)
+            self.assertEqual(column[-1], '#')
+        self.assertTrue(is_endless(endless_ref(4)))
+        self.assertFalse(is_endless('data/level1.csv'))
+
+    def test_stream_keeps_a_bounded_window(self):
+        lvl = EndlessLevel(endless_ref(2))
+        self.assertEqual(lvl.width, 3 * CHUNK_COLUMNS)
+        x = 0
+        for _ in range(400):
+            x += 5 * TILE_SIZE
+            lvl.stream(x)
+            column = x // TILE_SIZE
+            self.assertGreaterEqual(lvl.width, column + AHEAD_COLUMNS)
+            self.assertLessEqual(column - lvl.first_column, BEHIND_COLUMNS + CHUNK_COLUMNS)
+            self.assertEqual(len(lvl.columns), lvl.width - lvl.first_column)
+            self.assertLessEqual(len(lvl.platforms), len(lvl.columns) * ROWS)
+            live = pygame.Rect(lvl.first_column * TILE_SIZE, 0, len(lvl.columns) * TILE_SIZE, ROWS * TILE_SIZE)
+            self.assertEqual(len(lvl.platforms_in(live)), len(lvl.platforms))
+            self.assertLessEqual(len(lvl._index), len(lvl.platforms))
+            self.assertTrue(all(p[0].left >= lvl.first_column * TILE_SIZE for p in lvl.platforms))
+        # the first live column is a wall
+        self.assertEqual(lvl.columns[0], '#' * ROWS)
+        self.assertEqual(lvl.terrain.solid[0], (1 << ROWS) - 1)
+        self.assertIsNotNone(lvl.terrain.floor_at(x // TILE_SIZE))
+
+    def test_simulation_drops_entities_behind(self):
+        sim = Simulation(endless_ref(1), seed=0)
+        for _ in range(300):
+            sim.player.rect.x += 4 * TILE_SIZE
+            sim.player.rect.bottom = (ROWS - 1) * TILE_SIZE
+            sim.player.vel_y = 0
+            sim.update(1 / 60)
+        left = sim.level.first_column * TILE_SIZE
+        self.assertGreater(left, 500 * TILE_SIZE)
+        self.assertTrue(all(e.rect.right > left for e in sim.enemies))
+        self.assertTrue(all(c['rect'].left >= left for c in sim.coins))
+        self.assertLess(len(sim.coins), 10 * CHUNK_COLUMNS)
+        self.assertEqual(len(sim.pickups), sum(1 for c in sim.coins if not c['taken']))
+
+if __name__ == '__main__':
+    unittest.main()
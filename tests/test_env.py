@@ -0,0 +1,20 @@
+# File: tests/test_env.py
+import unittest
+from env import MarioEnv
+
+class TestMarioEnv(unittest.TestCase):
+    def test_reset_and_step(self):
+        env = MarioEnv(max_steps=50)
+        obs = env.reset(seed=1)
+        self.assertEqual(obs, env.reset(seed=1))
+        done = False
+        steps = 0
+        while not done:
+            obs, reward, done, info = env.step(2)
+            steps += 1
+        self.assertEqual(steps, 50)
+        self.assertTrue(info['truncated'])
+        self.assertIsInstance(reward, float)
+
+if __name__ == '__main__':
+    unittest.main()
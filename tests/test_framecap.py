@@ -0,0 +1,72 @@
+# File: tests/test_framecap.py
+import unittest
+import os
+import io
+import tempfile
+import pygame
+from framecap import FrameCapture, encode_png
+
+def frame(color, size=(40, 30)):
+    surf = pygame.Surface(size, 0, 32)
+    surf.fill(color)
+    surf.fill((255, 255, 255), pygame.Rect(3, 4, 5, 6))
+    return surf
+
+class TestFrameCapture(unittest.TestCase):
+    def test_encode_png_round_trip(self):
+        surf = frame((10, 120, 250))
+        data = encode_png(surf.get_view('0').raw, surf.get_size(), surf.get_pitch(),
+                          tuple((m.bit_length() - 1) // 8 for m in surf.get_masks()[:3]))
+        img = pygame.image.load(io.BytesIO(data), 'x.png')
+        self.assertEqual(img.get_size(), (40, 30))
+        self.assertEqual(img.get_at((0, 0))[:3], (10, 120, 250))
+        self.assertEqual(img.get_at((4, 5))[:3], (255, 255, 255))
+
+    def test_writes_every_nth_frame(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cap = FrameCapture(tmp, every=2)
+            for tick in range(5):
+                cap.grab(frame((tick * 40, 0, 0)), tick)
+            cap.close()
+            self.assertEqual(sorted(os.listdir(tmp)),
+                             ['frame-00000000.png', 'frame-00000002.png', 'frame-00000004.png'])
+            img = pygame.image.load(os.path.join(tmp, 'frame-00000004.png'))
+            self.assertEqual(img.get_at((0, 0))[:3], (160, 0, 0))
+            self.assertEqual((cap.grabbed, cap.written, cap.dropped), (3, 3, 0))
+
+    def test_keep_last_ring_is_written_on_dump(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cap = FrameCapture(tmp, keep_last=3)
+            for tick in range(10):
+                cap.grab(frame((0, tick * 20, 0)), tick)
+                if tick < 8:
+                    cap.wait()
+            # 8 and 9 may still be encoding; they follow the dump
+            directory = cap.dump('death')
+            self.assertIsNone(cap.dump('death'))   # nothing kept since
+            cap.wait()
+            self.assertEqual(sorted(os.listdir(tmp)), ['death-001'])
+            cap.grab(frame((0, 0, 0)), 10)
+            cap.close()
+            self.assertEqual(directory, os.path.join(tmp, 'death-001'))
+            self.assertEqual(sorted(os.listdir(directory)),
+                             ['frame-00000007.png', 'frame-00000008.png', 'frame-00000009.png'])
+            img = pygame.image.load(os.path.join(directory, 'frame-00000009.png'))
+            self.assertEqual(img.get_at((0, 0))[:3], (0, 180, 0))
+            self.assertEqual((cap.written, cap.dropped), (3, 0))
+
+    def test_ring_is_capped_by_bytes(self):
+        surf = frame((0, 0, 0))
+        png = encode_png(surf.get_view('0').raw, surf.get_size(), surf.get_pitch(),
+                         tuple((m.bit_length() - 1) // 8 for m in surf.get_masks()[:3]), 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            cap = FrameCapture(tmp, keep_last=10, max_bytes=2 * len(png) + 1)
+            for tick in range(6):
+                cap.grab(frame((0, 0, 0)), tick)
+                cap.wait()
+            directory = cap.dump('death')
+            cap.close()
+            self.assertEqual(sorted(os.listdir(directory)), ['frame-00000004.png', 'frame-00000005.png'])
+
+if __name__ == '__main__':
+    unittest.main()
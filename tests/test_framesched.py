@@ -0,0 +1,56 @@
+# File: tests/test_framesched.py
+import unittest
+from framesched import FrameScheduler, SHED_ORDER
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+def run(sched, clock, frames, render_cost, update_cost=0.001):
+    """Drive the scheduler like game_loop; returns simulated seconds."""
+    simulated = 0.0
+    for _ in range(frames):
+        if sched.paced:
+            # frame limiter: wait out the rest of the step
+            clock.t = max(clock.t, (sched._last or 0.0) + sched.dt)
+        render = sched.begin_frame()
+        simulated += sched.dt
+        clock.t += update_cost + (render_cost if render else 0.0)
+        sched.end_frame()
+    return simulated
+
+class TestFrameScheduler(unittest.TestCase):
+    def test_light_load_renders_every_frame(self):
+        clock = FakeClock()
+        sched = FrameScheduler(60, clock=clock)
+        run(sched, clock, 300, render_cost=0.005)
+        stats = sched.take()
+        self.assertEqual(stats['skipped'], 0)
+        self.assertEqual(stats['shed'], [])
+
+    def test_overload_keeps_game_speed(self):
+        clock = FakeClock()
+        sched = FrameScheduler(60, max_skip=4, clock=clock)
+        simulated = run(sched, clock, 1200, render_cost=0.025)
+        stats = sched.take()
+        self.assertGreater(stats['skipped'], 300)
+        self.assertEqual(stats['dropped_ms'], 0.0)
+        self.assertAlmostEqual(simulated, clock.t, delta=0.1)
+        # optional work is shed while rendering costs more than the budget
+        self.assertEqual(stats['shed'], list(SHED_ORDER))
+
+    def test_skip_limit_slows_game_down(self):
+        clock = FakeClock()
+        sched = FrameScheduler(60, max_skip=1, clock=clock)
+        simulated = run(sched, clock, 600, render_cost=0.060)
+        stats = sched.take()
+        self.assertLessEqual(stats['skipped'], stats['rendered'])
+        self.assertGreater(stats['dropped_ms'], 0.0)
+        self.assertAlmostEqual(simulated + stats['dropped_ms'] / 1000.0, clock.t, delta=0.1)
+        self.assertIn('600 frames', sched.report())
+
+if __name__ == '__main__':
+    unittest.main()
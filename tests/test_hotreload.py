@@ -0,0 +1,42 @@
+# File: tests/test_hotreload.py
+import unittest
+import os
+import shutil
+import tempfile
+import pygame
+from sim import Simulation
+from hotreload import LevelWatcher
+
+class TestHotReload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'level.txt')
+        shutil.copy(os.path.join('levels', 'level1.txt'), self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_patch_keeps_state(self):
+        sim = Simulation(self.path, seed=1)
+        watcher = LevelWatcher(self.path, interval=0)
+        for _ in range(30):
+            sim.step(1 / 60)
+        player, enemies = sim.player, list(sim.enemies)
+        rows = list(sim.level.rows)
+        rows[2] = rows[2][:10] + '###C' + rows[2][14:]
+        with open(self.path, 'w') as f:
+            f.write('\n'.join(rows) + '\n')
+        os.utime(self.path, ns=(1, 1))
+
+        new_rows = watcher.poll()
+        changes = sim.apply_level_rows(new_rows)
+        self.assertEqual(len(changes), 4)
+        self.assertIs(sim.player, player)
+        self.assertEqual(sim.enemies, enemies)
+        self.assertIn((13 * 64, 2 * 64), [c['pos'] for c in sim.coins])
+        hits = sim.level.platforms_in(pygame.Rect(10 * 64, 2 * 64, 3 * 64, 64))
+        self.assertEqual([p[0].x // 64 for p in hits], [10, 11, 12])
+        self.assertIsNone(watcher.poll())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 # File: tests/test_level.py
 import unittest
 import os
-from level import Level
+import random
+import tempfile
+import pygame
+from level import Level, TILE_SIZE
 
 class TestLevel(unittest.TestCase):
     def test_parse_csv(self):
@@ -12,5 +15,48 @@ class TestLevel(unittest.TestCase):
         self.assertTrue(len(lvl.coin_spawns) > 0)
         self.assertTrue(isinstance(lvl.player_spawn, tuple))
 
+    def test_platforms_in(self):
+        lvl = Level(os.path.join('data', 'level1.csv'))
+        probe = pygame.Rect(0, 0, 200, 200)
+        expected = [p for p in lvl.platforms if p[0].colliderect(probe)]
+        self.assertEqual(lvl.platforms_in(probe), expected)
+
+    def test_terrain_profile(self):
+        rows = ['........',
+                '..##....',
+                '.....#..',
+                '##.##.##',
+                '##.#####']
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('\n'.join(rows))
+        try:
+            lvl = Level(f.name)
+        finally:
+            os.remove(f.name)
+        t = lvl.terrain
+        T = TILE_SIZE
+        self.assertEqual(t.floor, [3 * T, 3 * T, None, 3 * T, 3 * T, 4 * T, 3 * T, 3 * T])
+        self.assertEqual(t.surface, [3 * T, 3 * T, T, T, 3 * T, 2 * T, 3 * T, 3 * T])
+        self.assertEqual(t.ceiling, [None, None, None, 2 * T, None, 3 * T, None, None])
+        self.assertEqual(t.next_gap[:3], [2, 2, 2])
+        self.assertEqual(t.gap_end[0], 3)
+        self.assertIsNone(t.next_gap[3])
+        self.assertEqual(t.next_wall[2], 3)
+        self.assertIsNone(t.next_wall[3])
+        self.assertEqual(t.next_wall[5], 6)
+        self.assertEqual(t.clear_ahead(0), 1)
+        self.assertEqual(t.clear_ahead(3), 4)
+        self.assertEqual(t.clear_ahead(5), 0)
+
+        # solid_in agrees with the platforms themselves
+        rng = random.Random(0)
+        for _ in range(200):
+            probe = pygame.Rect(rng.randrange(-100, 600), rng.randrange(-100, 350), 32, 48)
+            expected = any(p[0].colliderect(probe) for p in lvl.platforms)
+            self.assertEqual(t.solid_in(probe), expected)
+
+        lvl.apply_rows(rows[:4] + ['########'])
+        self.assertIsNone(lvl.terrain.next_gap[0])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,62 @@
+# File: tests/test_levelcheck.py
+import unittest
+import os
+import shutil
+import tempfile
+from levelcheck import check_level, check_levels, level_refs
+
+def write_level(path, gap=0, wall=0, coin_height=None):
+    rows = [['.'] * 40 for _ in range(9)]
+    for x in range(40):
+        rows[0][x] = rows[8][x] = '#'
+    for y in range(9):
+        rows[y][0] = rows[y][39] = '#'
+    rows[7][2] = '@'
+    for x in range(15, 15 + gap):
+        rows[8][x] = '.'
+    for h in range(wall):
+        rows[7 - h][20] = '#'
+    if coin_height:
+        rows[7 - coin_height][10] = 'C'
+    with open(path, 'w') as f:
+        f.write('\n'.join(''.join(r) for r in rows) + '\n')
+
+class TestLevelCheck(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def path(self, name, **kw):
+        path = os.path.join(self.tmp, name + '.txt')
+        write_level(path, **kw)
+        return path
+
+    def test_shipped_level(self):
+        r = check_level(os.path.join('levels', 'level1.txt'))
+        self.assertTrue(r['completable'])
+        self.assertEqual(r['unreachable_coins'], [])
+
+    def test_gaps_walls_and_coins(self):
+        self.assertTrue(check_level(self.path('gap1', gap=1))['completable'])
+        wide = check_level(self.path('gap3', gap=3))
+        self.assertFalse(wide['completable'])
+        self.assertEqual(wide['blocking_column'], 15)
+        self.assertIn('gap', wide['reason'])
+        tall = check_level(self.path('wall3', wall=3))
+        self.assertFalse(tall['completable'])
+        self.assertEqual(tall['blocking_column'], 20)
+        self.assertIn('wall', tall['reason'])
+        self.assertEqual(check_level(self.path('low', coin_height=2))['unreachable_coins'], [])
+        self.assertEqual(check_level(self.path('high', coin_height=4))['unreachable_coins'], [[10, 3]])
+
+    def test_pool_keeps_order(self):
+        paths = [self.path('a', gap=3), self.path('b'), self.path('c', wall=3)]
+        self.assertEqual(level_refs([self.tmp]), paths)
+        results = check_levels(paths, workers=2)
+        self.assertEqual([r['level'] for r in results], paths)
+        self.assertEqual([r['completable'] for r in results], [False, True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# File: tests/test_levelpack.py
+import unittest
+import os
+import shutil
+import tempfile
+from level import Level
+from levelpack import LevelPack, LevelPackError, HEADER, pack_files, make_ref, split_ref
+
+class TestLevelPack(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'levels.pack')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_roundtrip(self):
+        sources = [os.path.join('data', 'level1.csv'), os.path.join('levels', 'level1.txt')]
+        pack_files(self.path, sources)
+        pack = LevelPack(self.path)
+        self.assertEqual(pack.ids(), [1, 2])
+        self.assertEqual(pack.info(2)['source'], sources[1])
+        for level_id, source in zip(pack.ids(), sources):
+            packed = Level(make_ref(self.path, level_id))
+            loose = Level(source)
+            self.assertEqual(packed.platforms, loose.platforms)
+            self.assertEqual(packed.coin_spawns, loose.coin_spawns)
+            self.assertEqual((packed.width, packed.height), (loose.width, loose.height))
+        self.assertNotIn(3, pack)
+        pack.close()
+
+    def test_truncated_pack_raises_level_pack_error(self):
+        pack_files(self.path, [os.path.join('data', 'level1.csv'), os.path.join('levels', 'level1.txt')])
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        # inside the header, inside the index, inside the last level's blobs
+        for size in (2, HEADER.size + 10, len(data) - 10):
+            with open(self.path, 'wb') as f:
+                f.write(data[:size])
+            with self.assertRaises(LevelPackError) as caught:
+                LevelPack(self.path)
+            self.assertIn('truncated', str(caught.exception))
+
+    def test_split_ref(self):
+        self.assertEqual(split_ref('data/levels.pack#12'), ('data/levels.pack', 12))
+        self.assertEqual(split_ref('data/level1.csv'), ('data/level1.csv', None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+# File: tests/test_lookahead.py
+import unittest
+import os
+from sim import Simulation, DEAD
+from snapshot import capture
+from lookahead import LookaheadPlayer
+
+LEVEL = os.path.join('levels', 'level1.txt')
+
+class TestLookahead(unittest.TestCase):
+    def test_planning_leaves_live_state_alone(self):
+        sim = Simulation(LEVEL, seed=2)
+        for _ in range(30):
+            sim.step(1 / 60)
+        before = capture(sim)
+        action = LookaheadPlayer().act(sim)
+        self.assertEqual(len(action), 4)
+        self.assertEqual(capture(sim), before)
+
+    def test_outplays_heuristic(self):
+        results = []
+        for planner in (None, LookaheadPlayer(horizon=48, beam=1, budget_ms=None)):
+            sim = Simulation(LEVEL, seed=1, autoplayer=planner)
+            while sim.time < 20 and sim.step(1 / 60) != DEAD:
+                pass
+            results.append((sim.deaths, sim.player.rect.x))
+        (h_deaths, h_x), (deaths, x) = results
+        self.assertEqual(deaths, 0)
+        self.assertGreater(x, 1500)
+        self.assertGreaterEqual(x - 1000 * deaths, h_x - 1000 * h_deaths)
+
+if __name__ == '__main__':
+    unittest.main()
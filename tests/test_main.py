@@ -0,0 +1,15 @@
+# File: tests/test_main.py
+import unittest
+import pygame
+import main
+
+class TestMainImport(unittest.TestCase):
+    def test_import_has_no_side_effects(self):
+        self.assertIsNone(main.screen)
+        self.assertIsNone(main.adaptive_ai)
+        self.assertIsNone(main.BACKGROUND_IMG)
+        self.assertFalse(pygame.display.get_init())
+        self.assertFalse(pygame.mixer.get_init())
+
+if __name__ == '__main__':
+    unittest.main()
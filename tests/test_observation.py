@@ -0,0 +1,37 @@
+# File: tests/test_observation.py
+import unittest
+import os
+import numpy as np
+from sim import Simulation
+from observation import TileEncoder, PLAYER, COIN, SOLID
+
+class TestTileEncoder(unittest.TestCase):
+    def test_window_is_view_and_matches_rebuild(self):
+        sim = Simulation(os.path.join('data', 'level1.csv'), seed=4)
+        enc = TileEncoder(sim, view=(9, 15))
+        for _ in range(240):
+            sim.step(1 / 60)
+            window = enc.encode()
+        self.assertEqual(window.shape, (9, 15))
+        self.assertIs(window.base, enc.grid)
+        self.assertEqual(window[4, 7], PLAYER)
+        self.assertIn(SOLID, window)
+
+        # incremental grid equals one rebuilt from scratch
+        fresh = TileEncoder(sim, view=(9, 15))
+        fresh.encode()
+        self.assertTrue(np.array_equal(enc.grid, fresh.grid))
+
+    def test_taken_coin_is_cleared(self):
+        sim = Simulation(os.path.join('data', 'level1.csv'))
+        enc = TileEncoder(sim)
+        coin = sim.coins[0]
+        cell = enc._cell(coin['rect'])
+        self.assertEqual(enc.grid[cell], COIN)
+        coin['taken'] = True
+        sim.coins_taken += 1
+        enc.encode()
+        self.assertNotEqual(enc.grid[cell], COIN)
+
+if __name__ == '__main__':
+    unittest.main()
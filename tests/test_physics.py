@@ -0,0 +1,56 @@
+# File: tests/test_physics.py
+import unittest
+import os
+import pygame
+from physics import move
+from player import Player
+from sim import Simulation
+
+class TestSweptCollision(unittest.TestCase):
+    def test_fast_fall_lands_on_thin_floor(self):
+        floor = [pygame.Rect(0, 200, 64, 64)]
+        x, y, hit_x, hit_y = move(10, 0, 32, 48, 0, 1000, floor)
+        self.assertEqual((y, hit_y), (152, 1))
+
+    def test_wall_blocks_horizontal_move(self):
+        wall = [pygame.Rect(100, 0, 64, 64)]
+        x, y, hit_x, hit_y = move(0, 10, 32, 48, 500, 0, wall)
+        self.assertEqual((x, hit_x), (68, 1))
+
+    def test_slides_along_floor(self):
+        floor = [pygame.Rect(0, 100, 64, 64), pygame.Rect(64, 100, 64, 64)]
+        x, y, hit_x, hit_y = move(10, 52, 32, 48, 40, 5, floor)
+        self.assertEqual((x, y, hit_x, hit_y), (50, 52, 0, 1))
+
+    def test_player_coarse_step_does_not_tunnel(self):
+        floor = [pygame.Rect(x, 640, 64, 64) for x in range(0, 640, 64)]
+        player = Player((100, 0), 720)
+        for _ in range(10):
+            player.update(floor, 0.25)
+        self.assertEqual(player.rect.bottom, 640)
+        self.assertTrue(player.on_ground)
+
+class TestStepRate(unittest.TestCase):
+    # a scripted run must end the same whether stepped at 60 Hz or 20 Hz
+    TOLERANCE = 16   # px, a quarter tile
+
+    def run_script(self, hz, seconds=20.0):
+        sim = Simulation(os.path.join('data', 'level1.csv'), seed=0)
+        dt = 1.0 / hz
+        for i in range(round(seconds * hz)):
+            t = i * dt
+            # run right, hold jump 0.35 s of every 1.5 s (not in the last second), tap shoot each second
+            sim.step(dt, (False, True, t % 1.5 < 0.35 and t < seconds - 1, t % 1.0 < 0.05))
+        return sim
+
+    def test_20hz_tracks_60hz(self):
+        fine, coarse = self.run_script(60), self.run_script(20)
+        for name in ('lives', 'score', 'kills', 'coins_taken', 'level_completed', 'game_over'):
+            self.assertEqual(getattr(coarse, name), getattr(fine, name), name)
+        self.assertTrue(fine.player.on_ground and coarse.player.on_ground)
+        self.assertGreater(fine.player.rect.x, 2000)
+        self.assertLessEqual(abs(coarse.player.rect.x - fine.player.rect.x), self.TOLERANCE)
+        self.assertLessEqual(abs(coarse.player.rect.y - fine.player.rect.y), self.TOLERANCE)
+
+if __name__ == '__main__':
+    unittest.main()
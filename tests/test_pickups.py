@@ -0,0 +1,60 @@
+# File: tests/test_pickups.py
+import unittest
+import os
+import random
+import pygame
+from pickups import PickupIndex
+from sim import Simulation
+from snapshot import capture, restore
+
+def coin(x, y):
+    return {'pos': (x, y), 'rect': pygame.Rect(x, y, 64, 64), 'taken': False}
+
+def brute_nearest(items, x):
+    best = None
+    for item in items:
+        if not item['taken'] and (best is None or abs(item['rect'].centerx - x) < abs(best['rect'].centerx - x)):
+            best = item
+    return best
+
+class TestPickupIndex(unittest.TestCase):
+    def test_matches_linear_scans(self):
+        rng = random.Random(4)
+        items = [coin(rng.randrange(0, 4000, 16), rng.randrange(0, 640, 64)) for _ in range(120)]
+        index = PickupIndex(items)
+        for step in range(300):
+            rect = pygame.Rect(rng.randrange(-100, 4100), rng.randrange(0, 640), 40, 60)
+            expected = [c for c in items if not c['taken'] and rect.colliderect(c['rect'])]
+            found = index.overlapping(rect)
+            self.assertEqual(sorted(map(id, found)), sorted(map(id, expected)))
+            x = rng.randrange(-100, 4100)
+            self.assertIs(index.nearest(x), brute_nearest(items, x))
+            for c in found:
+                index.take(c)
+            if step % 50 == 0:
+                extra = coin(rng.randrange(0, 4000), 0)
+                items.append(extra)
+                index.add(extra)
+                gone = items.pop(rng.randrange(len(items)))
+                index.remove(gone)
+        self.assertEqual(len(index), sum(1 for c in items if not c['taken']))
+
+        for c in items:
+            c['taken'] = False
+        index.refresh()
+        self.assertEqual(len(index), len(items))
+        self.assertIsNone(PickupIndex().nearest(0))
+
+    def test_restore_resyncs_simulation_index(self):
+        sim = Simulation(os.path.join('data', 'level1.csv'), seed=0)
+        snap = capture(sim)
+        total = len(sim.pickups)
+        first = sim.pickups.nearest(0)
+        sim.pickups.take(first)
+        self.assertEqual(len(sim.pickups), total - 1)
+        restore(sim, snap)
+        self.assertEqual(len(sim.pickups), total)
+        self.assertIs(sim.pickups.nearest(0), first)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# File: tests/test_recorder.py
+import unittest
+import math
+import os
+import shutil
+import tempfile
+import numpy as np
+from sim import Simulation
+from recorder import TrajectoryRecorder, load_dataset, read_manifest, NEARBY_ENEMIES
+
+LEVEL = os.path.join('levels', 'level1.txt')
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_records_shards_and_maps_them(self):
+        rec = TrajectoryRecorder(self.path, chunk_rows=64)
+        expected = []
+        for episode in range(2):
+            sim = Simulation(LEVEL, seed=episode)
+            for tick in range(100):
+                # known inputs: right, then left, with jump and shoot on alternate phases
+                left, right = tick % 40 >= 30, tick % 40 < 30
+                jump, shoot = tick % 20 < 5, tick % 7 == 0
+                sim.step(1 / 60, (left, right, jump, shoot))
+                rec.record(sim)
+                p = sim.player
+                expected.append((episode, p.rect.x, p.rect.y, right - left, jump, shoot, sim.score))
+        rec.close()
+
+        manifest = read_manifest(self.path)
+        self.assertEqual(manifest['rows'], 200)
+        self.assertEqual(manifest['episodes'], 2)
+        self.assertEqual([s['rows'] for s in manifest['shards']], [64, 64, 64, 8])
+        shards = load_dataset(self.path)
+        self.assertIsInstance(shards[0]['x'], np.memmap)
+        rows = list(zip(*(np.concatenate([s[name] for s in shards]).tolist()
+                          for name in ('episode', 'x', 'y', 'move', 'jump', 'shoot', 'score'))))
+        self.assertEqual(rows, expected)
+        moves = np.concatenate([s['move'] for s in shards])
+        self.assertEqual(set(moves.tolist()), {-1, 1})
+        self.assertEqual(int(np.concatenate([s['shoot'] for s in shards]).sum()), 2 * 15)
+        ticks = np.concatenate([s['tick'] for s in shards])
+        self.assertEqual(ticks[100], 0)
+        self.assertEqual(shards[0]['enemies'].shape, (64, NEARBY_ENEMIES, 2))
+        self.assertFalse(math.isnan(shards[0]['enemies'][0, 0, 0]))
+
+        # reopening appends with new episode numbers
+        rec = TrajectoryRecorder(self.path, chunk_rows=64)
+        rec.record(Simulation(LEVEL, seed=0))
+        rec.close()
+        manifest = read_manifest(self.path)
+        self.assertEqual((manifest['rows'], manifest['episodes'], len(manifest['shards'])), (201, 3, 5))
+        self.assertEqual(load_dataset(self.path, ['episode'])[-1]['episode'].tolist(), [2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# File: tests/test_render.py
+import unittest
+import pygame
+from render import Canvas, parse_resolution, rect_sprite
+
+class TestCanvas(unittest.TestCase):
+    def test_half_scale_draws_offscreen_and_upscales(self):
+        display = pygame.Surface((1280, 720))
+        canvas = Canvas(display, 0.5)
+        self.assertEqual(canvas.size, (640, 360))
+        canvas.fill((0, 0, 0))
+        canvas.rect((255, 0, 0), (64, 64, 64, 64))
+        self.assertEqual(canvas.surface.get_at((40, 40))[:3], (255, 0, 0))
+        self.assertEqual(canvas.surface.get_at((31, 31))[:3], (0, 0, 0))
+        canvas.present()
+        self.assertEqual(display.get_at((100, 100))[:3], (255, 0, 0))
+        self.assertEqual(display.get_at((60, 60))[:3], (0, 0, 0))
+
+    def test_full_scale_draws_on_display(self):
+        display = pygame.Surface((1280, 720))
+        canvas = Canvas(display, 1.0)
+        self.assertIs(canvas.surface, display)
+        self.assertEqual(canvas.box((10, 20, 30, 40)), (10, 20, 30, 40))
+
+    def test_adjacent_tiles_stay_seamless(self):
+        canvas = Canvas(pygame.Surface((1280, 720)), 0.3)
+        a, b = canvas.box((0, 0, 64, 64)), canvas.box((64, 0, 64, 64))
+        self.assertEqual(a[0] + a[2], b[0])
+
+    def test_queue_flushes_layers_in_order(self):
+        canvas = Canvas(pygame.Surface((200, 100)), 1.0)
+        red = canvas.sprite('red', rect_sprite, (255, 0, 0), (20, 20))
+        blue = canvas.sprite('blue', rect_sprite, (0, 0, 255), (20, 20))
+        self.assertIs(canvas.sprite('red', rect_sprite, (9, 9, 9), (20, 20)), red)
+        canvas.submit(2, blue, (10, 10))
+        canvas.submit(1, red, (10, 10))
+        canvas.submit(1, red, (50, 10))
+        self.assertEqual(canvas.surface.get_at((15, 15))[:3], (0, 0, 0))
+        canvas.flush()
+        self.assertEqual(canvas.surface.get_at((15, 15))[:3], (0, 0, 255))
+        self.assertEqual(canvas.surface.get_at((55, 15))[:3], (255, 0, 0))
+
+    def test_parse_resolution(self):
+        self.assertEqual(parse_resolution('640x360', (1280, 720)), 0.5)
+        self.assertEqual(parse_resolution('0.75', (1280, 720)), 0.75)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# File: tests/test_renderstate.py
+import unittest
+import threading
+import pygame
+from render import Canvas, rect_sprite
+from renderstate import SpriteRecorder, StateBuffer, replay
+
+def draw_scene(canvas):
+    red = canvas.sprite('red', rect_sprite, (255, 0, 0), (20, 20))
+    blue = canvas.sprite('blue', rect_sprite, (0, 0, 255), (20, 20))
+    canvas.submit(2, blue, (10, 10))
+    canvas.submit(1, red, (10, 10))
+    canvas.submit(1, red, (50, 10))
+    canvas.submit(3, canvas.scaled(rect_sprite((0, 255, 0), (10, 10))), (80, 40))
+
+class TestRenderState(unittest.TestCase):
+    def test_recorded_sprites_replay_like_direct_drawing(self):
+        direct = Canvas(pygame.Surface((120, 60)), 1.0)
+        draw_scene(direct)
+        direct.flush()
+
+        rec = SpriteRecorder()
+        draw_scene(rec)
+        replayed = Canvas(pygame.Surface((120, 60)), 1.0)
+        replay(replayed, rec.items())
+        replayed.flush()
+        self.assertEqual(pygame.image.tobytes(direct.surface, 'RGB'),
+                         pygame.image.tobytes(replayed.surface, 'RGB'))
+
+        skipped = Canvas(pygame.Surface((120, 60)), 1.0)
+        replay(skipped, rec.items(), (2,))
+        skipped.flush()
+        self.assertEqual(skipped.surface.get_at((15, 15))[:3], (255, 0, 0))
+
+    def test_buffer_hands_over_latest_state(self):
+        buf = StateBuffer()
+        self.assertEqual(buf.latest(), (0, None))
+        self.assertEqual(buf.wait(0, timeout=0.01), (0, None))
+        buf.publish('a')
+        buf.publish('b')
+        self.assertEqual(buf.wait(0), (2, 'b'))
+
+        def writer():
+            for state in ('c', 'd', 'e'):
+                buf.publish(state)
+            buf.close()
+        seen, seq = [], 2
+        thread = threading.Thread(target=writer)
+        thread.start()
+        while not buf.closed or seq != buf.seq:
+            seq, state = buf.wait(seq, timeout=1.0)
+            seen.append(state)
+        thread.join()
+        self.assertEqual(seen[-1], 'e')
+        self.assertEqual(buf.latest(), (5, 'e'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# File: tests/test_runstore.py
+import unittest
+import os
+import json
+import sqlite3
+import tempfile
+from runstore import RunStore
+
+class TestRunStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'runs.sqlite3')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_records_and_queries(self):
+        store = RunStore(self.path)
+        self.assertEqual(store.highscore(), 0)
+        for i in range(1200):
+            store.record('dead', score=(i * 37) % 1000, level=1 + i % 3, duration=i / 10, deaths=3,
+                         autoplayer='heuristic', ai={'speed': 80 + i % 5}, ended_at=1000.0 + i)
+        store.flush()
+        self.assertEqual(store.count(), 1200)
+        self.assertEqual(store.count(level=2), 400)
+        self.assertEqual(store.highscore(), 999)
+        best = store.leaderboard(limit=3, level=2)
+        self.assertEqual([r['level'] for r in best], [2, 2, 2])
+        self.assertEqual([r['score'] for r in best], sorted((r['score'] for r in best), reverse=True))
+        self.assertEqual(best[0]['score'], store.highscore(level=2))
+        self.assertEqual(set(best[0]['ai']), {'speed'})
+        store.close()
+
+        # committed and readable by any other connection
+        con = sqlite3.connect(self.path)
+        self.assertEqual(con.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(con.execute('SELECT COUNT(*) FROM runs').fetchone()[0], 1200)
+        plan = ' '.join(str(row) for row in con.execute(
+            'EXPLAIN QUERY PLAN SELECT score FROM runs WHERE level = 2 ORDER BY score DESC LIMIT 1'))
+        self.assertIn('runs_by_level', plan)
+        con.close()
+
+    def test_imports_legacy_highscore_once(self):
+        legacy = os.path.join(self.tmp.name, 'highscore.json')
+        with open(legacy, 'w') as f:
+            json.dump({'highscore': 1010}, f)
+        store = RunStore(self.path, legacy_highscore=legacy)
+        self.assertEqual(store.highscore(), 1010)
+        self.assertEqual(store.leaderboard()[0]['outcome'], 'imported')
+        store.close()
+        store = RunStore(self.path, legacy_highscore=legacy)
+        self.assertEqual(store.count(), 1)
+        store.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# File: tests/test_sampleprof.py
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from sampleprof import SamplingProfiler, top_functions
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_main_thread_stacks_are_rooted_at_phase(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'profiles', 'run.folded')
+            switch = sys.getswitchinterval()
+            prof = SamplingProfiler(path, hz=500, phase=lambda: 'sim')
+            prof.start()
+            self.assertTrue(prof.running)
+            spin(0.3)
+            self.assertEqual(prof.stop(), path)
+            self.assertFalse(prof.running)
+            self.assertEqual(sys.getswitchinterval(), switch)
+            self.assertGreater(prof.samples, 10)
+
+            with open(path) as f:
+                lines = f.read().splitlines()
+            self.assertTrue(lines)
+            self.assertTrue(all(line.startswith('sim;') for line in lines))
+            self.assertEqual(sum(int(line.rpartition(' ')[2]) for line in lines), prof.samples)
+            self.assertTrue(any('spin (test_sampleprof.py:' in line for line in lines))
+            self.assertIn('samples', prof.report())
+
+    def test_watched_thread_is_rooted_at_its_name(self):
+        worker = threading.Thread(target=spin, args=(0.3,), name='sim')
+        prof = SamplingProfiler(os.devnull, hz=500)
+        worker.start()
+        prof.watch(worker)
+        prof.start()
+        worker.join()
+        prof.stop()
+        roots = {line.split(';', 1)[0] for line in prof.collapsed()}
+        self.assertEqual(roots, {'main', 'sim'})
+
+    def test_top_functions(self):
+        lines = ['sim;a;b 3', 'sim;a 2', 'render;c;b 1']
+        top = top_functions(lines)
+        self.assertEqual(top[0], ('b', 4, 4))
+        self.assertEqual(dict((f, (own, total)) for f, own, total in top),
+                         {'b': (4, 4), 'a': (2, 5)})
+
+if __name__ == '__main__':
+    unittest.main()
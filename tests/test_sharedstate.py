@@ -0,0 +1,83 @@
+# File: tests/test_sharedstate.py
+import unittest
+import os
+from sharedstate import StatePublisher, StateReader, MAX_ENEMIES
+from sim import Simulation
+from level import TILE_SIZE
+
+NAME = f'ai-mario-test-{os.getpid()}'
+
+class TestSharedState(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulation(os.path.join('data', 'level1.csv'), seed=0)
+        self.pub = StatePublisher(NAME)
+        self.reader = StateReader(NAME)
+
+    def tearDown(self):
+        self.reader.close()
+        self.pub.close()
+
+    def test_reader_sees_each_tick(self):
+        self.assertIsNone(self.reader.read())
+        sim = self.sim
+        for tick in range(1, 40):
+            sim.autopilot()
+            sim.update(1 / 60)
+            self.pub.publish(sim, cam_x=tick * 2, tick=tick)
+            state = self.reader.read()
+            self.assertEqual(self.reader.seq, tick)
+            self.assertEqual(state['tick'], tick)
+            self.assertEqual(state['cam_x'], tick * 2)
+            self.assertEqual((state['player']['x'], state['player']['y']), sim.player.rect.topleft)
+            self.assertEqual(state['lives'], sim.lives)
+            n = state['n_enemies']
+            self.assertEqual(n, min(len(sim.enemies), MAX_ENEMIES))
+            self.assertEqual(list(state['enemies'][:n]['x']), [e.rect.x for e in sim.enemies[:n]])
+            self.assertEqual(sorted(map(tuple, state['coins'][:state['n_coins']].tolist())),
+                             sorted(c['pos'] for c in sim.pickups))
+
+    def test_coins_follow_pickups_in_both_slots(self):
+        sim = self.sim
+        self.pub.publish(sim)
+        self.pub.publish(sim)
+        before = self.reader.read()['n_coins']
+        sim.pickups.take(sim.pickups.nearest(0))
+        for _ in range(2):
+            self.pub.publish(sim)
+            self.assertEqual(self.reader.read()['n_coins'], before - 1)
+
+    def test_moved_coin_is_republished(self):
+        sim = self.sim
+        rows = list(sim.level.rows)
+        y = next(i for i, row in enumerate(rows) if 'C' in row)
+        x = rows[y].index('C')
+        rows[y] = rows[y][:x] + '.' + rows[y][x + 1:]
+        rows[y - 1] = rows[y - 1][:x + 1] + 'C' + rows[y - 1][x + 2:]
+        self.pub.publish(sim)
+        self.pub.publish(sim)
+        count = len(sim.pickups)
+        sim.apply_level_rows(rows)
+        self.assertEqual(len(sim.pickups), count)   # same counts, different place
+        for _ in range(2):
+            self.pub.publish(sim)
+            state = self.reader.read()
+            coins = set(map(tuple, state['coins'][:state['n_coins']].tolist()))
+            self.assertEqual(coins, {c['pos'] for c in sim.pickups})
+            self.assertIn(((x + 1) * TILE_SIZE, (y - 1) * TILE_SIZE), coins)
+
+    def test_copy_is_detached_and_segment_is_replaced(self):
+        self.pub.publish(self.sim, tick=5)
+        state = self.reader.read()
+        self.pub.publish(self.sim, tick=6)
+        self.pub.publish(self.sim, tick=7)
+        self.assertEqual(state['tick'], 5)
+        # a new publisher under the same name replaces a stale segment
+        self.reader.close()
+        self.pub.shm.close()
+        self.pub.shm = None
+        self.pub = StatePublisher(NAME)
+        self.reader = StateReader(NAME)
+        self.assertEqual(self.reader.seq, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+# File: tests/test_sim.py
+import unittest
+import os
+from sim import Simulation, DEAD
+
+class TestSimulation(unittest.TestCase):
+    def test_headless_steps(self):
+        sim = Simulation(os.path.join('data', 'level1.csv'), seed=3)
+        start_x = sim.player.rect.x
+        for _ in range(120):
+            if sim.step(1 / 60) == DEAD:
+                break
+        self.assertGreater(sim.player.rect.x, start_x)
+        self.assertAlmostEqual(sim.time, 2.0, places=3)
+
+    def test_reset_is_seeded(self):
+        sim = Simulation(os.path.join('data', 'level1.csv'))
+        sim.reset(seed=7)
+        first = [e.rect.topleft for e in sim.enemies]
+        sim.reset(seed=7)
+        self.assertEqual(first, [e.rect.topleft for e in sim.enemies])
+
+if __name__ == '__main__':
+    unittest.main()
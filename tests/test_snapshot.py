@@ -0,0 +1,71 @@
+# File: tests/test_snapshot.py
+import unittest
+import os
+import shutil
+import tempfile
+from sim import Simulation
+from snapshot import capture, restore, snapshot_level, RewindBuffer, SnapshotError
+
+LEVEL = os.path.join('levels', 'level1.txt')
+
+def state(sim):
+    p = sim.player
+    return (p.rect.topleft, p.vel_x, p.vel_y, sim.score, sim.lives, sim.time,
+            [(e.rect.topleft, e.health) for e in sim.enemies],
+            [b.rect.topleft for b in sim.bullets],
+            [c['taken'] for c in sim.coins], sim.rng.random())
+
+class TestSnapshot(unittest.TestCase):
+    def test_round_trip_replays_identically(self):
+        sim = Simulation(LEVEL, seed=3)
+        for _ in range(90):
+            sim.step(1 / 60)
+        snap = capture(sim, extras=(12.5, 3.0))
+        self.assertEqual(snapshot_level(snap), (LEVEL, 1))
+        for _ in range(120):
+            sim.step(1 / 60)
+        expected = state(sim)
+
+        other = Simulation(LEVEL, seed=99)
+        self.assertEqual(restore(other, snap), [12.5, 3.0])
+        for _ in range(120):
+            other.step(1 / 60)
+        self.assertEqual(state(other), expected)
+
+    def test_rejects_other_level_and_garbage(self):
+        snap = capture(Simulation(LEVEL, seed=1))
+        tmp = tempfile.mkdtemp()
+        try:
+            copy = os.path.join(tmp, 'copy.txt')
+            shutil.copy(LEVEL, copy)
+            other = Simulation(copy, seed=1)
+            with self.assertRaises(SnapshotError):
+                restore(other, snap)
+            with self.assertRaises(SnapshotError):
+                restore(other, b'nope')
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_rewind_buffer(self):
+        sim = Simulation(LEVEL, seed=5)
+        buf = RewindBuffer(seconds=2, hz=60, keyframe_every=30)
+        snaps = []
+        for _ in range(200):
+            sim.step(1 / 60)
+            snaps.append(capture(sim))
+            buf.push(snaps[-1])
+        # whole keyframe groups are dropped, never below the requested span
+        self.assertGreaterEqual(len(buf), 120)
+        self.assertLess(len(buf), 150)
+        self.assertEqual(buf.get(0), snaps[-1])
+        self.assertEqual(buf.get(47), snaps[-48])
+        self.assertIsNone(buf.get(len(buf)))
+        self.assertLess(buf.nbytes, sum(len(s) for s in snaps[-len(buf):]) / 4)
+
+        self.assertEqual(buf.rewind(60), snaps[-61])
+        buf.push(snaps[0])
+        self.assertEqual(buf.get(0), snaps[0])
+        self.assertEqual(buf.get(1), snaps[-61])
+
+if __name__ == '__main__':
+    unittest.main()
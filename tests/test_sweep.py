@@ -0,0 +1,28 @@
+# File: tests/test_sweep.py
+import unittest
+from sweep import parse_space, grid_configs, random_configs, config_key, rank
+
+class TestSweep(unittest.TestCase):
+    def test_grid(self):
+        space = parse_space(['speed_step=0.1,0.2', 'range_cap=300,340'])
+        configs = list(grid_configs(space))
+        self.assertEqual(len(configs), 4)
+        self.assertTrue(all(c['score_threshold'] == 500 for c in configs))
+
+    def test_random_range(self):
+        space = parse_space(['speed_step=0.05:0.4'])
+        configs = list(random_configs(space, 5, seed=1))
+        self.assertTrue(all(0.05 <= c['speed_step'] <= 0.4 for c in configs))
+        self.assertRaises(ValueError, lambda: list(grid_configs(space)))
+
+    def test_key_and_rank(self):
+        job = {'episodes': 1}
+        a = {'speed_step': 0.1}
+        self.assertEqual(config_key(a, job), config_key(dict(a), job))
+        self.assertNotEqual(config_key(a, job), config_key(a, {'episodes': 2}))
+        results = [{'completion': 0.5, 'score': 10, 'survival': 1},
+                   {'completion': 1.0, 'score': 5, 'survival': 1}]
+        self.assertEqual(rank(results)[0]['completion'], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# File: tests/test_telemetry.py
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from sim import Simulation
+from telemetry import Telemetry, TelemetrySink, percentile
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'run.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 51)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_records_written(self):
+        sim = Simulation(os.path.join('levels', 'level1.txt'), seed=1)
+        clock = FakeClock()
+        tel = Telemetry(TelemetrySink(self.path), clock=clock)
+        tel.start_episode(level_load_ms=2.5)
+        for i in range(125):
+            sim.step(1 / 60)
+            clock.t += 1 / 60
+            tel.frame(0.030 if i == 5 else 1 / 60, sim)
+        tel.end_episode('quit', sim, level=1)
+        tel.close()
+
+        with open(self.path) as f:
+            records = [json.loads(line) for line in f]
+        seconds = [r for r in records if r['type'] == 'second']
+        self.assertEqual(len(seconds), 2)
+        self.assertEqual(sum(seconds[0]['frame_hist']['counts']), seconds[0]['frames'])
+        self.assertAlmostEqual(seconds[0]['frame_ms']['max'], 30.0)
+        self.assertEqual(seconds[0]['entities']['enemies'], len(sim.enemies))
+        episode = records[-1]
+        self.assertEqual(episode['type'], 'episode')
+        self.assertEqual((episode['outcome'], episode['frames'], episode['level_load_ms']), ('quit', 125, 2.5))
+
+if __name__ == '__main__':
+    unittest.main()
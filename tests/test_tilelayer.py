@@ -0,0 +1,69 @@
+# File: tests/test_tilelayer.py
+import unittest
+import os
+import pygame
+from level import Level
+from render import Canvas
+from tilelayer import TileLayer
+
+def reference(level, canvas, cam_x):
+    canvas.fill((0, 0, 0))
+    for rect, symbol in level.platforms:
+        canvas.rect(level.colors.get(symbol, (120, 120, 120)), (rect.x - cam_x, rect.y, rect.width, rect.height))
+    return pygame.image.tostring(canvas.surface, 'RGB')
+
+class TestTileLayer(unittest.TestCase):
+    def setUp(self):
+        self.level = Level(os.path.join('levels', 'level1.txt'))
+
+    def check_pan(self, scale, cams):
+        ref_canvas = Canvas(pygame.Surface((1280, 720)), scale)
+        canvas = Canvas(pygame.Surface((1280, 720)), scale)
+        layer = TileLayer(self.level, canvas)
+        for cam_x in cams:
+            canvas.fill((0, 0, 0))
+            layer.draw(cam_x)
+            self.assertEqual(pygame.image.tostring(canvas.surface, 'RGB'),
+                             reference(self.level, ref_canvas, cam_x), f"cam_x={cam_x}")
+        return layer
+
+    def test_pan_matches_full_redraw(self):
+        cams = list(range(0, 2600, 37)) + list(range(2600, 900, -53)) + [5000, 40, 64 * 7]
+        self.check_pan(1.0, cams)
+
+    def test_only_new_columns_drawn(self):
+        layer = self.check_pan(1.0, [0])
+        first = layer.columns_drawn
+        layer.draw(10)
+        self.assertEqual(layer.columns_drawn, first + 1)
+        layer.draw(30)
+        self.assertEqual(layer.columns_drawn, first + 1)
+        layer.draw(64 + 30)
+        self.assertEqual(layer.columns_drawn, first + 2)
+
+    def test_half_scale(self):
+        self.check_pan(0.5, list(range(0, 3000, 37)) + list(range(3000, 0, -53)) + list(range(0, 3000, 64)))
+
+    def test_three_quarter_scale(self):
+        layer = self.check_pan(0.75, list(range(0, 3000, 37)) + list(range(3000, 0, -53)) + [1, 2, 3, 5])
+        self.assertTrue(layer.fixed)
+
+    def test_scale_without_whole_pixel_tiles(self):
+        # 64 * 2/3 px tiles: the ring is redrawn per camera position, still exact
+        layer = self.check_pan(2 / 3, list(range(0, 1500, 37)) + [1, 2, 3])
+        self.assertFalse(layer.fixed)
+
+    def test_hot_reload_redraws_column(self):
+        canvas = Canvas(pygame.Surface((1280, 720)), 1.0)
+        layer = TileLayer(self.level, canvas)
+        layer.draw(0)
+        rows = list(self.level.rows)
+        rows[3] = rows[3][:5] + '#' + rows[3][6:]
+        self.level.apply_rows(rows)
+        canvas.fill((0, 0, 0))
+        layer.draw(0)
+        self.assertEqual(pygame.image.tostring(canvas.surface, 'RGB'),
+                         reference(self.level, Canvas(pygame.Surface((1280, 720)), 1.0), 0))
+
+if __name__ == '__main__':
+    unittest.main()
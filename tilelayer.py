@@ -0,0 +1,115 @@
+import math
+import pygame
+from level import TILE_SIZE
+
+# Empty ring pixels; blitted as transparent through the colorkey
+COLORKEY = (255, 0, 255)
+
+
+class TileLayer:
+    """Scrolling tile layer cached in a ring-buffer surface.
+
+    The ring is one canvas wide plus three tile columns and holds the level
+    columns currently in view, each at x = world_x mod ring width. When the
+    camera moves only the newly exposed columns are drawn, and draw()
+    composites the ring onto the canvas with at most two blits at the wrap
+    point. Hot-reloaded cells (Level.listeners) redraw just their column; a
+    new Level or a canvas scale change rebuilds the ring.
+
+    Pixels match a full redraw, which like every sprite lands at
+    floor((x - cam_x) * scale). A column is stored at
+    floor((x - anchor) * scale) + ceil(anchor * scale) and the view starts at
+    ceil(cam_x * scale). When a tile is a whole number of pixels (scale 1,
+    0.75, 0.5, ...) that is x * scale for any anchor, so the anchor stays put
+    and panning only draws new columns. At other scales the rounding depends
+    on the camera's sub-pixel phase, so the ring is re-anchored, and redrawn,
+    whenever the camera moves.
+    """
+
+    def __init__(self, level, canvas):
+        self.level = level
+        self.canvas = canvas
+        self.columns_drawn = 0
+        level.listeners.append(self._on_level_change)
+        self._build()
+
+    def _build(self):
+        canvas = self.canvas
+        self.scale = canvas.scale
+        view_w, view_h = canvas.size
+        self.tile_px = TILE_SIZE * self.scale
+        self.fixed = float(self.tile_px).is_integer()
+        self.anchor = self.anchor_px = 0
+        # room for every column touching the view plus one spare, so new columns never overwrite visible ones
+        self.ring_w = view_w + 3 * math.ceil(self.tile_px) + 2
+        self.ring = pygame.Surface((self.ring_w, view_h), 0, canvas.surface)
+        self.ring.set_colorkey(COLORKEY)
+        self.ring.fill(COLORKEY)
+        # logical height the columns are queried over (the fallback ground may lie below the rows)
+        self.world_h = max(self.level.height * TILE_SIZE, canvas.logical_size[1])
+        self.lo = self.hi = 0  # cached columns [lo, hi)
+
+    def close(self):
+        if self._on_level_change in self.level.listeners:
+            self.level.listeners.remove(self._on_level_change)
+
+    def _on_level_change(self, changes):
+        for tx, _ in changes:
+            if self.lo <= tx < self.hi:
+                self._draw_column(tx)
+
+    def _ring_x(self, x):
+        # same rounding as Canvas.box((x - anchor, ...)), shifted to the anchor's pixel
+        return math.floor((x - self.anchor) * self.scale) + self.anchor_px
+
+    def _draw_column(self, col):
+        ring, ring_w, ring_x = self.ring, self.ring_w, self._ring_x
+        x0 = ring_x(col * TILE_SIZE)
+        w = ring_x((col + 1) * TILE_SIZE) - x0
+        rx = x0 % ring_w
+        colors = self.level.colors
+        query = pygame.Rect(col * TILE_SIZE, 0, TILE_SIZE, self.world_h)
+        plats = self.level.platforms_in(query)
+        # a column that straddles the wrap point is drawn at both ends
+        for shift in (0, -ring_w) if rx + w > ring_w else (0,):
+            ring.set_clip((rx + shift, 0, w, ring.get_height()))
+            ring.fill(COLORKEY)
+            offset = rx + shift - x0
+            for plat in plats:
+                rect, symbol = plat if isinstance(plat, tuple) else (plat, '#')
+                left, top = ring_x(rect.x), math.floor(rect.y * self.scale)
+                box = (left + offset, top,
+                       max(1, ring_x(rect.right) - left),
+                       max(1, math.floor(rect.bottom * self.scale) - top))
+                ring.fill(colors.get(symbol, (120, 120, 120)), box)
+        ring.set_clip(None)
+        self.columns_drawn += 1
+
+    def _ensure(self, lo, hi):
+        if lo >= self.hi or hi <= self.lo:
+            cols = range(lo, hi)
+        else:
+            cols = [c for c in range(lo, hi) if not self.lo <= c < self.hi]
+        for col in cols:
+            self._draw_column(col)
+        self.lo, self.hi = lo, hi
+
+    def draw(self, cam_x):
+        canvas = self.canvas
+        if canvas.scale != self.scale or canvas.size[1] != self.ring.get_height():
+            self._build()
+        if not self.fixed and cam_x != self.anchor:
+            self.anchor, self.anchor_px = cam_x, math.ceil(cam_x * self.scale)
+            self.lo = self.hi = 0
+        view_w = canvas.size[0]
+        lo = math.floor(cam_x / TILE_SIZE)
+        # one extra column covers the rounding of the canvas width
+        hi = math.ceil((cam_x + canvas.logical_size[0]) / TILE_SIZE) + 1
+        self._ensure(lo, hi)
+
+        # composite: the view is ring pixels [off, off + view_w), wrapping once at most
+        off = math.ceil(cam_x * self.scale) % self.ring_w
+        first = min(view_w, self.ring_w - off)
+        canvas.surface.blit(self.ring, (0, 0), (off, 0, first, self.ring.get_height()))
+        if first < view_w:
+            canvas.surface.blit(self.ring, (first, 0), (0, 0, view_w - first, self.ring.get_height()))
@@ -11,12 +11,16 @@ def load_highscore(filename):
     except Exception:
         return 0
 
-def save_highscore(filename, score):
-    try:
-        with open(filename, 'w') as f:
-            json.dump({'highscore': score}, f)
-    except Exception:
-        pass
+_fonts = {}
+
+def get_font(size):
+    """Return a cached default font of the given size, initializing pygame.font on first use."""
+    font = _fonts.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
 
 def play_sound(sound_file):
     try: